@@ -9,6 +9,9 @@ from typing import Dict, Any, List, Tuple
 
 from gordon import TaskVerifier
 
+# State paths read by validation_function (see pa_bench_sdk.projection).
+STATE_PATHS = ("gocalendar.events", "gocalendar.otherUsersEvents")
+
 def validation_function(state: Dict[str, Any]) -> Tuple[float, List[TaskVerifier]]:
     """
     Standalone validation function for meeting modification scenario.
@@ -8,6 +8,9 @@ from typing import Dict, Any, List, Tuple
 
 from gordon import TaskVerifier
 
+# State paths read by validation_function (see pa_bench_sdk.projection).
+STATE_PATHS = ("gomail.emails",)
+
 def validation_function(state: Dict[str, Any]) -> Tuple[float, List[TaskVerifier]]:
     """
     Standalone validation function for conflict detection scenario.
@@ -1,9 +1,53 @@
 """
 Drop-in replacement for internal gordon TaskVerifier helpers.
 
-Re-exports the dataclasses that scenario verifiers expect.
+Re-exports the dataclasses that scenario verifiers expect, plus the
+declarative spec engine that evaluates the scenario families as check plans.
+
+The spec engine's names are imported on first access (PEP 562), so the
+`from gordon import TaskVerifier` at the top of every verifier stays cheap.
 """
 
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
 from pa_bench_sdk.verifier import TaskVerifier
 
-__all__ = ["TaskVerifier"]
+_EXPORTS = {
+    "CheckPlan": ".spec",
+    "ScenarioSpec": ".spec",
+    "SpecEngine": ".spec",
+    "StateIndex": ".spec",
+    "compare_results": ".spec",
+    "compile_plan": ".spec",
+    "load_spec": ".spec",
+}
+
+__all__ = ["TaskVerifier", *_EXPORTS]
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .spec import (
+        CheckPlan,
+        ScenarioSpec,
+        SpecEngine,
+        StateIndex,
+        compare_results,
+        compile_plan,
+        load_spec,
+    )
@@ -0,0 +1,946 @@
+"""
+Declarative check plans for the PA Bench scenario families.
+
+The shipped `verifier.py` files are eight templates with hardcoded
+constants. Here every family is a compiled check plan and every scenario is
+a small parameter record stored next to its verifier in `spec.json`.
+
+Plans run against a `StateIndex`, so parsed timestamps, attendee sets and
+thread lookups are built once per state and shared by every check. Batches
+evaluated through `CheckPlan.evaluate_many` also share one timestamp cache,
+which is where most of the per-state parsing cost goes. Verdicts, rewards
+and reasons match the per-scenario verifiers, which keep running side by
+side for differential testing (see `compare_results`).
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from pa_bench_sdk.verifier import TaskVerifier
+
+
+SPEC_FILENAME = "spec.json"
+
+
+@dataclass(frozen=True)
+class ScenarioSpec:
+    scenario_id: str
+    family: str
+    params: Dict[str, Any] = field(hash=False)
+
+
+def load_spec(scenario_path: Union[str, Path]) -> ScenarioSpec:
+    scenario_path = Path(scenario_path)
+    spec_path = scenario_path / SPEC_FILENAME
+    if not spec_path.exists():
+        raise FileNotFoundError(
+            f"Spec not found for scenario '{scenario_path.name}' at {spec_path}"
+        )
+    with open(spec_path, encoding="utf-8") as f:
+        raw = json.load(f)
+    return ScenarioSpec(
+        scenario_id=scenario_path.name,
+        family=raw["family"],
+        params=raw["params"],
+    )
+
+
+def parse_timestamp(value: str) -> float:
+    """Return the UTC epoch for an ISO timestamp; naive values are UTC."""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class TimestampCache(dict):
+    """Memoises `parse_timestamp`; shared across every state of a batch."""
+
+    def __missing__(self, value: str) -> float:
+        epoch = parse_timestamp(value)
+        self[value] = epoch
+        return epoch
+
+
+class IndexedEvent:
+    """A calendar event with parsed times; attendees are collected on first use."""
+
+    __slots__ = ("id", "title", "start", "end", "day", "raw", "_attendees")
+
+    def __init__(
+        self,
+        raw: Dict[str, Any],
+        start: Optional[float],
+        end: Optional[float],
+    ):
+        start_raw = raw.get("start")
+        self.id = raw.get("id")
+        self.title = raw.get("title")
+        self.start = start
+        self.end = end
+        self.day = start_raw[:10] if isinstance(start_raw, str) else ""
+        self.raw = raw
+        self._attendees: Optional[FrozenSet[str]] = None
+
+    @property
+    def attendees(self) -> FrozenSet[str]:
+        if self._attendees is None:
+            self._attendees = frozenset(
+                att["email"] for att in self.raw.get("attendees") or []
+            )
+        return self._attendees
+
+
+class StateIndex:
+    """Lazily built lookups over one `{"gomail": ..., "gocalendar": ...}` state."""
+
+    def __init__(
+        self,
+        state: Dict[str, Any],
+        timestamps: Optional[TimestampCache] = None,
+    ):
+        self.state = state
+        self.timestamps = timestamps if timestamps is not None else TimestampCache()
+        self._events: Optional[List[IndexedEvent]] = None
+        self._sent: Optional[List[Dict[str, Any]]] = None
+        self._threads: Optional[Dict[Any, List[Dict[str, Any]]]] = None
+        self._busy: Dict[Tuple[str, bool], List[Tuple[Any, float, float]]] = {}
+
+    @property
+    def calendar(self) -> Dict[str, Any]:
+        return self.state.get("gocalendar") or {}
+
+    @property
+    def mail(self) -> Dict[str, Any]:
+        return self.state.get("gomail") or {}
+
+    def _epoch(self, value: Any) -> Optional[float]:
+        if not isinstance(value, str):
+            return None
+        try:
+            return self.timestamps[value]
+        except ValueError:
+            return None
+
+    @property
+    def raw_events(self) -> List[Dict[str, Any]]:
+        return self.calendar.get("events", [])
+
+    def index_event(self, event: Dict[str, Any]) -> IndexedEvent:
+        return IndexedEvent(
+            event, self._epoch(event.get("start")), self._epoch(event.get("end"))
+        )
+
+    @property
+    def events(self) -> List[IndexedEvent]:
+        if self._events is None:
+            self._events = [self.index_event(event) for event in self.raw_events]
+        return self._events
+
+    @property
+    def emails(self) -> List[Dict[str, Any]]:
+        return self.mail.get("emails", [])
+
+    @property
+    def sent_emails(self) -> List[Dict[str, Any]]:
+        if self._sent is None:
+            self._sent = [
+                email for email in self.emails if "SENT" in (email.get("labels") or [])
+            ]
+        return self._sent
+
+    def thread(self, thread_id: Any) -> List[Dict[str, Any]]:
+        if self._threads is None:
+            threads: Dict[Any, List[Dict[str, Any]]] = {}
+            for email in self.emails:
+                threads.setdefault(email.get("threadId"), []).append(email)
+            self._threads = threads
+        return self._threads.get(thread_id, [])
+
+    def busy(self, email: str, root: bool = False) -> List[Tuple[Any, float, float]]:
+        """Busy intervals of another user, as `(event_id, start, end)` tuples.
+
+        `root` reads `otherUsersEvents` from the top level of the state rather
+        than from the calendar clone, as the meeting scheduling verifiers do.
+        """
+        key = (email, root)
+        if key not in self._busy:
+            source = self.state if root else self.calendar
+            intervals = []
+            for other in (source.get("otherUsersEvents") or {}).get(email, []):
+                start = self._epoch(other.get("start"))
+                end = self._epoch(other.get("end"))
+                if start is not None and end is not None:
+                    intervals.append((other.get("id"), start, end))
+            self._busy[key] = intervals
+        return self._busy[key]
+
+
+CheckFn = Callable[[StateIndex], List[TaskVerifier]]
+PlanResult = Tuple[float, List[TaskVerifier]]
+
+
+def _score(checks: Sequence[TaskVerifier]) -> float:
+    passed_checks = sum(1 for c in checks if c.verdict)
+    return passed_checks / len(checks) if checks else 0.0
+
+
+@dataclass
+class CheckPlan:
+    spec: ScenarioSpec
+    run: CheckFn
+
+    def evaluate_index(self, index: StateIndex) -> PlanResult:
+        checks = self.run(index)
+        return _score(checks), checks
+
+    def evaluate(
+        self,
+        state: Dict[str, Any],
+        timestamps: Optional[TimestampCache] = None,
+    ) -> PlanResult:
+        return self.evaluate_index(StateIndex(state, timestamps))
+
+    def evaluate_many(
+        self,
+        states: Iterable[Dict[str, Any]],
+        timestamps: Optional[TimestampCache] = None,
+    ) -> List[PlanResult]:
+        shared = timestamps if timestamps is not None else TimestampCache()
+        return [self.evaluate_index(StateIndex(state, shared)) for state in states]
+
+
+_FAMILIES: Dict[str, Callable[[Dict[str, Any]], CheckFn]] = {}
+
+
+def family(name: str):
+    def register(builder: Callable[[Dict[str, Any]], CheckFn]):
+        _FAMILIES[name] = builder
+        return builder
+
+    return register
+
+
+def families() -> List[str]:
+    return sorted(_FAMILIES)
+
+
+def compile_plan(spec: ScenarioSpec) -> CheckPlan:
+    builder = _FAMILIES.get(spec.family)
+    if builder is None:
+        raise KeyError(f"Unknown scenario family: {spec.family}")
+    return CheckPlan(spec=spec, run=builder(spec.params))
+
+
+class SpecEngine:
+    """Compiles and caches check plans for scenarios under a data directory."""
+
+    def __init__(self, base_path: Union[str, Path] = "data"):
+        self.base_path = Path(base_path)
+        self.timestamps = TimestampCache()
+        self._plans: Dict[str, CheckPlan] = {}
+
+    def plan(self, scenario_id: str) -> CheckPlan:
+        plan = self._plans.get(scenario_id)
+        if plan is None:
+            plan = compile_plan(load_spec(self.base_path / scenario_id))
+            self._plans[scenario_id] = plan
+        return plan
+
+    def evaluate(self, scenario_id: str, state: Dict[str, Any]) -> PlanResult:
+        return self.plan(scenario_id).evaluate(state, self.timestamps)
+
+    def evaluate_many(
+        self, scenario_id: str, states: Iterable[Dict[str, Any]]
+    ) -> List[PlanResult]:
+        return self.plan(scenario_id).evaluate_many(states, self.timestamps)
+
+    def evaluate_rollouts(self, scenario_id: str, states: Sequence[Dict[str, Any]]):
+        """Score N rollouts at once with NumPy; see `gordon.vector`."""
+        from .vector import evaluate_rollouts
+
+        return evaluate_rollouts(self.plan(scenario_id), states, self.timestamps)
+
+
+def compare_results(expected: PlanResult, actual: PlanResult) -> List[str]:
+    """Describe where two `(reward, checks)` results disagree."""
+    mismatches = []
+    expected_reward, expected_checks = expected
+    actual_reward, actual_checks = actual
+    if abs(float(expected_reward) - float(actual_reward)) > 1e-9:
+        mismatches.append(f"reward: {expected_reward} != {actual_reward}")
+    expected_verdicts = [(c.name, bool(c.verdict)) for c in expected_checks]
+    actual_verdicts = [(c.name, bool(c.verdict)) for c in actual_checks]
+    if expected_verdicts != actual_verdicts:
+        mismatches.append(f"checks: {expected_verdicts} != {actual_verdicts}")
+    return mismatches
+
+
+def _window(requested_at: str, days: int) -> Tuple[date, date]:
+    requested = date.fromisoformat(requested_at[:10])
+    return requested, requested + timedelta(days=days)
+
+
+def _location_matches(event: Dict[str, Any], expected: Optional[str]) -> bool:
+    if expected == "Google Meet":
+        conference_data = event.get("conferenceData") or {}
+        conference_solution = conference_data.get("conferenceSolution") or {}
+        return conference_solution.get("name") == "Google Meet"
+    if expected:
+        return expected in (event.get("location") or "")
+    return True
+
+
+@dataclass(frozen=True)
+class _MeetingChecks:
+    """Check names and reasons of one meeting-request verifier template."""
+
+    found_pass: str
+    found_fail: str
+    location_name: str
+    location_pass: str
+    location_fail: str
+    participants_name: str
+    participants_pass: str
+    participants_fail: str
+    conflicts_name: Optional[str] = None
+    conflicts_pass: str = ""
+    conflicts_fail: str = ""
+    busy_at_root: bool = False
+
+
+_MEETING_WORDING = {
+    # The shipped scheduling verifiers read `otherUsersEvents` from the top
+    # level of the state; keep that so both engines agree.
+    "meeting_scheduling": _MeetingChecks(
+        found_pass="Event '{title}' found within week {start} to {end}",
+        found_fail=(
+            "No matching event found for meeting title '{title}' "
+            "within week {start} to {end}"
+        ),
+        location_name="location_match_check",
+        location_pass="Event location matches the specified location",
+        location_fail="Event location does not match the specified location '{location}'",
+        participants_name="participants_present_check",
+        participants_pass="All required participants included in event",
+        participants_fail="Missing participants in event: {missing}",
+        conflicts_name="no_conflicts_check",
+        conflicts_pass="All participants are available with no conflicts",
+        conflicts_fail="Conflicts found for participants: {unavailable}",
+        busy_at_root=True,
+    ),
+    "meeting_rescheduling": _MeetingChecks(
+        found_pass="Found meeting '{title}' scheduled within valid timeframe",
+        found_fail="No matching event found for '{title}' between {start} and {end}",
+        location_name="location_check",
+        location_pass="Event location matches expected location: {location}",
+        location_fail="Event location does not match expected location: {location}",
+        participants_name="participants_check",
+        participants_pass="All required participants are included in the event",
+        participants_fail="Missing participants: {missing}",
+        conflicts_name="conflict_check",
+        conflicts_pass="All participants are available with no scheduling conflicts",
+        conflicts_fail="Scheduling conflicts found for: {unavailable}",
+    ),
+    "meeting_modification": _MeetingChecks(
+        found_pass="Found meeting '{title}' scheduled within valid timeframe",
+        found_fail="No matching event found for '{title}' between {start} and {end}",
+        location_name="location_update_check",
+        location_pass="Event location successfully updated to {location}",
+        location_fail="Event location not updated to {location}",
+        participants_name="participants_check",
+        participants_pass="All participants including new guests added to event",
+        participants_fail="Missing participants: {missing}",
+    ),
+}
+
+
+@dataclass(frozen=True)
+class _MeetingRequest:
+    """Compiled parameters shared by the three meeting-request families."""
+
+    title: str
+    location: Optional[str]
+    participants: Tuple[str, ...]
+    first_day: str
+    last_day: str
+    wording: _MeetingChecks
+    fmt: Dict[str, Any] = field(hash=False)
+
+    @classmethod
+    def compile(cls, family_name: str, params: Dict[str, Any]) -> "_MeetingRequest":
+        window_start, window_end = _window(
+            params["requested_at"], params.get("window_days", 7)
+        )
+        return cls(
+            title=params["title"],
+            location=params.get("location"),
+            participants=tuple(dict.fromkeys(params["participants"])),
+            first_day=window_start.isoformat(),
+            last_day=window_end.isoformat(),
+            wording=_MEETING_WORDING[family_name],
+            fmt={
+                "title": params["title"],
+                "location": params.get("location"),
+                "start": window_start,
+                "end": window_end,
+            },
+        )
+
+    def checks(
+        self,
+        found: bool,
+        location_match: bool = False,
+        missing: Iterable[str] = (),
+        unavailable: Iterable[str] = (),
+    ) -> List[TaskVerifier]:
+        wording = self.wording
+        checks = [
+            TaskVerifier(
+                name="event_found_check",
+                verdict=found,
+                reason=(wording.found_pass if found else wording.found_fail).format(
+                    **self.fmt
+                ),
+            )
+        ]
+        if not found:
+            checks.append(
+                TaskVerifier(
+                    name=wording.location_name,
+                    verdict=False,
+                    reason="Cannot check location - event not found",
+                )
+            )
+            checks.append(
+                TaskVerifier(
+                    name=wording.participants_name,
+                    verdict=False,
+                    reason="Cannot check participants - event not found",
+                )
+            )
+            if wording.conflicts_name:
+                checks.append(
+                    TaskVerifier(
+                        name=wording.conflicts_name,
+                        verdict=False,
+                        reason="Cannot check conflicts - event not found",
+                    )
+                )
+            return checks
+
+        checks.append(
+            TaskVerifier(
+                name=wording.location_name,
+                verdict=location_match,
+                reason=(
+                    wording.location_pass if location_match else wording.location_fail
+                ).format(**self.fmt),
+            )
+        )
+        missing = list(missing)
+        checks.append(
+            TaskVerifier(
+                name=wording.participants_name,
+                verdict=not missing,
+                reason=(
+                    wording.participants_pass
+                    if not missing
+                    else wording.participants_fail.format(missing=", ".join(missing))
+                ),
+            )
+        )
+        if wording.conflicts_name:
+            unavailable = list(unavailable)
+            checks.append(
+                TaskVerifier(
+                    name=wording.conflicts_name,
+                    verdict=not unavailable,
+                    reason=(
+                        wording.conflicts_pass
+                        if not unavailable
+                        else wording.conflicts_fail.format(
+                            unavailable=", ".join(unavailable)
+                        )
+                    ),
+                )
+            )
+        return checks
+
+    def unavailable(self, index: StateIndex, event: IndexedEvent) -> List[str]:
+        unavailable = []
+        if event.start is None or event.end is None:
+            return unavailable
+        for email in self.participants:
+            for other_id, other_start, other_end in index.busy(
+                email, root=self.wording.busy_at_root
+            ):
+                if (
+                    other_id != event.id
+                    and event.start < other_end
+                    and event.end > other_start
+                ):
+                    unavailable.append(email)
+                    break
+        return unavailable
+
+
+def _meeting_request_plan(family_name: str, params: Dict[str, Any]) -> CheckFn:
+    request = _MeetingRequest.compile(family_name, params)
+
+    def run(index: StateIndex) -> List[TaskVerifier]:
+        for raw in index.raw_events:
+            if (
+                raw.get("title") == request.title
+                and request.first_day <= str(raw.get("start"))[:10] <= request.last_day
+            ):
+                break
+        else:
+            return request.checks(found=False)
+
+        event = index.index_event(raw)
+
+        return request.checks(
+            found=True,
+            location_match=_location_matches(event.raw, request.location),
+            missing=[p for p in request.participants if p not in event.attendees],
+            unavailable=request.unavailable(index, event)
+            if request.wording.conflicts_name
+            else (),
+        )
+
+    return run
+
+
+@family("meeting_scheduling")
+def _meeting_scheduling(params: Dict[str, Any]) -> CheckFn:
+    return _meeting_request_plan("meeting_scheduling", params)
+
+
+@family("meeting_rescheduling")
+def _meeting_rescheduling(params: Dict[str, Any]) -> CheckFn:
+    return _meeting_request_plan("meeting_rescheduling", params)
+
+
+@family("meeting_modification")
+def _meeting_modification(params: Dict[str, Any]) -> CheckFn:
+    return _meeting_request_plan("meeting_modification", params)
+
+
+@dataclass(frozen=True)
+class _ReplyAll:
+    """Compiled parameters of the conflict detection (reply-all) family."""
+
+    thread_id: Any
+    organizer: str
+    user_email: str
+    expected_cc: FrozenSet[str]
+
+    @classmethod
+    def compile(cls, params: Dict[str, Any]) -> "_ReplyAll":
+        return cls(
+            thread_id=params["thread_id"],
+            organizer=params["organizer"],
+            user_email=params["user_email"],
+            expected_cc=frozenset(params["cc"]) - {params["user_email"]},
+        )
+
+    def checks(self, thread_emails: Iterable[Dict[str, Any]]) -> List[TaskVerifier]:
+        user_reply_found = False
+        reply_all_verified = False
+        organizer_in_to = False
+        cc_preserved = False
+
+        for email in thread_emails:
+            if (
+                "SENT" in (email.get("labels") or [])
+                and email["from"]["email"] == self.user_email
+            ):
+                user_reply_found = True
+                to_emails = {r["email"] for r in email.get("to") or []}
+                cc_emails = {r["email"] for r in email.get("cc") or []}
+                organizer_in_to = self.organizer in to_emails
+                cc_preserved = self.expected_cc <= cc_emails
+                if organizer_in_to and cc_preserved:
+                    reply_all_verified = True
+                    break
+
+        checks = [
+            TaskVerifier(
+                name="user_reply_check",
+                verdict=user_reply_found,
+                reason="Reply email found from user in the thread"
+                if user_reply_found
+                else "No reply email found from user in the thread",
+            )
+        ]
+        if user_reply_found:
+            checks.append(
+                TaskVerifier(
+                    name="organizer_recipient_check",
+                    verdict=organizer_in_to,
+                    reason="Organizer included in 'to' field"
+                    if organizer_in_to
+                    else f"Organizer {self.organizer} not in 'to' field",
+                )
+            )
+            checks.append(
+                TaskVerifier(
+                    name="cc_recipients_check",
+                    verdict=cc_preserved,
+                    reason="All original CC recipients preserved"
+                    if cc_preserved
+                    else "Not all original CC recipients included in reply",
+                )
+            )
+        else:
+            checks.append(
+                TaskVerifier(
+                    name="organizer_recipient_check",
+                    verdict=False,
+                    reason="Cannot check recipients - no reply found",
+                )
+            )
+            checks.append(
+                TaskVerifier(
+                    name="cc_recipients_check",
+                    verdict=False,
+                    reason="Cannot check CC recipients - no reply found",
+                )
+            )
+        checks.append(
+            TaskVerifier(
+                name="reply_all_check",
+                verdict=reply_all_verified,
+                reason="Reply All used correctly"
+                if reply_all_verified
+                else "Reply was not sent to all original recipients (Reply All not used)",
+            )
+        )
+        return checks
+
+
+@family("conflict_detection")
+def _conflict_detection(params: Dict[str, Any]) -> CheckFn:
+    reply_all = _ReplyAll.compile(params)
+
+    def run(index: StateIndex) -> List[TaskVerifier]:
+        return reply_all.checks(index.thread(reply_all.thread_id))
+
+    return run
+
+
+def _cancellation_checks(
+    event_exists: bool, sent_count: int, keyword_found: bool
+) -> List[TaskVerifier]:
+    checks = [
+        TaskVerifier(
+            name="event_removed_check",
+            verdict=not event_exists,
+            reason="Event successfully removed from calendar"
+            if not event_exists
+            else "Event still exists in calendar - cancellation not processed",
+        ),
+        TaskVerifier(
+            name="emails_sent_check",
+            verdict=bool(sent_count),
+            reason=f"Found {sent_count} email(s) sent on target date"
+            if sent_count
+            else "No emails sent on the target date",
+        ),
+    ]
+    if sent_count:
+        checks.append(
+            TaskVerifier(
+                name="cancellation_keyword_check",
+                verdict=keyword_found,
+                reason="Cancellation-related email found in sent items"
+                if keyword_found
+                else "No cancellation-related emails found in sent items",
+            )
+        )
+    else:
+        checks.append(
+            TaskVerifier(
+                name="cancellation_keyword_check",
+                verdict=False,
+                reason="Cannot check keywords - no emails sent",
+            )
+        )
+    return checks
+
+
+def _mentions_keyword(email: Dict[str, Any], keywords: Sequence[str]) -> bool:
+    content = f"{email.get('subject') or ''} {email.get('body') or ''}".lower()
+    return any(keyword in content for keyword in keywords)
+
+
+@family("meeting_cancellation")
+def _meeting_cancellation(params: Dict[str, Any]) -> CheckFn:
+    event_id = params["event_id"]
+    sent_on = params["sent_on"][:10]
+    keywords = tuple(k.lower() for k in params["keywords"])
+
+    def run(index: StateIndex) -> List[TaskVerifier]:
+        sent_emails = [
+            email
+            for email in index.sent_emails
+            if str(email.get("timestamp", ""))[:10] == sent_on
+        ]
+        return _cancellation_checks(
+            event_exists=any(event.get("id") == event_id for event in index.raw_events),
+            sent_count=len(sent_emails),
+            keyword_found=any(
+                _mentions_keyword(email, keywords) for email in sent_emails
+            ),
+        )
+
+    return run
+
+
+def _flight_checks(
+    flights: Sequence[Tuple[str, str]], found: Sequence[bool]
+) -> List[TaskVerifier]:
+    return [
+        TaskVerifier(
+            name=f"{name}_flight_check",
+            verdict=passed,
+            reason=f"Calendar event found for {name} flight {number}"
+            if passed
+            else f"No calendar event found that blocks time for {name} flight {number}",
+        )
+        for (name, number), passed in zip(flights, found)
+    ]
+
+
+def _flight_text(event: IndexedEvent) -> Tuple[str, str]:
+    return (
+        (event.title or "").lower(),
+        (event.raw.get("description") or "").lower(),
+    )
+
+
+@family("travel_confirmation")
+def _travel_confirmation(params: Dict[str, Any]) -> CheckFn:
+    labels = [(f["name"], f["number"]) for f in params["flights"]]
+    flights = [
+        (
+            flight["number"].lower(),
+            parse_timestamp(flight["departure"]),
+            parse_timestamp(flight["arrival"]),
+        )
+        for flight in params["flights"]
+    ]
+
+    def run(index: StateIndex) -> List[TaskVerifier]:
+        found = [False] * len(flights)
+        for event in index.events:
+            if event.start is None or event.end is None:
+                continue
+            text = None
+            for i, (needle, departure, arrival) in enumerate(flights):
+                if found[i] or not (event.start <= departure and event.end >= arrival):
+                    continue
+                if text is None:
+                    text = _flight_text(event)
+                if needle in text[0] or needle in text[1]:
+                    found[i] = True
+        return _flight_checks(labels, found)
+
+    return run
+
+
+_MULTI_MEETING_REASONS = {
+    "prep": (
+        "Prep meeting scheduled correctly 15 minutes before main meeting (internal only)",
+        "Prep meeting not found or has incorrect participants/timing",
+    ),
+    "debrief": (
+        "Debrief meeting scheduled correctly 15 minutes after main meeting (internal only)",
+        "Debrief meeting not found or has incorrect participants/timing",
+    ),
+}
+
+
+def _coordination_checks(
+    names: Sequence[str], found: Sequence[bool]
+) -> List[TaskVerifier]:
+    checks = []
+    for name, passed in zip(names, found):
+        passed_reason, failed_reason = _MULTI_MEETING_REASONS[name]
+        checks.append(
+            TaskVerifier(
+                name=f"{name}_meeting_check",
+                verdict=passed,
+                reason=passed_reason if passed else failed_reason,
+            )
+        )
+    return checks
+
+
+@family("multi_meeting_coordination")
+def _multi_meeting_coordination(params: Dict[str, Any]) -> CheckFn:
+    external = params["external"]
+    participants = frozenset(params["participants"])
+    tolerance = params.get("tolerance_seconds", 300)
+    names = [m["name"] for m in params["meetings"]]
+    meetings = [
+        (parse_timestamp(m["start"]), parse_timestamp(m["end"]))
+        for m in params["meetings"]
+    ]
+
+    def run(index: StateIndex) -> List[TaskVerifier]:
+        found = [False] * len(meetings)
+        for event in index.events:
+            if event.start is None or event.end is None:
+                continue
+            for i, (start, end) in enumerate(meetings):
+                if (
+                    abs(event.start - start) < tolerance
+                    and abs(event.end - end) < tolerance
+                    and external not in event.attendees
+                    and participants <= event.attendees
+                ):
+                    found[i] = True
+        return _coordination_checks(names, found)
+
+    return run
+
+
+_CASCADE_REASONS = {
+    "prep": (
+        "Old prep meeting correctly removed from original time",
+        "Prep meeting still at original time - cascade failed",
+        "Prep meeting found at new time (15 min before main)",
+        "Prep meeting not found at new time - should be 15 min before main",
+    ),
+    "debrief": (
+        "Old debrief meeting correctly removed from original time",
+        "Debrief meeting still at original time - cascade failed",
+        "Debrief meeting found at new time (right after main)",
+        "Debrief meeting not found at new time - should be right after main",
+    ),
+}
+
+
+@dataclass(frozen=True)
+class _Cascade:
+    """Compiled parameters of the cascading changes family."""
+
+    topic: str
+    external: str
+    participants: FrozenSet[str]
+    tolerance: float
+    main_start: float
+    meetings: Tuple[Tuple[str, float, float, float], ...]
+
+    @classmethod
+    def compile(cls, params: Dict[str, Any]) -> "_Cascade":
+        return cls(
+            topic=params["topic"].lower(),
+            external=params["external"],
+            participants=frozenset(params["participants"]),
+            tolerance=params.get("tolerance_seconds", 300),
+            main_start=parse_timestamp(params["main_start"]),
+            meetings=tuple(
+                (
+                    m["name"],
+                    parse_timestamp(m["start"]),
+                    parse_timestamp(m["end"]),
+                    parse_timestamp(m["original_start"]),
+                )
+                for m in params["meetings"]
+            ),
+        )
+
+    @property
+    def anchors(self) -> List[float]:
+        """Start times near which `classify` can return anything."""
+        anchors = [self.main_start]
+        for _, start, _, original_start in self.meetings:
+            anchors.extend((start, original_start))
+        return anchors
+
+    def classify(self, event: IndexedEvent) -> Optional[Tuple[str, str]]:
+        """Return `("moved" | "stale", name)` for a prep/debrief event, else None.
+
+        Each event is classified once, in the same order as the template's
+        if/elif chain: main meeting, meetings at their new time, meetings
+        left at their original time.
+        """
+        if event.start is None or event.end is None:
+            return None
+        tolerance = self.tolerance
+        title = (event.title or "").lower()
+        if (
+            abs(event.start - self.main_start) < tolerance
+            and self.topic in title
+            and self.external in event.attendees
+        ):
+            return None
+        for name, start, end, _ in self.meetings:
+            if (
+                abs(event.start - start) < tolerance
+                and abs(event.end - end) < tolerance
+                and name in title
+                and self.external not in event.attendees
+                and self.participants <= event.attendees
+            ):
+                return "moved", name
+        for name, _, _, original_start in self.meetings:
+            if abs(event.start - original_start) < tolerance and name in title:
+                return "stale", name
+        return None
+
+    def checks(self, found: Iterable[Tuple[str, str]]) -> List[TaskVerifier]:
+        found = set(found)
+        checks = []
+        for name, *_ in self.meetings:
+            removed_pass, removed_fail, _, _ = _CASCADE_REASONS[name]
+            stale = ("stale", name) in found
+            checks.append(
+                TaskVerifier(
+                    name=f"old_{name}_check",
+                    verdict=not stale,
+                    reason=removed_pass if not stale else removed_fail,
+                )
+            )
+        for name, *_ in self.meetings:
+            _, _, moved_pass, moved_fail = _CASCADE_REASONS[name]
+            moved = ("moved", name) in found
+            checks.append(
+                TaskVerifier(
+                    name=f"{name}_meeting_check",
+                    verdict=moved,
+                    reason=moved_pass if moved else moved_fail,
+                )
+            )
+        return checks
+
+
+@family("cascading_changes")
+def _cascading_changes(params: Dict[str, Any]) -> CheckFn:
+    cascade = _Cascade.compile(params)
+
+    def run(index: StateIndex) -> List[TaskVerifier]:
+        return cascade.checks(
+            kind for kind in map(cascade.classify, index.events) if kind
+        )
+
+    return run
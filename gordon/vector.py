@@ -0,0 +1,561 @@
+"""
+Vectorised evaluation of many rollouts of one scenario.
+
+`RolloutColumns` stacks the columns the checks read from N final states
+(event start/end epochs, day ordinals, title and id matches, attendee
+bitsets, sent-email rows) into flat NumPy arrays. The family evaluators
+then answer the common checks -- title-in-window, attendee-superset,
+overlap-with-busy and sent-on-date -- as array operations over all N states
+at once. Columns are built on first use and extracted with C-level
+`map`/`itemgetter` pipelines, so a family only pays for what it reads, and
+row-wise Python work (attendee bitsets, keyword scans) is limited to the
+rows that survive the cheaper array filters.
+
+Requires NumPy (`pip install pa-bench-sdk[vector]`). Families without a
+vectorised evaluator fall back to the scalar `CheckPlan`, so every scenario
+can be scored through `evaluate_rollouts`. Conflict detection is one of
+them: its check is a single thread-id comparison per email, and building
+the column costs as much as the scalar scan.
+"""
+
+from __future__ import annotations
+
+import operator
+from dataclasses import dataclass
+from itertools import chain, compress, repeat
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from pa_bench_sdk.verifier import TaskVerifier
+
+from .spec import (
+    CheckPlan,
+    IndexedEvent,
+    PlanResult,
+    TimestampCache,
+    _Cascade,
+    _MeetingRequest,
+    _cancellation_checks,
+    _coordination_checks,
+    _flight_checks,
+    _location_matches,
+    _mentions_keyword,
+    parse_timestamp,
+)
+
+
+MAX_BITSET_EMAILS = 64
+
+
+def _field(rows: Sequence[Dict[str, Any]], key: str) -> List[Any]:
+    try:
+        return list(map(operator.itemgetter(key), rows))
+    except KeyError:
+        return [row.get(key) for row in rows]
+
+
+def _flatten(lists: List[List[Any]], size: int):
+    counts = np.fromiter(map(len, lists), np.int64, size)
+    return list(chain.from_iterable(lists)), np.repeat(np.arange(size), counts)
+
+
+class RolloutColumns:
+    """Flat, lazily stacked columns over N final states of one scenario."""
+
+    def __init__(
+        self,
+        states: Sequence[Dict[str, Any]],
+        timestamps: Optional[TimestampCache] = None,
+    ):
+        self.states = list(states)
+        self.size = len(self.states)
+        self.timestamps = timestamps if timestamps is not None else TimestampCache()
+        self._columns: Dict[str, Any] = {}
+
+    def _column(self, name: str, build: Callable[[], Any]) -> Any:
+        column = self._columns.get(name)
+        if column is None:
+            column = self._columns[name] = build()
+        return column
+
+    def epochs(self, values: List[Any]) -> np.ndarray:
+        """UTC epochs for ISO strings; NaN where a value does not parse."""
+        try:
+            return np.fromiter(
+                map(self.timestamps.__getitem__, values), np.float64, len(values)
+            )
+        except (AttributeError, TypeError, ValueError):
+            return np.array([self._safe_epoch(v) for v in values], dtype=np.float64)
+
+    def _safe_epoch(self, value: Any) -> float:
+        try:
+            return self.timestamps[value]
+        except (AttributeError, TypeError, ValueError):
+            return np.nan
+
+    @staticmethod
+    def equals(values: List[Any], expected: Any) -> np.ndarray:
+        return np.fromiter(
+            map(operator.eq, values, repeat(expected)), bool, len(values)
+        )
+
+    def _flat(self, clone: str, key: str):
+        def build():
+            return _flatten(
+                [(state.get(clone) or {}).get(key, []) for state in self.states],
+                self.size,
+            )
+
+        return self._column(f"{clone}.{key}", build)
+
+    @property
+    def events(self) -> List[Dict[str, Any]]:
+        return self._flat("gocalendar", "events")[0]
+
+    @property
+    def event_state(self) -> np.ndarray:
+        return self._flat("gocalendar", "events")[1]
+
+    @property
+    def event_start(self) -> np.ndarray:
+        return self._column(
+            "event_start", lambda: self.epochs(_field(self.events, "start"))
+        )
+
+    @property
+    def event_end(self) -> np.ndarray:
+        return self._column("event_end", lambda: self.epochs(_field(self.events, "end")))
+
+    def event_field(self, key: str) -> List[Any]:
+        return self._column(f"event.{key}", lambda: _field(self.events, key))
+
+    def index_event(self, row: int) -> IndexedEvent:
+        start, end = self.event_start[row], self.event_end[row]
+        return IndexedEvent(
+            self.events[row],
+            None if np.isnan(start) else float(start),
+            None if np.isnan(end) else float(end),
+        )
+
+    def attendee_bits(self, rows: Sequence[int], emails: Sequence[str]) -> np.ndarray:
+        """Bitset per row of which `emails` attend; bit i is `emails[i]`."""
+        if len(emails) > MAX_BITSET_EMAILS:
+            raise ValueError(f"Attendee bitsets hold at most {MAX_BITSET_EMAILS} emails")
+        position = {email: 1 << i for i, email in enumerate(emails)}.get
+        events = self.events
+        bits = []
+        for row in rows:
+            value = 0
+            for attendee in events[row].get("attendees") or ():
+                value |= position(attendee["email"], 0)
+            bits.append(value)
+        return np.array(bits, dtype=np.uint64)
+
+    def first_per_state(self, rows: np.ndarray) -> np.ndarray:
+        """For each state, the first of `rows` (ascending) it owns, or -1."""
+        first = np.full(self.size, -1, dtype=np.int64)
+        if len(rows):
+            owners, index = np.unique(self.event_state[rows], return_index=True)
+            first[owners] = rows[index]
+        return first
+
+    @property
+    def emails(self) -> List[Dict[str, Any]]:
+        return self._flat("gomail", "emails")[0]
+
+    @property
+    def email_state(self) -> np.ndarray:
+        return self._flat("gomail", "emails")[1]
+
+    def _sent(self):
+        def build():
+            labels = _field(self.emails, "labels")
+            try:
+                mask = np.fromiter(
+                    map(operator.contains, labels, repeat("SENT")), bool, len(labels)
+                )
+            except TypeError:
+                mask = np.array(["SENT" in (lb or ()) for lb in labels], dtype=bool)
+            return np.flatnonzero(mask), list(compress(self.emails, mask))
+
+        return self._column("sent", build)
+
+    @property
+    def sent_rows(self) -> np.ndarray:
+        return self._sent()[0]
+
+    @property
+    def sent_emails(self) -> List[Dict[str, Any]]:
+        return self._sent()[1]
+
+
+def title_in_window(
+    columns: RolloutColumns, title: str, first_day: str, last_day: str
+) -> np.ndarray:
+    """Row of the first event per state titled `title` starting in the window."""
+    rows = np.flatnonzero(columns.equals(columns.event_field("title"), title))
+    if len(rows):
+        starts = [str(columns.events[row].get("start"))[:10] for row in rows.tolist()]
+        rows = rows[[first_day <= day <= last_day for day in starts]]
+    return columns.first_per_state(rows)
+
+
+def attendee_superset(
+    columns: RolloutColumns, rows: np.ndarray, emails: Sequence[str]
+) -> np.ndarray:
+    """Per entry of `rows` (-1 for none), whether every email attends."""
+    result = np.zeros(len(rows), dtype=bool)
+    present = np.flatnonzero(rows >= 0)
+    if len(present):
+        mask = np.uint64((1 << len(emails)) - 1)
+        bits = columns.attendee_bits(rows[present].tolist(), emails)
+        result[present] = (bits & mask) == mask
+    return result
+
+
+def overlap_with_busy(
+    columns: RolloutColumns,
+    rows: np.ndarray,
+    emails: Sequence[str],
+    root: bool = False,
+) -> np.ndarray:
+    """Per state, bitset of `emails` whose busy events overlap the state's row."""
+    conflicts = np.zeros(columns.size, dtype=np.uint64)
+    states = np.flatnonzero(rows >= 0)
+    if not len(states):
+        return conflicts
+
+    busy_lists, owners, owner_bits = [], [], []
+    for state_index in states.tolist():
+        state = columns.states[state_index]
+        source = state if root else (state.get("gocalendar") or {})
+        others = source.get("otherUsersEvents") or {}
+        for bit, email in enumerate(emails):
+            busy = others.get(email)
+            if busy:
+                busy_lists.append(busy)
+                owners.append(state_index)
+                owner_bits.append(1 << bit)
+    if not busy_lists:
+        return conflicts
+
+    counts = np.fromiter(map(len, busy_lists), np.int64, len(busy_lists))
+    busy = list(chain.from_iterable(busy_lists))
+    busy_owner = np.repeat(np.array(owners, dtype=np.int64), counts)
+    busy_bit = np.repeat(np.array(owner_bits, dtype=np.uint64), counts)
+    busy_start = columns.epochs(_field(busy, "start"))
+    busy_end = columns.epochs(_field(busy, "end"))
+
+    # Only the matched rows' own times are needed; avoid stacking the
+    # start/end columns of every event in the batch.
+    matched = [columns.events[row] for row in rows[states].tolist()]
+    match_start = np.full(columns.size, np.nan)
+    match_end = np.full(columns.size, np.nan)
+    match_start[states] = columns.epochs(_field(matched, "start"))
+    match_end[states] = columns.epochs(_field(matched, "end"))
+
+    overlapping = np.flatnonzero(
+        (match_start[busy_owner] < busy_end) & (match_end[busy_owner] > busy_start)
+    )
+    if len(overlapping):
+        # The template skips the scheduled event itself; only overlapping
+        # rows need their ids compared.
+        match_ids = {state: event.get("id") for state, event in zip(states.tolist(), matched)}
+        same = [
+            busy[i].get("id") == match_ids[owner]
+            for i, owner in zip(overlapping.tolist(), busy_owner[overlapping].tolist())
+        ]
+        overlapping = overlapping[~np.array(same, dtype=bool)]
+        np.bitwise_or.at(conflicts, busy_owner[overlapping], busy_bit[overlapping])
+    return conflicts
+
+
+def sent_on_date(columns: RolloutColumns, day: str) -> np.ndarray:
+    """Rows of SENT emails whose timestamp falls on `day` (YYYY-MM-DD)."""
+    rows = columns.sent_rows
+    stamps = _field(columns.sent_emails, "timestamp")
+    try:
+        on_day = np.fromiter(map(str.startswith, stamps, repeat(day)), bool, len(stamps))
+    except TypeError:
+        on_day = np.array([str(ts).startswith(day) for ts in stamps], dtype=bool)
+    return rows[on_day]
+
+
+def _bits_to_emails(bits: int, emails: Sequence[str]) -> List[str]:
+    return [email for i, email in enumerate(emails) if bits >> i & 1]
+
+
+@dataclass
+class VectorResult:
+    """Verdicts of one plan over N states, with reasons built on demand."""
+
+    check_names: List[str]
+    verdicts: np.ndarray
+    rewards: np.ndarray
+    explain: Callable[[int], List[TaskVerifier]]
+
+    def __len__(self) -> int:
+        return len(self.rewards)
+
+    def result(self, i: int) -> PlanResult:
+        return float(self.rewards[i]), self.explain(i)
+
+    def results(self) -> List[PlanResult]:
+        return [self.result(i) for i in range(len(self))]
+
+
+def _vector_result(
+    check_names: List[str],
+    verdicts: np.ndarray,
+    explain: Callable[[int], List[TaskVerifier]],
+) -> VectorResult:
+    rewards = verdicts.sum(axis=1) / verdicts.shape[1]
+    return VectorResult(check_names, verdicts, rewards, explain)
+
+
+VectorFn = Callable[[RolloutColumns], VectorResult]
+_VECTOR_FAMILIES: Dict[str, Callable[[Dict[str, Any], str], Optional[VectorFn]]] = {}
+
+
+def vector_family(*names: str):
+    def register(builder: Callable[[Dict[str, Any], str], Optional[VectorFn]]):
+        for name in names:
+            _VECTOR_FAMILIES[name] = builder
+        return builder
+
+    return register
+
+
+@vector_family("meeting_scheduling", "meeting_rescheduling", "meeting_modification")
+def _meeting_request(params: Dict[str, Any], family_name: str) -> Optional[VectorFn]:
+    request = _MeetingRequest.compile(family_name, params)
+    participants = request.participants
+    if len(participants) > MAX_BITSET_EMAILS:
+        return None
+    wording = request.wording
+
+    def run(columns: RolloutColumns) -> VectorResult:
+        rows = title_in_window(
+            columns, request.title, request.first_day, request.last_day
+        )
+        found = rows >= 0
+        location = np.zeros(columns.size, dtype=bool)
+        for state_index in np.flatnonzero(found).tolist():
+            location[state_index] = _location_matches(
+                columns.events[rows[state_index]], request.location
+            )
+        present = attendee_superset(columns, rows, participants)
+        names = ["event_found_check", wording.location_name, wording.participants_name]
+        verdicts = [found, found & location, present]
+        conflicts = None
+        if wording.conflicts_name:
+            conflicts = overlap_with_busy(
+                columns, rows, participants, root=wording.busy_at_root
+            )
+            names.append(wording.conflicts_name)
+            verdicts.append(found & (conflicts == 0))
+
+        def explain(i: int) -> List[TaskVerifier]:
+            if rows[i] < 0:
+                return request.checks(found=False)
+            attendees = {
+                att["email"] for att in columns.events[rows[i]].get("attendees") or ()
+            }
+            return request.checks(
+                found=True,
+                location_match=bool(location[i]),
+                missing=[p for p in participants if p not in attendees],
+                unavailable=_bits_to_emails(int(conflicts[i]), participants)
+                if conflicts is not None
+                else (),
+            )
+
+        return _vector_result(names, np.column_stack(verdicts), explain)
+
+    return run
+
+
+@vector_family("meeting_cancellation")
+def _meeting_cancellation(params: Dict[str, Any], family_name: str) -> VectorFn:
+    event_id = params["event_id"]
+    keywords = tuple(k.lower() for k in params["keywords"])
+    sent_on = params["sent_on"][:10]
+
+    def run(columns: RolloutColumns) -> VectorResult:
+        exists = np.zeros(columns.size, dtype=bool)
+        id_rows = np.flatnonzero(columns.equals(columns.event_field("id"), event_id))
+        exists[columns.event_state[id_rows]] = True
+
+        rows = sent_on_date(columns, sent_on)
+        owners = columns.email_state[rows]
+        sent_count = np.bincount(owners, minlength=columns.size)
+        keyword = [False] * columns.size
+        emails = columns.emails
+        # Rollouts share most sent emails with the baseline; hashing a body
+        # is several times cheaper than lower-casing it for the scan.
+        scanned: Dict[Any, bool] = {}
+        for row, owner in zip(rows.tolist(), owners.tolist()):
+            if keyword[owner]:
+                continue
+            email = emails[row]
+            key = (email.get("subject"), email.get("body"))
+            mentioned = scanned.get(key)
+            if mentioned is None:
+                mentioned = scanned[key] = _mentions_keyword(email, keywords)
+            keyword[owner] = mentioned
+        keyword = np.array(keyword, dtype=bool)
+
+        def explain(i: int) -> List[TaskVerifier]:
+            return _cancellation_checks(
+                bool(exists[i]), int(sent_count[i]), bool(keyword[i])
+            )
+
+        return _vector_result(
+            ["event_removed_check", "emails_sent_check", "cancellation_keyword_check"],
+            np.column_stack([~exists, sent_count > 0, keyword]),
+            explain,
+        )
+
+    return run
+
+
+@vector_family("travel_confirmation")
+def _travel_confirmation(params: Dict[str, Any], family_name: str) -> VectorFn:
+    labels = [(f["name"], f["number"]) for f in params["flights"]]
+    flights = [
+        (
+            f["number"].lower(),
+            parse_timestamp(f["departure"]),
+            parse_timestamp(f["arrival"]),
+        )
+        for f in params["flights"]
+    ]
+
+    def run(columns: RolloutColumns) -> VectorResult:
+        found = np.zeros((columns.size, len(flights)), dtype=bool)
+        for j, (needle, departure, arrival) in enumerate(flights):
+            rows = np.flatnonzero(
+                (columns.event_start <= departure) & (columns.event_end >= arrival)
+            )
+            for row, owner in zip(rows.tolist(), columns.event_state[rows].tolist()):
+                event = columns.events[row]
+                if (
+                    needle in (event.get("title") or "").lower()
+                    or needle in (event.get("description") or "").lower()
+                ):
+                    found[owner, j] = True
+
+        def explain(i: int) -> List[TaskVerifier]:
+            return _flight_checks(labels, found[i].tolist())
+
+        return _vector_result(
+            [f"{name}_flight_check" for name, _ in labels], found, explain
+        )
+
+    return run
+
+
+@vector_family("multi_meeting_coordination")
+def _multi_meeting_coordination(
+    params: Dict[str, Any], family_name: str
+) -> Optional[VectorFn]:
+    emails = list(dict.fromkeys(params["participants"]))
+    if len(emails) >= MAX_BITSET_EMAILS:
+        return None
+    emails.append(params["external"])
+    required = np.uint64((1 << (len(emails) - 1)) - 1)
+    external = np.uint64(1 << (len(emails) - 1))
+    tolerance = params.get("tolerance_seconds", 300)
+    names = [m["name"] for m in params["meetings"]]
+    meetings = [
+        (parse_timestamp(m["start"]), parse_timestamp(m["end"]))
+        for m in params["meetings"]
+    ]
+
+    def run(columns: RolloutColumns) -> VectorResult:
+        found = np.zeros((columns.size, len(meetings)), dtype=bool)
+        for j, (start, end) in enumerate(meetings):
+            rows = np.flatnonzero(
+                (np.abs(columns.event_start - start) < tolerance)
+                & (np.abs(columns.event_end - end) < tolerance)
+            )
+            if not len(rows):
+                continue
+            bits = columns.attendee_bits(rows.tolist(), emails)
+            rows = rows[((bits & required) == required) & ((bits & external) == 0)]
+            found[columns.event_state[rows], j] = True
+
+        def explain(i: int) -> List[TaskVerifier]:
+            return _coordination_checks(names, found[i].tolist())
+
+        return _vector_result(
+            [f"{name}_meeting_check" for name in names], found, explain
+        )
+
+    return run
+
+
+@vector_family("cascading_changes")
+def _cascading_changes(params: Dict[str, Any], family_name: str) -> VectorFn:
+    cascade = _Cascade.compile(params)
+    names = [name for name, *_ in cascade.meetings]
+    check_names = [f"old_{name}_check" for name in names] + [
+        f"{name}_meeting_check" for name in names
+    ]
+    column_of = {("stale", name): i for i, name in enumerate(names)}
+    column_of.update({("moved", name): len(names) + i for i, name in enumerate(names)})
+
+    def run(columns: RolloutColumns) -> VectorResult:
+        # Only events starting near one of the plan's anchors can match a
+        # branch of the template; classify those rows one by one.
+        start = columns.event_start
+        near = np.zeros(len(start), dtype=bool)
+        for anchor in cascade.anchors:
+            near |= np.abs(start - anchor) < cascade.tolerance
+        found = np.zeros((columns.size, len(check_names)), dtype=bool)
+        rows = np.flatnonzero(near)
+        for row, owner in zip(rows.tolist(), columns.event_state[rows].tolist()):
+            kind = cascade.classify(columns.index_event(row))
+            if kind:
+                found[owner, column_of[kind]] = True
+        stale_columns = slice(0, len(names))
+        verdicts = found.copy()
+        verdicts[:, stale_columns] = ~found[:, stale_columns]
+
+        def explain(i: int) -> List[TaskVerifier]:
+            return cascade.checks(
+                kind for kind, column in column_of.items() if found[i, column]
+            )
+
+        return _vector_result(check_names, verdicts, explain)
+
+    return run
+
+
+def _scalar_fallback(plan: CheckPlan, columns: RolloutColumns) -> VectorResult:
+    results = plan.evaluate_many(columns.states, columns.timestamps)
+    names = [check.name for check in results[0][1]] if results else []
+    verdicts = np.array(
+        [[check.verdict for check in checks] for _, checks in results], dtype=bool
+    ).reshape(len(results), len(names))
+    return VectorResult(
+        names,
+        verdicts,
+        np.array([reward for reward, _ in results], dtype=np.float64),
+        lambda i: results[i][1],
+    )
+
+
+def evaluate_rollouts(
+    plan: CheckPlan,
+    states: Sequence[Dict[str, Any]],
+    timestamps: Optional[TimestampCache] = None,
+) -> VectorResult:
+    """Score N rollouts of `plan`'s scenario with one pass of array operations."""
+    columns = RolloutColumns(states, timestamps)
+    builder = _VECTOR_FAMILIES.get(plan.spec.family)
+    run = builder(plan.spec.params, plan.spec.family) if builder else None
+    if run is None:
+        return _scalar_fallback(plan, columns)
+    return run(columns)
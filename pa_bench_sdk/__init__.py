@@ -2,19 +2,51 @@
 PA Bench SDK entry points.
 
 Expose higher-level helpers for loading scenarios and interacting with the Vibrant Labs worlds.
+
+Attributes are imported on first access (PEP 562), so importing the package
+or an offline submodule does not pull in `aiohttp` through `worlds`.
 """
 
-from .scenario import ScenarioLoader, ScenarioDefinition
-from .worlds import WorldsClient, InstanceEndpoints, resolve_instance_urls
-from .verifier import VerifierRunner, TaskVerifier, VerificationResult
-
-__all__ = [
-    "ScenarioLoader",
-    "ScenarioDefinition",
-    "WorldsClient",
-    "InstanceEndpoints",
-    "resolve_instance_urls",
-    "VerifierRunner",
-    "TaskVerifier",
-    "VerificationResult",
-]
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
+_EXPORTS = {
+    "ScenarioLoader": ".scenario",
+    "ScenarioDefinition": ".scenario",
+    "WorldsClient": ".worlds",
+    "InstanceEndpoints": ".worlds",
+    "resolve_instance_urls": ".worlds",
+    "VerifierRunner": ".verifier",
+    "TaskVerifier": ".verifier",
+    "VerificationResult": ".verifier",
+    "VerifierPool": ".pool",
+    "PoolLimits": ".pool",
+    "EpisodePipeline": ".pipeline",
+    "Episode": ".pipeline",
+    "PipelineLimits": ".pipeline",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .pipeline import Episode, EpisodePipeline, PipelineLimits
+    from .pool import PoolLimits, VerifierPool
+    from .scenario import ScenarioDefinition, ScenarioLoader
+    from .verifier import TaskVerifier, VerificationResult, VerifierRunner
+    from .worlds import InstanceEndpoints, WorldsClient, resolve_instance_urls
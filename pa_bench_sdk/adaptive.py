@@ -0,0 +1,306 @@
+"""
+Adaptive concurrency and retries for clone requests.
+
+`AdaptiveLimiter` keeps one AIMD (additive-increase, multiplicative-decrease)
+concurrency limit per backend and a smaller one per clone URL. A request
+holds a slot in both while it runs. Worlds clones each get their own host
+(`http://{instance_id}.worlds.vibrantlabs.com`), so the backend is the URL's
+registrable domain by default (`backend_key`); every clone of one Worlds
+deployment shares its limit. Pass `group` to key backends differently, e.g.
+on a known base URL. Each success whose latency stays within
+`tolerance` times the fastest recently seen latency for requests of its
+kind raises a limit by `1 / limit` (about one more slot per round of
+requests); an overload (429, 5xx, a connection error or timeout) or a
+latency above that bound multiplies it by `backoff`. A request's kind
+(`request_kind`) is its operation and body size to within a factor of two,
+so a 1.3 MB upload is not judged against the latency of a 160 KB one. Only requests started after the last decrease can trigger
+another one, so a burst of failures from a single round cuts the limit once.
+
+`RetryPolicy` retries failed requests that are safe to repeat after a
+jittered exponential backoff ("full jitter": a uniform delay up to
+`base_delay * 2 ** attempt`, capped at `max_delay`, or the server's
+`Retry-After`). `get_state` is read-only and `set_state` replaces a clone's
+whole state, so both are idempotent; `set_state` retries can still be turned
+off with `set_state=False`.
+
+`Hedger` cuts tail latency on `get_state`: when a response's headers have
+not arrived within the running `quantile` (p95 by default) of recent
+times-to-headers for that backend, a duplicate request goes out and the first
+to succeed wins. At most `budget` (a fraction) of requests are hedged.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Deque, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from . import metrics
+
+RETRY_STATUSES = (429, 502, 503, 504)
+
+
+def is_overload(exc: BaseException) -> bool:
+    """Whether a failure says the server is overloaded or unreachable."""
+    status = getattr(exc, "status", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    return isinstance(exc, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+@dataclass
+class RetryPolicy:
+    retries: int = 3
+    base_delay: float = 0.1
+    max_delay: float = 5.0
+    statuses: Tuple[int, ...] = RETRY_STATUSES
+    set_state: bool = True
+
+    def reason(self, operation: str, exc: BaseException) -> Optional[str]:
+        """Why `exc` is worth retrying (a metrics label), or `None`."""
+        if operation == "set_state" and not self.set_state:
+            return None
+        status = getattr(exc, "status", None)
+        if isinstance(status, int):
+            return str(status) if status in self.statuses else None
+        if isinstance(exc, asyncio.TimeoutError):
+            return "timeout"
+        if isinstance(exc, aiohttp.ClientConnectionError):
+            return "connection"
+        return None
+
+    def delay(self, attempt: int, exc: BaseException) -> float:
+        retry_after = getattr(exc, "retry_after", None)
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+def request_kind(operation: str, body_bytes: Optional[int] = None) -> str:
+    """`operation`, plus the power-of-two size class of a request body."""
+    if not body_bytes:
+        return operation
+    return f"{operation}:{body_bytes.bit_length()}"
+
+
+def backend_key(url: str) -> str:
+    """`scheme://domain[:port]` of `url`, `domain` being its last two labels.
+
+    IP addresses and single-label hosts (e.g. `localhost`) are kept whole.
+    Domains under multi-label public suffixes (`.co.uk`) need a `group`.
+    """
+    parts = urlsplit(url)
+    host = parts.hostname or ""
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        port = f":{parts.port}" if parts.port else ""
+        return f"{parts.scheme}://{'.'.join(host.split('.')[-2:])}{port}"
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class Hedger:
+    """Hedge delays and budget for duplicate `get_state` requests.
+
+    Latencies are kept per `backend_key`. Until a backend has `warmup` samples its delay is `initial_delay`; after
+    that it is the `quantile` of the last `window` samples, recomputed every
+    16 samples and never below `min_delay`.
+    """
+
+    def __init__(
+        self,
+        budget: float = 0.05,
+        quantile: float = 0.95,
+        initial_delay: float = 0.05,
+        min_delay: float = 0.001,
+        window: int = 256,
+        warmup: int = 20,
+    ):
+        self.budget = budget
+        self.quantile = quantile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.window = window
+        self.warmup = warmup
+        self.requests = 0
+        self.hedges = 0
+        self._samples: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, int] = {}
+        self._delays: Dict[str, float] = {}
+
+    def delay(self, url: str) -> float:
+        return self._delays.get(backend_key(url), self.initial_delay)
+
+    def observe(self, url: str, seconds: float) -> None:
+        """Record how long a request to `url` took to get response headers."""
+        host = backend_key(url)
+        samples = self._samples.get(host)
+        if samples is None:
+            samples = self._samples[host] = deque(maxlen=self.window)
+            self._counts[host] = 0
+        samples.append(seconds)
+        self._counts[host] = count = self._counts[host] + 1
+        if count == self.warmup or (count > self.warmup and count % 16 == 0):
+            ordered = sorted(samples)
+            index = min(int(self.quantile * len(ordered)), len(ordered) - 1)
+            self._delays[host] = max(ordered[index], self.min_delay)
+
+    def count_request(self) -> None:
+        self.requests += 1
+
+    def allow(self) -> bool:
+        """Take a hedge from the budget, if there is one left."""
+        if self.hedges + 1 > self.budget * self.requests:
+            return False
+        self.hedges += 1
+        return True
+
+
+class AdaptiveLimit:
+    """One AIMD concurrency limit."""
+
+    def __init__(
+        self,
+        initial: float = 4,
+        minimum: float = 1,
+        maximum: float = 64,
+        tolerance: float = 2.0,
+        backoff: float = 0.5,
+    ):
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.in_flight = 0
+        # Fastest recent latency per request kind.
+        self.baselines: Dict[str, float] = {}
+        self._last_decrease = float("-inf")
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+
+    async def acquire(self) -> None:
+        while self.in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                else:
+                    self._wake()
+                raise
+        self.in_flight += 1
+
+    def release(
+        self, started: float, latency: Optional[float], overloaded: bool, kind: str = ""
+    ) -> None:
+        """Free a slot and adapt: `latency` is `None` for neutral failures."""
+        self.in_flight -= 1
+        baseline = self.baselines.get(kind)
+        inflated = (
+            latency is not None and baseline is not None and latency > self.tolerance * baseline
+        )
+        if overloaded or inflated:
+            if started >= self._last_decrease:
+                self.limit = max(self.minimum, self.limit * self.backoff)
+                self._last_decrease = time.perf_counter()
+        elif latency is not None:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+        if latency is not None and not overloaded:
+            if baseline is None or latency < baseline:
+                self.baselines[kind] = latency
+            else:
+                # Drift up slowly so one unusually fast reply does not pin it.
+                self.baselines[kind] = baseline + (latency - baseline) * 0.01
+        self._wake()
+
+    def _wake(self) -> None:
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+
+class _Slot:
+    __slots__ = ("overloaded",)
+
+    def __init__(self):
+        self.overloaded = False
+
+
+class AdaptiveLimiter:
+    """`AdaptiveLimit`s per backend and per clone URL.
+
+    `group(url)` names a clone's backend (default: `backend_key`). Backend
+    limits start at `initial` and stay within `minimum`..`maximum`; clone
+    limits use `clone_maximum` as their ceiling.
+    """
+
+    def __init__(
+        self,
+        initial: float = 4,
+        minimum: float = 1,
+        maximum: float = 64,
+        clone_maximum: float = 4,
+        tolerance: float = 2.0,
+        backoff: float = 0.5,
+        group: Callable[[str], str] = backend_key,
+    ):
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.clone_maximum = clone_maximum
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.group = group
+        self.backends: Dict[str, AdaptiveLimit] = {}
+        self.clones: Dict[str, AdaptiveLimit] = {}
+
+    def _limit(self, maximum: float) -> AdaptiveLimit:
+        return AdaptiveLimit(
+            min(self.initial, maximum), self.minimum, maximum, self.tolerance, self.backoff
+        )
+
+    def limits(self, url: str) -> Tuple[str, AdaptiveLimit, AdaptiveLimit]:
+        backend = self.group(url)
+        if backend not in self.backends:
+            self.backends[backend] = self._limit(self.maximum)
+        if url not in self.clones:
+            self.clones[url] = self._limit(self.clone_maximum)
+        return backend, self.backends[backend], self.clones[url]
+
+    @asynccontextmanager
+    async def slot(self, url: str, kind: str = "") -> AsyncIterator[_Slot]:
+        """Hold a slot for a request of `kind` (see `request_kind`) to clone `url`.
+
+        A block that raises counts as an overload only if it sets
+        `slot.overloaded`; other failures release the slot without adapting.
+        """
+        backend, backend_limit, clone_limit = self.limits(url)
+        await clone_limit.acquire()
+        try:
+            await backend_limit.acquire()
+        except BaseException:
+            clone_limit.release(0.0, None, False)
+            raise
+        slot = _Slot()
+        started = time.perf_counter()
+        latency: Optional[float] = None
+        try:
+            yield slot
+            latency = time.perf_counter() - started
+        finally:
+            for limit in (backend_limit, clone_limit):
+                limit.release(started, latency, slot.overloaded, kind)
+            metrics.HTTP_CONCURRENCY_LIMIT.labels(backend).set(backend_limit.limit)
@@ -0,0 +1,283 @@
+"""
+Batch verification and loading behind `pa-bench verify-all` and `load-all`.
+
+A batch is a sequence of `StateRecord`s: the records of a saved states
+archive or, without one, each selected scenario's stored state repeated
+`repeat` times (a throughput and regression check of the verifiers
+themselves). Records go through `verify_stream`, so a batch runs in the same
+bounded, ordered window as `verify-stream`; `BatchSummary` aggregates the
+result rows per scenario.
+
+`BatchCheckpoint` makes a batch resumable and shardable: records outside
+the node's `Shard` or already in the `ProgressJournal` are skipped before
+they are verified, and each successfully verified record's key
+`(scenario_id, instance, rollout)` is journaled once its row is written.
+Records that errored are not journaled and are retried on restart.
+
+`load_batch` pushes scenario states to many clone pairs concurrently, from a
+plan of `LoadTask`s (one JSON object per line: `scenario_id` plus optional
+`gomail_url`/`gocalendar_url`, `instance` and `rollout`), with the same
+checkpointing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Set,
+    Union,
+)
+
+from .journal import ProgressJournal, Shard, WorkKey, work_key
+from .scenario import ScenarioLoader
+from .stream import MalformedDocument, StateRecord, iter_json_documents
+
+if TYPE_CHECKING:
+    from .worlds import InstanceEndpoints, WorldsClient
+
+
+def baseline_records(
+    data_path: Union[str, Path],
+    scenario_ids: Optional[Sequence[str]] = None,
+    repeat: int = 1,
+) -> Iterator[StateRecord]:
+    """One record per scenario and repetition, verifying the stored state."""
+    if scenario_ids is None:
+        scenario_ids = ScenarioLoader(data_path).list_scenarios()
+    index = 0
+    for scenario_id in scenario_ids:
+        for rollout in range(repeat):
+            yield StateRecord(index, scenario_id, None, f"{scenario_id}/{rollout}")
+            index += 1
+
+
+def select_records(
+    records: Iterable[StateRecord], scenario_ids: Optional[Sequence[str]]
+) -> Iterator[StateRecord]:
+    if scenario_ids is None:
+        yield from records
+        return
+    selected = set(scenario_ids)
+    for record in records:
+        # Unparseable records have no scenario of their own; report them.
+        if record.scenario_id in selected or record.error is not None:
+            yield record
+
+
+def record_key(record: StateRecord) -> WorkKey:
+    rollout = record.record_id if record.record_id is not None else record.index
+    return work_key(record.scenario_id, record.instance, rollout)
+
+
+class BatchCheckpoint:
+    """Skips finished or foreign work and journals completed records.
+
+    `select` and `completed` must see records and rows in the same order,
+    which `verify_stream` guarantees.
+    """
+
+    def __init__(
+        self,
+        journal: Optional[ProgressJournal] = None,
+        shard: Optional[Shard] = None,
+    ):
+        self.journal = journal
+        self.shard = shard
+        self.skipped_done = 0
+        self.skipped_shard = 0
+        self._keys: Deque[WorkKey] = deque()
+
+    def pending(self, key: WorkKey) -> bool:
+        """Whether `key` belongs to this shard and has not been completed."""
+        if self.shard is not None and not self.shard.owns(key):
+            self.skipped_shard += 1
+            return False
+        if self.journal is not None and key in self.journal:
+            self.skipped_done += 1
+            return False
+        return True
+
+    def done(self, key: WorkKey) -> None:
+        if self.journal is not None:
+            self.journal.record(key)
+
+    def select(self, records: Iterable[StateRecord]) -> Iterator[StateRecord]:
+        for record in records:
+            key = record_key(record)
+            if self.pending(key):
+                self._keys.append(key)
+                yield record
+
+    def completed(self, row: Dict[str, Any]) -> None:
+        key = self._keys.popleft()
+        if "error" not in row:
+            self.done(key)
+
+    def close(self) -> None:
+        if self.journal is not None:
+            self.journal.close()
+
+
+@dataclass
+class ScenarioTotals:
+    count: int = 0
+    errors: int = 0
+    passed: int = 0
+    reward_total: float = 0.0
+
+    @property
+    def mean_reward(self) -> float:
+        scored = self.count - self.errors
+        return self.reward_total / scored if scored else 0.0
+
+
+@dataclass
+class BatchSummary:
+    """Per-scenario counts and rewards of a batch's result rows."""
+
+    scenarios: Dict[str, ScenarioTotals] = field(default_factory=dict)
+
+    def add(self, row: Dict[str, Any]) -> None:
+        totals = self.scenarios.setdefault(row.get("scenario_id") or "-", ScenarioTotals())
+        totals.count += 1
+        if "error" in row:
+            totals.errors += 1
+            return
+        totals.reward_total += row["reward"]
+        totals.passed += bool(row["passed"])
+
+    @property
+    def count(self) -> int:
+        return sum(totals.count for totals in self.scenarios.values())
+
+    @property
+    def errors(self) -> int:
+        return sum(totals.errors for totals in self.scenarios.values())
+
+    def format(self) -> str:
+        rows = [("scenario", "states", "errors", "passed", "mean reward")]
+        for scenario_id, totals in sorted(self.scenarios.items()):
+            rows.append(
+                (
+                    scenario_id,
+                    str(totals.count),
+                    str(totals.errors),
+                    str(totals.passed),
+                    f"{totals.mean_reward:.3f}",
+                )
+            )
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        return "\n".join(
+            "  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+            for row in rows
+        )
+
+
+@dataclass
+class LoadTask:
+    scenario_id: str
+    gomail_url: Optional[str] = None
+    gocalendar_url: Optional[str] = None
+    instance: Optional[str] = None
+    rollout: Any = 0
+
+    @property
+    def key(self) -> WorkKey:
+        return work_key(self.scenario_id, self.instance or self.gomail_url, self.rollout)
+
+
+def read_load_plan(handle: IO[str]) -> Iterator[LoadTask]:
+    for index, document in enumerate(iter_json_documents(handle)):
+        if isinstance(document, MalformedDocument):
+            raise ValueError(f"Plan entry {index}: {document.message}")
+        if not isinstance(document, dict) or not isinstance(document.get("scenario_id"), str):
+            raise ValueError(f"Plan entry {index} must be an object with a `scenario_id`")
+        yield LoadTask(
+            scenario_id=document["scenario_id"],
+            gomail_url=document.get("gomail_url"),
+            gocalendar_url=document.get("gocalendar_url"),
+            instance=document.get("instance"),
+            rollout=document.get("rollout", 0),
+        )
+
+
+async def load_batch(
+    tasks: Iterable[LoadTask],
+    loader: ScenarioLoader,
+    client: "WorldsClient",
+    default_endpoints: Callable[[], Awaitable["InstanceEndpoints"]],
+    concurrency: int = 8,
+    checkpoint: Optional[BatchCheckpoint] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Load every pending task with at most `concurrency` in flight.
+
+    Yields one row per task in completion order. Scenario payloads are read
+    once per scenario; tasks without URLs use `default_endpoints()`.
+    """
+    from .worlds import InstanceEndpoints
+
+    checkpoint = checkpoint or BatchCheckpoint()
+    payloads: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+
+    def scenario_payloads(scenario_id: str) -> "asyncio.Future[Dict[str, Any]]":
+        future = payloads.get(scenario_id)
+        if future is None:
+            future = payloads[scenario_id] = asyncio.ensure_future(
+                asyncio.to_thread(lambda: loader.load(scenario_id).clone_payloads())
+            )
+        return future
+
+    async def run(task: LoadTask) -> Dict[str, Any]:
+        started = time.perf_counter()
+        row: Dict[str, Any] = {
+            "scenario_id": task.scenario_id,
+            "instance": task.key[1],
+            "rollout": task.rollout,
+        }
+        try:
+            if task.gomail_url and task.gocalendar_url:
+                endpoints = InstanceEndpoints(task.gomail_url, task.gocalendar_url)
+            else:
+                endpoints = await default_endpoints()
+            states = await scenario_payloads(task.scenario_id)
+            await client.set_states(
+                endpoints,
+                gmail_state=states["gomail"],
+                calendar_state=states["gocalendar"],
+            )
+        except Exception as exc:
+            row["error"] = f"{type(exc).__name__}: {exc}"
+        else:
+            checkpoint.done(task.key)
+        row["seconds"] = time.perf_counter() - started
+        return row
+
+    in_flight: Set["asyncio.Task[Dict[str, Any]]"] = set()
+    for task in tasks:
+        if not checkpoint.pending(task.key):
+            continue
+        if len(in_flight) >= concurrency:
+            finished, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for done in finished:
+                yield done.result()
+        in_flight.add(asyncio.ensure_future(run(task)))
+    while in_flight:
+        finished, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+        for done in finished:
+            yield done.result()
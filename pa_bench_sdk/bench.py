@@ -0,0 +1,296 @@
+"""
+End-to-end benchmarks for `pa-bench bench`.
+
+Each workload repeats one operation over the selected scenarios, from
+`concurrency` coroutines at once:
+
+- `load`: read a scenario and encode its clone states in a thread, then
+  `set_state` both clones (what `load-scenario` and `load-all` do);
+- `verify`: run the scenario's verifier on its stored state, in a thread or
+  on a `VerifierPool`;
+- `get-state`: fetch the clone states the scenario's verifier reads;
+- `cycle`: load, fetch and verify the fetched state.
+
+Stored and fetched states are trimmed to the verifier's `STATE_PATHS` (see
+`pa_bench_sdk.projection`).
+
+Clone workloads run against real instances or the stand-in clones in
+`pa_bench_sdk.standin`; each coroutine uses its own instance pair when
+there are enough of them. Results report latency percentiles, throughput,
+the CPU time spent by this process and its verifier workers, and memory.
+
+A run can be saved as a baseline; `compare` lines a later run up against
+it and flags workloads whose throughput fell, or whose p95 latency rose, by
+more than a margin.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import os
+import resource
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from .pool import latency_summary, worker_memory
+from .scenario import ScenarioLoader
+from .verifier import VerifierRunner
+from .worlds import InstanceEndpoints, WorldsClient, encode_payload
+
+WORKLOADS = ("load", "verify", "get-state", "cycle")
+CLONE_WORKLOADS = ("load", "get-state", "cycle")
+
+State = Dict[str, Dict[str, Any]]
+Operation = Callable[[str, Optional[InstanceEndpoints]], Awaitable[Any]]
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def process_cpu_seconds(pids: Sequence[int]) -> float:
+    """User plus system CPU seconds of other processes, from `/proc`."""
+    total = 0
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat") as handle:
+                fields = handle.read().rpartition(")")[2].split()
+        except OSError:
+            continue
+        total += int(fields[11]) + int(fields[12])
+    return total / _CLOCK_TICKS
+
+
+def _rss_bytes() -> int:
+    with open("/proc/self/statm") as handle:
+        return int(handle.read().split()[1]) * _PAGE_SIZE
+
+
+@dataclass
+class BenchResult:
+    workload: str
+    concurrency: int
+    seconds: float
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    first_error: Optional[str] = None
+    cpu_seconds: float = 0.0
+    rss_bytes: int = 0
+    max_rss_bytes: int = 0
+    worker_pss_bytes: int = 0
+
+    def summary(self) -> Dict[str, Any]:
+        latency = latency_summary(self.latencies)
+        row: Dict[str, Any] = {
+            "workload": self.workload,
+            "concurrency": self.concurrency,
+            "requests": len(self.latencies) + self.errors,
+            "errors": self.errors,
+            "seconds": self.seconds,
+            "throughput": len(self.latencies) / self.seconds if self.seconds else 0.0,
+        }
+        for key in ("p50", "p95", "p99"):
+            row[f"{key}_ms"] = latency.get(key, 0.0) * 1000
+        row["cpu_seconds"] = self.cpu_seconds
+        row["cpu_percent"] = 100 * self.cpu_seconds / self.seconds if self.seconds else 0.0
+        row["rss_mb"] = self.rss_bytes / 2 ** 20
+        row["max_rss_mb"] = self.max_rss_bytes / 2 ** 20
+        if self.worker_pss_bytes:
+            row["worker_pss_mb"] = self.worker_pss_bytes / 2 ** 20
+        if self.first_error is not None:
+            row["first_error"] = self.first_error
+        return row
+
+
+class Benchmark:
+    """Runs the `WORKLOADS` against a set of instance pairs."""
+
+    def __init__(
+        self,
+        data_path: Union[str, Path] = "data",
+        scenario_ids: Optional[Sequence[str]] = None,
+        pairs: Sequence[InstanceEndpoints] = (),
+        client: Optional[WorldsClient] = None,
+        verifier: Any = None,
+    ):
+        self.loader = ScenarioLoader(data_path)
+        self.runner = VerifierRunner(data_path)
+        self.scenario_ids = list(scenario_ids or self.loader.list_scenarios())
+        if not self.scenario_ids:
+            raise ValueError(f"No scenarios found under {data_path}")
+        self.pairs = list(pairs)
+        self.client = client
+        self.verifier = verifier
+        self._stored: Dict[str, State] = {}
+
+    def _encode(self, scenario_id: str) -> Tuple[bytes, bytes]:
+        payloads = self.loader.load(scenario_id).clone_payloads()
+        return encode_payload(payloads["gomail"]), encode_payload(payloads["gocalendar"])
+
+    async def _load(self, scenario_id: str, pair: Optional[InstanceEndpoints]) -> None:
+        bodies = await asyncio.to_thread(self._encode, scenario_id)
+        await self.client.set_states(pair, *bodies)
+
+    async def _verify(self, scenario_id: str, state: State) -> Any:
+        if self.verifier is not None:
+            return await asyncio.wrap_future(self.verifier.submit(scenario_id, state))
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.runner.run, scenario_id, state)
+
+    async def _verify_stored(self, scenario_id: str, pair: Optional[InstanceEndpoints]) -> Any:
+        return await self._verify(scenario_id, self._stored[scenario_id])
+
+    async def _get_state(self, scenario_id: str, pair: Optional[InstanceEndpoints]) -> State:
+        return await self.client.get_states(pair, self.runner.projection(scenario_id))
+
+    async def _cycle(self, scenario_id: str, pair: Optional[InstanceEndpoints]) -> Any:
+        await self._load(scenario_id, pair)
+        state = await self.client.get_states(pair, self.runner.projection(scenario_id))
+        return await self._verify(scenario_id, state)
+
+    async def prepare(self, workload: str) -> None:
+        """Untimed setup: stored states and verifier imports, or loaded pairs."""
+        if workload in CLONE_WORKLOADS and (self.client is None or not self.pairs):
+            raise ValueError(f"The {workload!r} workload needs a client and instance pairs")
+        if workload != "load":
+            for scenario_id in self.scenario_ids:
+                self.runner.projection(scenario_id)
+        if workload in ("verify", "cycle"):
+            for scenario_id in self.scenario_ids:
+                if scenario_id not in self._stored:
+                    projection = self.runner.projection(scenario_id)
+                    scenario = self.loader.load(scenario_id, projection or "full")
+                    self._stored[scenario_id] = {
+                        "gomail": scenario.gmail_state,
+                        "gocalendar": scenario.calendar_state,
+                    }
+                await self._verify_stored(scenario_id, None)
+        if workload == "get-state":
+            await asyncio.gather(
+                *(
+                    self._load(self.scenario_ids[slot % len(self.scenario_ids)], pair)
+                    for slot, pair in enumerate(self.pairs)
+                )
+            )
+
+    def _operation(self, workload: str) -> Operation:
+        operations = {
+            "load": self._load,
+            "verify": self._verify_stored,
+            "get-state": self._get_state,
+            "cycle": self._cycle,
+        }
+        try:
+            return operations[workload]
+        except KeyError:
+            raise ValueError(
+                f"Unknown workload {workload!r}; expected one of {', '.join(WORKLOADS)}"
+            ) from None
+
+    def _worker_pids(self) -> List[int]:
+        pids = getattr(self.verifier, "pids", None)
+        return list(pids()) if callable(pids) else []
+
+    async def run(
+        self,
+        workload: str,
+        concurrency: int,
+        requests: Optional[int] = None,
+        duration: Optional[float] = None,
+    ) -> BenchResult:
+        """Run `requests` operations, or as many as fit in `duration` seconds."""
+        operation = self._operation(workload)
+        if requests is None and duration is None:
+            requests = len(self.scenario_ids)
+        await self.prepare(workload)
+
+        result = BenchResult(workload, concurrency, 0.0)
+        counter = itertools.count()
+        deadline = None if duration is None else time.perf_counter() + duration
+
+        async def drive(slot: int) -> None:
+            pair = self.pairs[slot % len(self.pairs)] if self.pairs else None
+            while True:
+                index = next(counter)
+                if requests is not None and index >= requests:
+                    return
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return
+                scenario_id = self.scenario_ids[index % len(self.scenario_ids)]
+                started = time.perf_counter()
+                try:
+                    await operation(scenario_id, pair)
+                except Exception as exc:
+                    result.errors += 1
+                    if result.first_error is None:
+                        result.first_error = f"{type(exc).__name__}: {exc}"
+                    continue
+                result.latencies.append(time.perf_counter() - started)
+
+        pids = self._worker_pids()
+        cpu_started = time.process_time() + process_cpu_seconds(pids)
+        started = time.perf_counter()
+        await asyncio.gather(*(drive(slot) for slot in range(concurrency)))
+        result.seconds = time.perf_counter() - started
+        result.cpu_seconds = time.process_time() + process_cpu_seconds(pids) - cpu_started
+        result.rss_bytes = _rss_bytes()
+        result.max_rss_bytes = max(
+            result.rss_bytes, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        )
+        result.worker_pss_bytes = sum(
+            usage.get("pss", 0) for usage in worker_memory(pids).values()
+        )
+        return result
+
+
+def save_baseline(path: Union[str, Path], rows: Sequence[Dict[str, Any]]) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    baseline = {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": list(rows)}
+    path.write_text(json.dumps(baseline, indent=2) + "\n")
+
+
+def load_baseline(path: Union[str, Path]) -> List[Dict[str, Any]]:
+    return json.loads(Path(path).read_text())["results"]
+
+
+def compare(
+    rows: Sequence[Dict[str, Any]],
+    baseline: Sequence[Dict[str, Any]],
+    max_regression: float = 0.1,
+) -> List[Dict[str, Any]]:
+    """Throughput and p95 changes per workload and concurrency level.
+
+    A row is `regressed` when throughput fell, or p95 latency rose, by more
+    than `max_regression` (a fraction of the baseline value). Levels missing
+    from the baseline are skipped.
+    """
+    previous = {(row["workload"], row["concurrency"]): row for row in baseline}
+    changes = []
+    for row in rows:
+        before = previous.get((row["workload"], row["concurrency"]))
+        if before is None:
+            continue
+        throughput = _change(before["throughput"], row["throughput"])
+        p95 = _change(before["p95_ms"], row["p95_ms"])
+        changes.append(
+            {
+                "workload": row["workload"],
+                "concurrency": row["concurrency"],
+                "throughput": row["throughput"],
+                "throughput_change": throughput,
+                "p95_ms": row["p95_ms"],
+                "p95_change": p95,
+                "regressed": throughput < -max_regression or p95 > max_regression,
+            }
+        )
+    return changes
+
+
+def _change(before: float, after: float) -> float:
+    if not before:
+        return 0.0
+    return (after - before) / before
@@ -1,39 +1,96 @@
 """
 Command-line helpers for the PA Bench SDK.
 
-Provides `load-scenario` and `verify` commands that mirror the original
-scripts while reusing the new SDK internals.
+Provides `load-scenario`, `load-all`, `verify`, `verify-stream`, `verify-all` and `serve` commands that mirror the original
+scripts while reusing the new SDK internals. `worker` serves a
+`verify-all --coordinate` run from another host. `bench` measures loads,
+verification and state fetches against real instances or the stand-in
+clones that `standin` serves. `generate` writes scaled-up copies of the
+shipped scenarios for stress tests.
+
+The global `--timings` and `--profile=cprofile|tracemalloc` switches wrap each
+stage of a command and print a per-stage table when the command ends.
+`--trace PATH` records tracing spans (see `pa_bench_sdk.tracing`) as JSONL
+or a Chrome trace. `--metrics PATH` dumps the metrics registry (see
+`pa_bench_sdk.metrics`) as JSON every `--metrics-interval` seconds and when
+the command ends.
+`--results DB` records every verification in a SQLite results store, which
+`results query|summary` reads back.
+
+The aiohttp-backed `worlds` helpers are bound on first use, so `--help` and
+offline commands start without importing the networking stack.
 """
 
 from __future__ import annotations
 
 import argparse
-import asyncio
+import json
+import os
+import sys
+import time
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
+from . import tracing
 from .scenario import ScenarioLoader
+from .timing import StageTimings
 from .verifier import VerifierRunner
-from .worlds import (
-    InstanceEndpoints,
-    WorldsClient,
-    resolve_instance_urls,
-    DEFAULT_WORLDS_BASE_URL,
-)
+
+if TYPE_CHECKING:
+    from .worlds import (
+        InstanceEndpoints,
+        WorldsClient,
+        resolve_instance_urls,
+        DEFAULT_WORLDS_BASE_URL,
+    )
 
 
 DEFAULT_DATA_PATH = Path("data")
+DEFAULT_PROFILE_DIR = Path("profiles")
+# Mirrors `profiling.PROFILERS`; kept here so `--help` does not import the profilers.
+PROFILERS = ("cprofile", "tracemalloc")
+
+_NETWORK_ATTRS = (
+    "InstanceEndpoints",
+    "WorldsClient",
+    "resolve_instance_urls",
+    "DEFAULT_WORLDS_BASE_URL",
+)
+
+
+def __getattr__(name: str):
+    if name not in _NETWORK_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from . import worlds
+
+    value = getattr(worlds, name)
+    globals()[name] = value
+    return value
+
+
+def _require_networking() -> None:
+    """Bind the `worlds` helpers as module globals before a networked command."""
+    for name in _NETWORK_ATTRS:
+        if name not in globals():
+            __getattr__(name)
 
 
 class CLIArgs:
     def __init__(
         self,
         data_path: Path,
-        scenario_id: str,
+        scenario_id: Optional[str],
         gomail_url: Optional[str],
         gocalendar_url: Optional[str],
         env_file: Optional[Path],
         worlds_base_url: str,
+        state_file: Optional[Path] = None,
+        profile: Optional[str] = None,
+        profile_dir: Path = DEFAULT_PROFILE_DIR,
+        timings: bool = False,
+        results: Optional[Path] = None,
+        run_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
     ):
         self.data_path = data_path
         self.scenario_id = scenario_id
@@ -41,6 +98,73 @@ class CLIArgs:
         self.gocalendar_url = gocalendar_url
         self.env_file = env_file
         self.worlds_base_url = worlds_base_url
+        self.state_file = state_file
+        self.profile = profile
+        self.profile_dir = profile_dir
+        self.timings = timings
+        self.results = results
+        self.run_id = run_id
+        self.agent_id = agent_id
+        self._stage_timings: Optional[StageTimings] = None
+        self._results_store = None
+
+    def stage_timings(self) -> StageTimings:
+        """The command's `StageTimings`, with the `--profile` profiler attached."""
+        if self._stage_timings is None:
+            profiler = None
+            if self.profile is not None:
+                from .profiling import make_profiler
+
+                profiler = make_profiler(self.profile, self.profile_dir)
+            self._stage_timings = StageTimings(profiler)
+        return self._stage_timings
+
+    @property
+    def report_timings(self) -> bool:
+        return self.timings or self.profile is not None
+
+    def results_store(self):
+        """The `--results` store (opened on first use), or `None`."""
+        if self.results is None:
+            return None
+        if self._results_store is None:
+            from .results import ResultsStore, new_run_id
+
+            self.run_id = self.run_id or new_run_id()
+            self._results_store = ResultsStore(self.results, data_path=self.data_path)
+        return self._results_store
+
+    def record_result(self, result, state, timings: StageTimings) -> None:
+        store = self.results_store()
+        if store is None:
+            return
+        from .results import state_hash
+
+        store.add(
+            result,
+            self.run_id,
+            self.agent_id,
+            state_digest=state_hash(state),
+            timings=timings.as_dict(),
+        )
+
+    def record_row(self, row) -> None:
+        store = self.results_store()
+        if store is not None:
+            store.add_row(row, self.run_id, self.agent_id)
+
+    def recorded_records(self, records):
+        """Hash each record's state when results are being recorded."""
+        if self.results is None:
+            return records
+        from .results import hash_records
+
+        return hash_records(records)
+
+    def close_results(self) -> None:
+        if self._results_store is not None:
+            self._results_store.close()
+            self._results_store = None
 
 
 def _create_parser() -> argparse.ArgumentParser:
@@ -69,6 +193,57 @@ def _create_parser() -> argparse.ArgumentParser:
         default=None,
         help="Optional .env file to load instance URLs from",
     )
+    parser.add_argument(
+        "--profile",
+        choices=PROFILERS,
+        default=None,
+        help="Profile every stage and write the reports to --profile-dir",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=Path,
+        default=DEFAULT_PROFILE_DIR,
+        help="Directory for --profile reports (default: profiles/)",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print a per-stage timing table when the command ends",
+    )
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        default=None,
+        help="Write tracing spans here: JSONL for *.jsonl, else Chrome trace JSON",
+    )
+    parser.add_argument(
+        "--metrics",
+        type=Path,
+        default=None,
+        help="Dump counters and latency histograms to this JSON file while running",
+    )
+    parser.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=10.0,
+        help="Seconds between --metrics dumps (default: 10)",
+    )
+    parser.add_argument(
+        "--results",
+        type=Path,
+        default=None,
+        help="Record every verification in this SQLite results database",
+    )
+    parser.add_argument(
+        "--run-id",
+        default=None,
+        help="Run id for --results rows (default: timestamp plus random suffix)",
+    )
+    parser.add_argument(
+        "--agent-id",
+        default=None,
+        help="Agent id for --results rows",
+    )
 
     subparsers = parser.add_subparsers(dest="command", required=True)
 
@@ -85,30 +260,454 @@ def _create_parser() -> argparse.ArgumentParser:
     verify_parser.add_argument(
         "scenario_id", help="Scenario folder name (e.g. scenario_001)"
     )
+    verify_parser.add_argument(
+        "--state-file",
+        type=Path,
+        default=None,
+        help="Verify a saved state JSON file instead of the live clones",
+    )
+
+    stream_parser = subparsers.add_parser(
+        "verify-stream",
+        help="Re-score saved states from a JSONL or concatenated JSON stream",
+    )
+    stream_parser.add_argument(
+        "input",
+        nargs="?",
+        default="-",
+        help="States file (default: stdin); documents are states or "
+        "{'state': ..., 'scenario_id': ..., 'id': ...} records",
+    )
+    stream_parser.add_argument(
+        "--scenario",
+        dest="scenario_id",
+        default=None,
+        help="Scenario for documents that do not name one",
+    )
+    stream_parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Write JSONL results here instead of stdout",
+    )
+    stream_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Verifier worker processes (default: CPU count; 0 runs in-process)",
+    )
+    stream_parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=None,
+        help="Bound on states parsed but not yet written (default: 4 per worker)",
+    )
+    _add_checkpoint_arguments(stream_parser)
+
+    all_parser = subparsers.add_parser(
+        "verify-all",
+        help="Verify every scenario's stored state, or a saved states archive, in a batch",
+    )
+    all_parser.add_argument(
+        "--states",
+        default=None,
+        help="States archive (JSONL or concatenated JSON, '-' for stdin); "
+        "default: each scenario's stored state",
+    )
+    all_parser.add_argument(
+        "--scenario",
+        dest="scenario_ids",
+        action="append",
+        default=None,
+        help="Only verify this scenario (repeatable; default: all)",
+    )
+    all_parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Rollouts per scenario when verifying stored states",
+    )
+    all_parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Write JSONL results here instead of stdout",
+    )
+    all_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Verifier worker processes (default: CPU count; 0 runs in-process)",
+    )
+    all_parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=None,
+        help="Bound on states queued but not yet written (default: 64 per worker)",
+    )
+    all_parser.add_argument(
+        "--schedule",
+        choices=("fifo", "longest"),
+        default="longest",
+        help="Run queued states in submission order, or the scenarios with the "
+        "longest learned verifier cost first (default: longest)",
+    )
+    all_parser.add_argument(
+        "--costs",
+        type=Path,
+        default=None,
+        help="JSON file of per-scenario verifier costs for --schedule longest, read "
+        "at start and updated at the end so later runs schedule well from the start",
+    )
+    all_parser.add_argument(
+        "--coordinate",
+        default=None,
+        metavar="HOST:PORT",
+        help="Listen here and hand records to `pa-bench worker` processes "
+        "instead of verifying them locally",
+    )
+    _add_authkey_argument(all_parser)
+    _add_checkpoint_arguments(all_parser)
+    _add_sampling_arguments(all_parser)
+
+    worker_parser = subparsers.add_parser(
+        "worker", help="Verify records handed out by a `verify-all --coordinate` run"
+    )
+    worker_parser.add_argument("connect", metavar="HOST:PORT", help="Coordinator address")
+    worker_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Verifier worker processes (default: CPU count; 0 runs in-process)",
+    )
+    worker_parser.add_argument(
+        "--capacity",
+        type=int,
+        default=None,
+        help="Records leased at once (default: 2 per worker process)",
+    )
+    _add_authkey_argument(worker_parser)
+
+    load_all_parser = subparsers.add_parser(
+        "load-all", help="Load scenarios into many clone pairs from a plan"
+    )
+    load_all_parser.add_argument(
+        "plan",
+        nargs="?",
+        default="-",
+        help="JSONL plan (default: stdin); one {'scenario_id', 'gomail_url'?, "
+        "'gocalendar_url'?, 'instance'?, 'rollout'?} object per load",
+    )
+    load_all_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Most loads in flight at once (default: 32, or 8 with --no-adaptive); "
+        "the adaptive limiter settles on a level below it",
+    )
+    load_all_parser.add_argument(
+        "--no-adaptive",
+        action="store_true",
+        help="Keep --concurrency loads in flight instead of adapting to the backend",
+    )
+    load_all_parser.add_argument(
+        "--retries",
+        type=int,
+        default=3,
+        help="Retries per set_state after 429/502/503/504 or connection errors "
+        "(jittered exponential backoff; default: 3, 0 to disable)",
+    )
+    load_all_parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Write JSONL load outcomes here instead of stdout",
+    )
+    _add_checkpoint_arguments(load_all_parser)
+
+    results_parser = subparsers.add_parser(
+        "results", help="Query a --results database"
+    )
+    results_commands = results_parser.add_subparsers(dest="results_command", required=True)
+    query_parser = results_commands.add_parser(
+        "query", help="Print matching results (with their checks) as JSONL"
+    )
+    summary_parser = results_commands.add_parser(
+        "summary", help="Pass rates and rewards per scenario, type, run or check"
+    )
+    for sub in (query_parser, summary_parser):
+        sub.add_argument("database", type=Path, help="SQLite results database")
+        sub.add_argument("--run", dest="filter_run", default=None, help="Only this run id")
+        sub.add_argument("--agent", dest="filter_agent", default=None, help="Only this agent id")
+        sub.add_argument(
+            "--scenario", dest="filter_scenario", default=None, help="Only this scenario"
+        )
+    query_parser.add_argument(
+        "--check", default=None, help="Only results where this check failed"
+    )
+    query_parser.add_argument(
+        "--failed", action="store_true", help="Only failed or errored results"
+    )
+    query_parser.add_argument("--limit", type=int, default=None)
+    query_parser.add_argument(
+        "--sql", default=None, help="Run this read-only SQL statement instead of the filters"
+    )
+    summary_parser.add_argument(
+        "--by",
+        choices=("scenario", "type", "run", "check"),
+        default="scenario",
+        help="Grouping (default: scenario)",
+    )
+    summary_parser.add_argument(
+        "--json", action="store_true", help="Print JSON rows instead of a table"
+    )
+
+    bench_parser = subparsers.add_parser(
+        "bench", help="Benchmark scenario loads, verification and state fetches"
+    )
+    bench_parser.add_argument(
+        "--workload",
+        default="load,verify,get-state,cycle",
+        help="Comma-separated workloads: load, verify, get-state, cycle (default: all)",
+    )
+    bench_parser.add_argument(
+        "--concurrency",
+        default="1,4,16",
+        help="Comma-separated concurrency levels (default: 1,4,16)",
+    )
+    bench_parser.add_argument(
+        "--requests",
+        type=int,
+        default=None,
+        help="Operations per workload and level (default: one per scenario)",
+    )
+    bench_parser.add_argument(
+        "--duration",
+        type=float,
+        default=None,
+        help="Run each workload and level for this many seconds instead",
+    )
+    bench_parser.add_argument(
+        "--scenario",
+        action="append",
+        default=None,
+        help="Scenario to include (repeatable; default: every scenario)",
+    )
+    bench_parser.add_argument(
+        "--standin",
+        action="store_true",
+        help="Run clone workloads against stand-in clones instead of real instances",
+    )
+    bench_parser.add_argument(
+        "--standin-latency",
+        type=float,
+        default=0.0,
+        help="Seconds the stand-in clones wait before each response (default: 0)",
+    )
+    bench_parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Verify in N warm worker processes (default: threads)",
+    )
+    bench_parser.add_argument(
+        "--output", type=Path, default=None, help="Write the result rows here as JSON"
+    )
+    bench_parser.add_argument(
+        "--save-baseline", type=Path, default=None, help="Save this run as a baseline"
+    )
+    bench_parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=None,
+        help="Compare against a saved baseline; exit 1 on a regression",
+    )
+    bench_parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.1,
+        help="Allowed throughput drop or p95 rise against --baseline (default: 0.1)",
+    )
+    _add_hedge_argument(bench_parser)
+
+    standin_parser = subparsers.add_parser(
+        "standin", help="Serve stand-in Gomail/Gocalendar clones for benchmarks"
+    )
+    standin_parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    standin_parser.add_argument("--port", type=int, default=8790, help="Bind port")
+    standin_parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds to wait before each response"
+    )
+
+    generate_parser = subparsers.add_parser(
+        "generate", help="Write large synthetic scenarios based on shipped ones"
+    )
+    generate_parser.add_argument(
+        "template",
+        nargs="+",
+        help="Scenario id, family name (its first scenario) or 'all'",
+    )
+    generate_parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("generated"),
+        help="Directory for the generated scenario folders (default: generated/)",
+    )
+    generate_parser.add_argument(
+        "--suffix",
+        default="scaled",
+        help="Appended to each template id to name its folder (default: scaled)",
+    )
+    for flag, help_text in (
+        ("--emails", "Total emails"),
+        ("--threads", "Threads the synthetic emails are spread over (default: one each)"),
+        ("--events", "Total events on the user's calendar"),
+        ("--users", "Total other users with calendars"),
+        ("--events-per-user", "Events on each other user's calendar"),
+    ):
+        generate_parser.add_argument(
+            flag, type=int, default=None, help=f"{help_text}; never below the template's"
+        )
+    generate_parser.add_argument(
+        "--span-days",
+        type=int,
+        default=365,
+        help="Days before the template's first record that filler is spread over",
+    )
+    generate_parser.add_argument("--seed", type=int, default=0, help="Random seed")
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="Run a long-lived HTTP verification service"
+    )
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    serve_parser.add_argument("--port", type=int, default=8787, help="Bind port")
+    serve_parser.add_argument(
+        "--unix-socket",
+        type=Path,
+        default=None,
+        help="Listen on a unix socket instead of host/port",
+    )
+    serve_parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Run verifiers in N warm worker processes (default: threads)",
+    )
+    serve_parser.add_argument(
+        "--preload",
+        action="store_true",
+        help="Load every scenario and import every verifier at startup",
+    )
+    _add_sampling_arguments(serve_parser)
+    _add_hedge_argument(serve_parser)
 
     return parser
 
 
+def _parse_shard(spec: str):
+    from .journal import Shard
+
+    return Shard.parse(spec)
+
+
+def _add_checkpoint_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--journal",
+        type=Path,
+        default=None,
+        help="Progress journal: completed items are recorded here and skipped "
+        "when the command is re-run (the output file is appended to)",
+    )
+    parser.add_argument(
+        "--shard",
+        type=_parse_shard,
+        default=None,
+        metavar="I/N",
+        help="Only process items of shard I of N (0-based), split by a stable hash",
+    )
+
+
+def _add_authkey_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--authkey",
+        default=None,
+        help="Shared secret between coordinator and workers (default: $PA_BENCH_AUTHKEY)",
+    )
+
+
+def _authkey(namespace: argparse.Namespace) -> bytes:
+    key = namespace.authkey or os.environ.get("PA_BENCH_AUTHKEY")
+    if not key:
+        raise SystemExit("Distributed verification needs --authkey or PA_BENCH_AUTHKEY")
+    return key.encode("utf-8")
+
+
+def _add_hedge_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--hedge-budget",
+        type=float,
+        default=None,
+        metavar="PERCENT",
+        help="Hedge get_state calls slower than the running p95 with a duplicate "
+        "request, for at most PERCENT of calls (default: off)",
+    )
+
+
+def _hedger(namespace: argparse.Namespace):
+    if namespace.hedge_budget is None:
+        return None
+    from .adaptive import Hedger
+
+    return Hedger(budget=namespace.hedge_budget / 100)
+
+
+def _add_sampling_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--sample-profile",
+        type=Path,
+        default=None,
+        help="Sample verifier stacks and write collapsed stacks here at shutdown "
+        "(and on SIGUSR1)",
+    )
+    parser.add_argument(
+        "--sample-interval",
+        type=float,
+        default=0.01,
+        help="Seconds between stack samples (default: 0.01)",
+    )
+
+
 def _build_cli_args(parsed: argparse.Namespace) -> CLIArgs:
     return CLIArgs(
         data_path=parsed.data_path,
-        scenario_id=parsed.scenario_id,
+        scenario_id=getattr(parsed, "scenario_id", None),
         gomail_url=parsed.gomail_url,
         gocalendar_url=parsed.gocalendar_url,
         env_file=parsed.env_file,
         worlds_base_url=parsed.worlds_base_url,
+        state_file=getattr(parsed, "state_file", None),
+        profile=parsed.profile,
+        profile_dir=parsed.profile_dir,
+        timings=parsed.timings,
+        results=parsed.results,
+        run_id=parsed.run_id,
+        agent_id=parsed.agent_id,
     )
 
 
 async def run_load(args: CLIArgs):
+    _require_networking()
+    timings = args.stage_timings()
     loader = ScenarioLoader(args.data_path)
-    scenario = loader.load(args.scenario_id)
-    endpoints = await resolve_instance_urls(
-        gmail_url=args.gomail_url,
-        calendar_url=args.gocalendar_url,
-        env_path=args.env_file,
-        base_url=args.worlds_base_url,
-    )
+    with timings.stage("scenario"):
+        scenario = loader.load(args.scenario_id)
+    with timings.stage("resolve"):
+        endpoints = await resolve_instance_urls(
+            gmail_url=args.gomail_url,
+            calendar_url=args.gocalendar_url,
+            env_path=args.env_file,
+            base_url=args.worlds_base_url,
+        )
 
     client = WorldsClient()
     print(f"Loading scenario {scenario.metadata.scenario_id}")
@@ -116,39 +715,20 @@ async def run_load(args: CLIArgs):
     today = scenario.metadata.today or "not specified"
     print(f"Today: {today}")
     print("Setting gomail state...")
-    gomail_payload = dict(scenario.gmail_state)
-    gocalendar_payload = dict(scenario.calendar_state)
-    if scenario.metadata.today:
-        gomail_payload["today"] = scenario.metadata.today
-        gocalendar_payload["today"] = scenario.metadata.today
-    await client.set_states(
-        endpoints,
-        gmail_state=gomail_payload,
-        calendar_state=gocalendar_payload,
-    )
+    payloads = scenario.clone_payloads()
+    with timings.stage("set_state"):
+        await client.set_states(
+            endpoints,
+            gmail_state=payloads["gomail"],
+            calendar_state=payloads["gocalendar"],
+        )
     print("✅ Scenario loaded successfully.")
     print(f"Gomail instance: {endpoints.gmail_clone}")
     print(f"Gocalendar instance: {endpoints.calendar_clone}")
 
 
-async def run_verify(args: CLIArgs):
-    loader = ScenarioLoader(args.data_path)
-    scenario = loader.load(args.scenario_id)
-    endpoints = await resolve_instance_urls(
-        gmail_url=args.gomail_url,
-        calendar_url=args.gocalendar_url,
-        env_path=args.env_file,
-        base_url=args.worlds_base_url,
-    )
-    client = WorldsClient()
-
-    print(f"Fetching states for scenario {scenario.metadata.scenario_id}")
-    states = await client.get_states(endpoints)
-
-    runner = VerifierRunner(args.data_path)
-    result = runner.run(scenario, state=states)
-
-    print(f"Verification result for {scenario.metadata.scenario_id}:")
+def _print_verification(scenario_id: str, result, timings: StageTimings) -> None:
+    print(f"Verification result for {scenario_id}:")
     print(f"  Reward: {result.reward}")
     print(f"  Message: {result.message}")
     checks = []
@@ -156,20 +736,646 @@ async def run_verify(args: CLIArgs):
         checks = result.details.get("checks", [])
     for check in checks:
         print(f"    - {check.name}: {'PASS' if check.verdict else 'FAIL'} - {check.reason}")
+    print(f"  Latency: {timings.format()}")
 
     if not result.passed:
         raise SystemExit(1)
 
 
+def run_verify_file(args: CLIArgs):
+    """Verify a saved state file; no network access or aiohttp import."""
+    from .stream import read_state_file
+
+    timings = args.stage_timings()
+    loader = ScenarioLoader(args.data_path)
+    scenario_path = loader.locate(args.scenario_id)
+    runner = VerifierRunner(args.data_path)
+    with timings.stage("import"):
+        runner.load_validation_function(scenario_path / "verifier.py", args.scenario_id)
+    with timings.stage("read"):
+        states = read_state_file(args.state_file)
+    with timings.stage("verify"):
+        result = runner.run(args.scenario_id, state=states)
+    args.record_result(result, states, timings)
+    _print_verification(args.scenario_id, result, timings)
+
+
+async def run_verify(args: CLIArgs):
+    if args.state_file is not None:
+        return run_verify_file(args)
+
+    _require_networking()
+    import asyncio
+
+    timings = args.stage_timings()
+    loader = ScenarioLoader(args.data_path)
+    scenario_path = loader.locate(args.scenario_id)
+    runner = VerifierRunner(args.data_path)
+
+    # Import the verifier in a thread while the clone states are in flight.
+    verifier_import = asyncio.ensure_future(
+        asyncio.to_thread(
+            timings.timed,
+            "import (overlapped)",
+            runner.load_validation_function,
+            scenario_path / "verifier.py",
+            args.scenario_id,
+        )
+    )
+    try:
+        with timings.stage("resolve"):
+            endpoints = await resolve_instance_urls(
+                gmail_url=args.gomail_url,
+                calendar_url=args.gocalendar_url,
+                env_path=args.env_file,
+                base_url=args.worlds_base_url,
+            )
+        client = WorldsClient()
+
+        print(f"Fetching states for scenario {args.scenario_id}")
+        with timings.stage("fetch"):
+            states = await client.get_states(endpoints)
+        with timings.stage("import wait"):
+            await verifier_import
+    finally:
+        # When resolve or fetch fails, the import is cancelled or its error
+        # retrieved here rather than reported as never retrieved.
+        verifier_import.cancel()
+        await asyncio.gather(verifier_import, return_exceptions=True)
+
+    with timings.stage("verify"):
+        result = runner.run(args.scenario_id, state=states)
+
+    args.record_result(result, states, timings)
+    _print_verification(args.scenario_id, result, timings)
+
+
+def _open_output(namespace: argparse.Namespace):
+    """`--output` (appended to when resuming from a journal) or stdout."""
+    if namespace.output is None:
+        return sys.stdout
+    mode = "a" if namespace.journal is not None else "w"
+    return open(namespace.output, mode, encoding="utf-8")
+
+
+def _open_checkpoint(args: CLIArgs, namespace: argparse.Namespace, sink):
+    from .batch import BatchCheckpoint
+    from .journal import ProgressJournal
+
+    journal = None
+    if namespace.journal is not None:
+        journal = ProgressJournal(namespace.journal)
+        # Rows are on disk in the output and the results store before their
+        # keys become durable in the journal.
+        if sink is sys.stdout:
+            journal.before_sync(sink.flush)
+        else:
+            journal.track_output(sink)
+        store = args.results_store()
+        if store is not None:
+            journal.before_sync(store.sync)
+    return BatchCheckpoint(journal, namespace.shard)
+
+
+def _print_skipped(checkpoint) -> None:
+    if checkpoint.skipped_done or checkpoint.skipped_shard:
+        print(
+            f"Skipped {checkpoint.skipped_done} completed and "
+            f"{checkpoint.skipped_shard} other-shard items",
+            file=sys.stderr,
+        )
+
+
+def run_verify_stream(args: CLIArgs, namespace: argparse.Namespace):
+    from .pool import VerifierPool
+    from .stream import iter_state_records, verify_stream
+
+    workers = namespace.workers
+    if workers is None:
+        workers = os.cpu_count() or 1
+    max_in_flight = namespace.max_in_flight or 4 * max(workers, 1)
+
+    source = sys.stdin if namespace.input == "-" else open(namespace.input, encoding="utf-8")
+    sink = _open_output(namespace)
+    checkpoint = _open_checkpoint(args, namespace, sink)
+    pool = VerifierPool(args.data_path, workers=workers, fork_server=True) if workers else None
+
+    timings = args.stage_timings()
+    started = time.perf_counter()
+    count = errors = 0
+    reward_total = 0.0
+    try:
+        if pool is not None:
+            with timings.stage("pool start"):
+                pool.start()
+        records = checkpoint.select(iter_state_records(source, args.scenario_id))
+        records = args.recorded_records(records)
+        with timings.stage("verify"):
+            for row in verify_stream(records, args.data_path, pool, max_in_flight):
+                sink.write(json.dumps(row) + "\n")
+                args.record_row(row)
+                checkpoint.completed(row)
+                count += 1
+                if "error" in row:
+                    errors += 1
+                else:
+                    reward_total += row["reward"]
+    finally:
+        if pool is not None:
+            with timings.stage("pool close"):
+                pool.close()
+        checkpoint.close()
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    elapsed = time.perf_counter() - started
+    scored = count - errors
+    mean_reward = reward_total / scored if scored else 0.0
+    print(
+        f"Verified {count} states ({errors} errors) in {elapsed:.2f}s, "
+        f"{count / elapsed if elapsed else 0.0:.1f} states/s, mean reward {mean_reward:.3f}",
+        file=sys.stderr,
+    )
+    _print_skipped(checkpoint)
+    if errors:
+        raise SystemExit(1)
+
+
+def run_verify_all(args: CLIArgs, namespace: argparse.Namespace):
+    import signal
+
+    from .batch import BatchSummary, baseline_records, select_records
+    from .pool import VerifierPool
+    from .stream import iter_state_records, verify_stream
+
+    workers = namespace.workers
+    if workers is None:
+        workers = os.cpu_count() or 1
+    # Rows are written in input order, so one expensive state at the head of
+    # a narrow window stalls every worker behind it; a wide window keeps them
+    # busy.
+    max_in_flight = namespace.max_in_flight or 64 * max(workers, 1)
+    sample_interval = namespace.sample_interval if namespace.sample_profile else None
+    cost_model = None
+    if namespace.schedule == "longest":
+        from .scheduling import CostModel
+
+        cost_model = CostModel.load(namespace.costs) if namespace.costs else CostModel()
+    coordinator = None
+    if namespace.coordinate is not None:
+        from .distributed import Coordinator, parse_address
+
+        coordinator = Coordinator(
+            parse_address(namespace.coordinate),
+            _authkey(namespace),
+            cost_model=cost_model,
+        )
+        workers = 0
+        # Remote workers lease from this window, so keep it wide.
+        max_in_flight = namespace.max_in_flight or 1024
+        sample_interval = None
+
+    source = None
+    if namespace.states is not None:
+        source = sys.stdin if namespace.states == "-" else open(namespace.states, encoding="utf-8")
+        records = select_records(iter_state_records(source), namespace.scenario_ids)
+    else:
+        records = baseline_records(args.data_path, namespace.scenario_ids, namespace.repeat)
+    sink = _open_output(namespace)
+    checkpoint = _open_checkpoint(args, namespace, sink)
+    pool = coordinator
+    sampler = profile = None
+    if workers:
+        pool = VerifierPool(
+            args.data_path,
+            workers=workers,
+            fork_server=True,
+            sample_interval=sample_interval,
+            cost_model=cost_model,
+        )
+        profile = pool.samples
+    elif sample_interval is not None:
+        from .sampling import SampleProfile, StackSampler
+
+        sampler = StackSampler(sample_interval, mode="signal")
+        profile = SampleProfile(sample_interval)
+
+    def write_profile(*_):
+        if sampler is not None:
+            profile.collect(sampler)
+        profile.write(namespace.sample_profile)
+
+    if profile is not None:
+        signal.signal(signal.SIGUSR1, write_profile)
+
+    timings = args.stage_timings()
+    summary = BatchSummary()
+    started = time.perf_counter()
+    try:
+        if pool is not None:
+            with timings.stage("pool start"):
+                pool.start()
+        if coordinator is not None:
+            host, port = coordinator.address
+            print(f"Coordinating on {host}:{port}", file=sys.stderr, flush=True)
+        if sampler is not None:
+            sampler.start()
+        with timings.stage("verify"):
+            records = args.recorded_records(checkpoint.select(records))
+            for row in verify_stream(records, args.data_path, pool, max_in_flight, sampler):
+                sink.write(json.dumps(row) + "\n")
+                args.record_row(row)
+                checkpoint.completed(row)
+                summary.add(row)
+    finally:
+        if sampler is not None:
+            sampler.stop()
+        if pool is not None:
+            with timings.stage("pool close"):
+                pool.close()
+        if profile is not None:
+            write_profile()
+        if namespace.costs is not None and cost_model is not None:
+            cost_model.save(namespace.costs)
+        checkpoint.close()
+        if source is not None and source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    elapsed = time.perf_counter() - started
+    print(summary.format(), file=sys.stderr)
+    print(
+        f"Verified {summary.count} states ({summary.errors} errors) in {elapsed:.2f}s, "
+        f"{summary.count / elapsed if elapsed else 0.0:.1f} states/s",
+        file=sys.stderr,
+    )
+    _print_skipped(checkpoint)
+    if coordinator is not None:
+        stats = coordinator.stats
+        print(
+            f"{len(stats.workers)} workers, {stats.leased} leases, "
+            f"{stats.released} released by lost workers, {stats.expired} expired, "
+            f"{stats.stolen} stolen",
+            file=sys.stderr,
+        )
+    if profile is not None:
+        print(f"Stack samples written to {namespace.sample_profile}", file=sys.stderr)
+    if summary.errors:
+        raise SystemExit(1)
+
+
+async def run_load_all(args: CLIArgs, namespace: argparse.Namespace):
+    import asyncio
+
+    from .adaptive import AdaptiveLimiter, RetryPolicy
+    from .batch import load_batch, read_load_plan
+
+    _require_networking()
+    source = sys.stdin if namespace.plan == "-" else open(namespace.plan, encoding="utf-8")
+    sink = _open_output(namespace)
+    checkpoint = _open_checkpoint(args, namespace, sink)
+    loader = ScenarioLoader(args.data_path)
+    resolved: "Optional[asyncio.Future]" = None
+
+    def default_endpoints():
+        nonlocal resolved
+        if resolved is None:
+            resolved = asyncio.ensure_future(
+                resolve_instance_urls(
+                    gmail_url=args.gomail_url,
+                    calendar_url=args.gocalendar_url,
+                    env_path=args.env_file,
+                    base_url=args.worlds_base_url,
+                )
+            )
+        return resolved
+
+    timings = args.stage_timings()
+    started = time.perf_counter()
+    count = errors = 0
+    concurrency = namespace.concurrency or (8 if namespace.no_adaptive else 32)
+    limiter = None if namespace.no_adaptive else AdaptiveLimiter(maximum=concurrency)
+    retry = RetryPolicy(retries=namespace.retries) if namespace.retries > 0 else None
+    try:
+        async with WorldsClient(limiter=limiter, retry=retry) as client:
+            with timings.stage("load"):
+                rows = load_batch(
+                    read_load_plan(source),
+                    loader,
+                    client,
+                    default_endpoints,
+                    concurrency,
+                    checkpoint,
+                )
+                async for row in rows:
+                    sink.write(json.dumps(row) + "\n")
+                    count += 1
+                    errors += "error" in row
+    finally:
+        checkpoint.close()
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"Loaded {count - errors} of {count} instances ({errors} errors) in {elapsed:.2f}s",
+        file=sys.stderr,
+    )
+    _print_skipped(checkpoint)
+    if errors:
+        raise SystemExit(1)
+
+
+def run_results(args: CLIArgs, namespace: argparse.Namespace):
+    from .results import ResultsStore
+
+    if not namespace.database.exists():
+        raise SystemExit(f"No results database at {namespace.database}")
+    with ResultsStore(namespace.database) as store:
+        filters = {
+            "run_id": namespace.filter_run,
+            "agent_id": namespace.filter_agent,
+            "scenario_id": namespace.filter_scenario,
+        }
+        if namespace.results_command == "query":
+            if namespace.sql is not None:
+                rows = store.execute(namespace.sql)
+            else:
+                rows = store.query(
+                    check=namespace.check,
+                    failed=namespace.failed,
+                    limit=namespace.limit,
+                    **filters,
+                )
+            for row in rows:
+                print(json.dumps(row))
+            return
+
+        rows = store.summary(by=namespace.by, **filters)
+        if namespace.json:
+            for row in rows:
+                print(json.dumps(row))
+            return
+        print(_format_table(rows))
+
+
+def _format_table(rows) -> str:
+    if not rows:
+        return "(no results)"
+    headers = list(rows[0])
+    cells = [headers]
+    for row in rows:
+        cells.append(
+            [f"{value:.3f}" if isinstance(value, float) else str(value) for value in row.values()]
+        )
+    widths = [max(len(line[i]) for line in cells) for i in range(len(headers))]
+    return "\n".join(
+        "  ".join(cell.ljust(width) for cell, width in zip(line, widths)).rstrip()
+        for line in cells
+    )
+
+
+def run_serve(args: CLIArgs, namespace: argparse.Namespace):
+    from .server import ServeOptions, VerificationService, serve
+
+    service = VerificationService(
+        args.data_path,
+        workers=namespace.workers,
+        gomail_url=args.gomail_url,
+        gocalendar_url=args.gocalendar_url,
+        env_file=args.env_file,
+        worlds_base_url=args.worlds_base_url,
+        sample_interval=namespace.sample_interval if namespace.sample_profile else None,
+        hedge=_hedger(namespace),
+    )
+    options = ServeOptions(
+        host=namespace.host,
+        port=namespace.port,
+        unix_socket=namespace.unix_socket,
+        preload=namespace.preload,
+        sample_profile=namespace.sample_profile,
+    )
+    serve(service, options)
+
+
+def _split_list(value: str):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+async def run_bench(args: CLIArgs, namespace: argparse.Namespace):
+    from .bench import (
+        CLONE_WORKLOADS,
+        WORKLOADS,
+        Benchmark,
+        compare,
+        load_baseline,
+        save_baseline,
+    )
+
+    _require_networking()
+    workloads = _split_list(namespace.workload)
+    unknown = sorted(set(workloads) - set(WORKLOADS))
+    if unknown:
+        raise SystemExit(f"Unknown workload(s): {', '.join(unknown)}")
+    levels = [int(level) for level in _split_list(namespace.concurrency)]
+
+    standin = verifier = None
+    # Only the stand-in clones are known to honour `get_state?fields=`.
+    fields_param = None
+    pairs = []
+    try:
+        if any(workload in CLONE_WORKLOADS for workload in workloads):
+            if namespace.standin:
+                from .standin import FIELDS_PARAM, StandinServer
+
+                standin = StandinServer(latency=namespace.standin_latency).start()
+                pairs = standin.pairs(max(levels))
+                fields_param = FIELDS_PARAM
+            else:
+                pairs = [
+                    await resolve_instance_urls(
+                        gmail_url=args.gomail_url,
+                        calendar_url=args.gocalendar_url,
+                        env_path=args.env_file,
+                        base_url=args.worlds_base_url,
+                    )
+                ]
+        if namespace.workers > 0:
+            from .pool import VerifierPool
+
+            verifier = VerifierPool(
+                args.data_path, workers=namespace.workers, fork_server=True
+            ).start()
+
+        rows = []
+        async with WorldsClient(
+            hedge=_hedger(namespace), fields_param=fields_param
+        ) as client:
+            bench = Benchmark(args.data_path, namespace.scenario, pairs, client, verifier)
+            for workload in workloads:
+                for level in levels:
+                    result = await bench.run(
+                        workload, level, namespace.requests, namespace.duration
+                    )
+                    row = result.summary()
+                    rows.append(row)
+                    if result.errors:
+                        print(
+                            f"{workload} x{level}: {result.errors} errors, "
+                            f"first: {result.first_error}",
+                            file=sys.stderr,
+                        )
+    finally:
+        if verifier is not None:
+            verifier.close()
+        if standin is not None:
+            standin.close()
+
+    print(_format_table([{k: v for k, v in row.items() if k != "first_error"} for row in rows]))
+    if namespace.output is not None:
+        namespace.output.write_text(json.dumps(rows, indent=2) + "\n")
+    if namespace.save_baseline is not None:
+        save_baseline(namespace.save_baseline, rows)
+    if namespace.baseline is not None:
+        changes = compare(rows, load_baseline(namespace.baseline), namespace.max_regression)
+        print()
+        print(_format_table(changes))
+        regressed = [change for change in changes if change["regressed"]]
+        if regressed:
+            print(
+                f"{len(regressed)} regression(s) beyond {namespace.max_regression:.0%}",
+                file=sys.stderr,
+            )
+            raise SystemExit(1)
+
+
+def run_generate(args: CLIArgs, namespace: argparse.Namespace):
+    from .generate import ScaleOptions, generate_scenario, resolve_templates
+
+    try:
+        templates = resolve_templates(args.data_path, namespace.template)
+    except ValueError as exc:
+        raise SystemExit(str(exc))
+    options = ScaleOptions(
+        emails=namespace.emails,
+        threads=namespace.threads,
+        events=namespace.events,
+        users=namespace.users,
+        events_per_user=namespace.events_per_user,
+        span_days=namespace.span_days,
+        seed=namespace.seed,
+    )
+    timings = args.stage_timings()
+    for template in templates:
+        started = time.perf_counter()
+        with timings.stage("generate"):
+            target = generate_scenario(
+                args.data_path,
+                template,
+                namespace.output,
+                options,
+                name=f"{template}_{namespace.suffix}",
+            )
+        size = (target / "data.json").stat().st_size
+        print(
+            f"{target} ({size / 2 ** 20:.1f} MB) in {time.perf_counter() - started:.2f}s",
+            file=sys.stderr,
+        )
+
+
+def run_standin(namespace: argparse.Namespace):
+    from aiohttp import web
+
+    from .standin import standin_app
+
+    web.run_app(
+        standin_app(namespace.latency),
+        host=namespace.host,
+        port=namespace.port,
+        access_log=None,
+    )
+
+
 def main():
     parser = _create_parser()
     namespace = parser.parse_args()
     args = _build_cli_args(namespace)
+    if namespace.trace is not None:
+        tracing.configure(tracing.exporter_for(namespace.trace))
+    dumper = None
+    if namespace.metrics is not None:
+        from .metrics import MetricsDumper
+
+        dumper = MetricsDumper(namespace.metrics, namespace.metrics_interval).start()
+    try:
+        with tracing.span(f"cli.{namespace.command}", data_path=str(args.data_path)):
+            _run_command(args, namespace)
+    finally:
+        tracing.shutdown()
+        if dumper is not None:
+            dumper.stop()
+        args.close_results()
+        if args.report_timings:
+            print(args.stage_timings().summary(), file=sys.stderr)
+
+
+def run_worker(args: CLIArgs, namespace: argparse.Namespace) -> None:
+    from .distributed import parse_address, run_worker as serve_tasks
+
+    workers = namespace.workers
+    if workers is None:
+        workers = os.cpu_count() or 1
+    completed = serve_tasks(
+        parse_address(namespace.connect),
+        _authkey(namespace),
+        args.data_path,
+        workers=workers,
+        capacity=namespace.capacity,
+    )
+    print(f"Verified {completed} records", file=sys.stderr)
+
+
+def _run_command(args: CLIArgs, namespace: argparse.Namespace) -> None:
+    if namespace.command == "serve":
+        run_serve(args, namespace)
+        return
+    if namespace.command == "verify-stream":
+        run_verify_stream(args, namespace)
+        return
+    if namespace.command == "verify-all":
+        run_verify_all(args, namespace)
+        return
+    if namespace.command == "results":
+        run_results(args, namespace)
+        return
+    if namespace.command == "worker":
+        run_worker(args, namespace)
+        return
+    if namespace.command == "standin":
+        run_standin(namespace)
+        return
+    if namespace.command == "generate":
+        run_generate(args, namespace)
+        return
+    if namespace.command == "verify" and args.state_file is not None:
+        run_verify_file(args)
+        return
+
+    import asyncio
 
     if namespace.command == "load-scenario":
         asyncio.run(run_load(args))
+    elif namespace.command == "load-all":
+        asyncio.run(run_load_all(args, namespace))
     elif namespace.command == "verify":
         asyncio.run(run_verify(args))
+    elif namespace.command == "bench":
+        asyncio.run(run_bench(args, namespace))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,518 @@
+"""
+Coordinator/worker mode for batch verification across hosts.
+
+The `Coordinator` listens on a TCP address (`multiprocessing.connection`,
+authenticated with a shared `authkey`) and behaves like a `VerifierPool`:
+`submit(scenario_id, state)` returns a future, so `verify_stream` and
+`verify-all` drive it unchanged. Workers (`run_worker`, `pa-bench worker`)
+connect from any host, keep their own warm `VerifierPool` (or an in-process
+runner), lease batches of tasks, verify them and send results back.
+
+A task's state is a reference the worker resolves locally: `None` for the
+scenario's stored state, a `StateFile` path on storage shared with the
+workers, or an inline state dict.
+
+Leases:
+
+- a worker that disconnects (process exit, dropped connection) has all its
+  leased tasks put back at the front of the queue at once;
+- a lease that is not completed within `lease_timeout` (hung or partitioned
+  host) is re-leased to the next worker that asks;
+- a late result for a task that was re-leased and already finished is
+  dropped, so each future resolves exactly once;
+- a task re-leased `max_attempts` times fails with `VerifierCrashed`
+  instead of taking down every worker in turn.
+
+With a `CostModel`, queued tasks are leased longest-estimated-first and the
+model learns from the `exec_seconds` workers report; without one they are
+leased in submission order. A worker that asks for work
+when the queue is empty steals the most recently leased half of the
+backlog of the worker with the largest estimated remaining cost; the victim
+is told to cancel those tasks on its next reply, and whichever result
+arrives first wins.
+
+Each message on a connection is answered by exactly one reply, so the
+protocol is a simple request/response loop per worker.
+"""
+
+from __future__ import annotations
+
+import heapq
+import os
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, field
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
+
+from .pool import VerifierCrashed, VerifierFailed, VerifierPool, preload_states
+from .scheduling import CostModel
+from .verifier import VerificationResult, VerifierRunner
+
+DEFAULT_LEASE_TIMEOUT = 300.0
+LEASE_POLL_SECONDS = 1.0
+
+
+@dataclass(frozen=True)
+class StateFile:
+    """A saved state at a path readable by the workers (shared storage)."""
+
+    path: str
+
+
+StateRef = Union[None, StateFile, Dict[str, Any]]
+
+
+def parse_address(spec: str) -> Tuple[str, int]:
+    host, _, port = spec.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"Address must look like HOST:PORT, got {spec!r}")
+    return host, int(port)
+
+
+@dataclass
+class _Task:
+    task_id: int
+    scenario_id: str
+    state: StateRef
+    future: Future
+    attempts: int = 0
+
+
+@dataclass
+class CoordinatorStats:
+    submitted: int = 0
+    completed: int = 0
+    leased: int = 0
+    released: int = 0
+    expired: int = 0
+    stolen: int = 0
+    duplicates: int = 0
+    workers: Dict[str, int] = field(default_factory=dict)
+
+
+class Coordinator:
+    """Hands out verification tasks to remote workers and collects results."""
+
+    def __init__(
+        self,
+        address: Tuple[str, int] = ("127.0.0.1", 0),
+        authkey: bytes = b"",
+        lease_timeout: float = DEFAULT_LEASE_TIMEOUT,
+        max_attempts: int = 3,
+        cost_model: Optional[CostModel] = None,
+        steal: bool = True,
+    ):
+        if not authkey:
+            raise ValueError("Coordinator needs a non-empty authkey")
+        self.requested_address = address
+        self.authkey = authkey
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        self.cost_model = cost_model
+        self.steal = steal
+        self.stats = CoordinatorStats()
+        self.address: Optional[Tuple[str, int]] = None
+        self._tasks: Dict[int, _Task] = {}
+        # (-estimated cost, task id): longest first, then submission order.
+        self._pending: List[Tuple[float, int]] = []
+        self._queued_cost = 0.0
+        # Verifier processes per connected worker, for fair-share leases.
+        self._slots: Dict[str, int] = {}
+        self._leases: Dict[int, Tuple[str, float]] = {}
+        # Task ids leased to each worker, oldest first.
+        self._held: Dict[str, Dict[int, None]] = {}
+        self._cancels: Dict[str, List[int]] = {}
+        self._next_id = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._listener: Optional[Listener] = None
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> "Coordinator":
+        if self._listener is not None:
+            return self
+        # Listener's default backlog of 1 drops simultaneous connects, and
+        # those workers only retry after the kernel's one-second SYN timeout.
+        self._listener = Listener(self.requested_address, backlog=128, authkey=self.authkey)
+        self.address = self._listener.address
+        thread = threading.Thread(target=self._accept, name="coordinator-accept", daemon=True)
+        thread.start()
+        return self
+
+    def submit(self, scenario_id: str, state: StateRef = None) -> "Future[VerificationResult]":
+        if self._closed:
+            raise RuntimeError("Coordinator is closed")
+        if self._listener is None:
+            self.start()
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+        with self._available:
+            task = _Task(self._next_id, scenario_id, state, future)
+            self._next_id += 1
+            self._tasks[task.task_id] = task
+            self._push(task)
+            self.stats.submitted += 1
+            self._available.notify()
+        return future
+
+    def _cost(self, scenario_id: str) -> float:
+        # Without a model every task costs the same: FIFO, steal by count.
+        return self.cost_model.estimate(scenario_id) if self.cost_model is not None else 1.0
+
+    def _push(self, task: _Task) -> None:
+        cost = self._cost(task.scenario_id)
+        heapq.heappush(self._pending, (-cost, task.task_id))
+        self._queued_cost += cost
+
+    @property
+    def outstanding(self) -> int:
+        with self._lock:
+            return len(self._tasks)
+
+    def _accept(self) -> None:
+        while not self._closed:
+            try:
+                conn = self._listener.accept()
+            except (AuthenticationError, OSError, EOFError):
+                if self._closed:
+                    return
+                continue  # failed authentication or a half-open connection
+            thread = threading.Thread(target=self._handle, args=(conn,), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _handle(self, conn: Connection) -> None:
+        worker = None
+        try:
+            _, worker, slots = conn.recv()
+            with self._lock:
+                self.stats.workers.setdefault(worker, 0)
+                self._held.setdefault(worker, {})
+                self._slots[worker] = max(slots, 1)
+            while True:
+                message = conn.recv()
+                if message[0] == "lease":
+                    batch = self._lease(worker, message[1], message[2])
+                    if batch is None:
+                        conn.send(("stop",))
+                    else:
+                        conn.send(("tasks", batch, self._take_cancels(worker)))
+                elif message[0] == "results":
+                    self._complete(worker, message[1])
+                    conn.send(("ok", self._take_cancels(worker)))
+        except (EOFError, OSError):
+            pass
+        finally:
+            conn.close()
+            if worker is not None:
+                self._release(worker)
+
+    def _lease(
+        self, worker: str, count: int, block: bool = True
+    ) -> Optional[List[Tuple[int, str, StateRef]]]:
+        """Up to `count` tasks; an idle worker (`block`) waits briefly for some.
+
+        A worker is topped up to at most its share (by verifier slots) of the
+        estimated cost of all queued and leased work, so the expensive tasks
+        at the head of the queue are spread across workers instead of
+        piling up behind one worker's prefetched backlog.
+        """
+        deadline = time.monotonic() + (LEASE_POLL_SECONDS if block else 0.0)
+        with self._available:
+            while True:
+                self._expire()
+                held = {
+                    owner: sum(self._cost(self._tasks[task_id].scenario_id) for task_id in tasks)
+                    for owner, tasks in self._held.items()
+                }
+                total = self._queued_cost + sum(held.values())
+                share = total * self._slots[worker] / sum(self._slots.values()) - held[worker]
+                batch = []
+                batch_cost = 0.0
+                while self._pending and len(batch) < count:
+                    cost = -self._pending[0][0]
+                    if (batch or not block) and batch_cost + cost > share:
+                        break
+                    task = self._tasks.get(heapq.heappop(self._pending)[1])
+                    self._queued_cost = self._queued_cost - cost if self._pending else 0.0
+                    if task is None or task.task_id in self._leases:
+                        continue  # finished by a late result, or leased again
+                    task.attempts += 1
+                    self._assign(task, worker)
+                    batch.append((task.task_id, task.scenario_id, task.state))
+                    batch_cost += cost
+                if not batch and block and self.steal:
+                    batch = self._steal(worker, count)
+                if batch:
+                    self.stats.leased += len(batch)
+                    return batch
+                if self._closed and not self._tasks:
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return []
+                self._available.wait(remaining)
+
+    def _assign(self, task: _Task, worker: str) -> None:
+        self._leases[task.task_id] = (worker, time.monotonic() + self.lease_timeout)
+        self._held.setdefault(worker, {})[task.task_id] = None
+        cancels = self._cancels.get(worker)
+        if cancels and task.task_id in cancels:
+            # Stolen back before the cancel was delivered: keep running it.
+            cancels.remove(task.task_id)
+
+    def _unassign(self, task_id: int) -> Optional[str]:
+        lease = self._leases.pop(task_id, None)
+        if lease is None:
+            return None
+        self._held.get(lease[0], {}).pop(task_id, None)
+        return lease[0]
+
+    def _steal(self, thief: str, count: int) -> List[Tuple[int, str, StateRef]]:
+        """Move the newest half of the largest backlog to an idle worker."""
+        victim, backlog = None, 0.0
+        for worker, held in self._held.items():
+            if worker == thief or len(held) < 2:
+                continue
+            cost = sum(self._cost(self._tasks[task_id].scenario_id) for task_id in held)
+            if victim is None or cost > backlog:
+                victim, backlog = worker, cost
+        if victim is None:
+            return []
+        held = self._held[victim]
+        stolen = list(held)[-min(count, len(held) // 2):]
+        batch = []
+        for task_id in stolen:
+            self._unassign(task_id)
+            task = self._tasks[task_id]
+            self._assign(task, thief)
+            batch.append((task_id, task.scenario_id, task.state))
+        self._cancels.setdefault(victim, []).extend(stolen)
+        self.stats.stolen += len(batch)
+        return batch
+
+    def _take_cancels(self, worker: str) -> List[int]:
+        with self._lock:
+            return self._cancels.pop(worker, [])
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        expired = [task_id for task_id, (_, deadline) in self._leases.items() if deadline < now]
+        for task_id in expired:
+            self._unassign(task_id)
+            self.stats.expired += 1
+            self._requeue(task_id)
+
+    def _requeue(self, task_id: int) -> None:
+        task = self._tasks.get(task_id)
+        if task is None:
+            return
+        if task.attempts >= self.max_attempts:
+            del self._tasks[task_id]
+            task.future.set_exception(
+                VerifierCrashed(
+                    f"{task.scenario_id}: lost {task.attempts} workers while verifying this state"
+                )
+            )
+            return
+        self._push(task)
+        self._available.notify()
+
+    def _release(self, worker: str) -> None:
+        with self._available:
+            self._slots.pop(worker, None)
+            lost = list(self._held.pop(worker, {}))
+            for task_id in lost:
+                self._unassign(task_id)
+                self._requeue(task_id)
+            self._cancels.pop(worker, None)
+            self.stats.released += len(lost)
+
+    def _complete(self, worker: str, results: List[Tuple[int, str, Any]]) -> None:
+        with self._available:
+            finished = []
+            for task_id, status, payload in results:
+                task = self._tasks.pop(task_id, None)
+                self._unassign(task_id)
+                if task is None:
+                    self.stats.duplicates += 1
+                    continue
+                self.stats.completed += 1
+                self.stats.workers[worker] = self.stats.workers.get(worker, 0) + 1
+                finished.append((task, status, payload))
+            if self._closed and not self._tasks:
+                self._available.notify_all()
+        for task, status, payload in finished:
+            if status == "ok":
+                if self.cost_model is not None:
+                    self.cost_model.observe_result(task.scenario_id, payload)
+                task.future.set_result(payload)
+            else:
+                task.future.set_exception(VerifierFailed(f"{task.scenario_id}: {payload}"))
+
+    def close(self) -> None:
+        """Stop accepting work; workers are told to stop once the queue drains."""
+        if self._closed:
+            return
+        with self._available:
+            self._closed = True
+            self._available.notify_all()
+        for thread in list(self._threads):
+            thread.join(timeout=LEASE_POLL_SECONDS * 2)
+        if self._listener is not None:
+            self._listener.close()
+        with self._lock:
+            abandoned = list(self._tasks.values())
+            self._tasks.clear()
+        for task in abandoned:
+            task.future.set_exception(VerifierCrashed(f"{task.scenario_id}: coordinator closed"))
+
+    def __enter__(self) -> "Coordinator":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class _LocalExecutor:
+    """Runs leased tasks on the worker host: a warm pool or in-process.
+
+    In-process tasks wait in `backlog` until `step` runs them one at a
+    time, so tasks stolen by another worker can still be cancelled.
+    """
+
+    def __init__(self, data_path: Union[str, Path], workers: int):
+        self.data_path = data_path
+        self.pool = VerifierPool(data_path, workers=workers, fork_server=True) if workers else None
+        self.runner = VerifierRunner(data_path)
+        self.baselines: Dict[str, Dict[str, Any]] = {}
+        self.backlog: Deque[Tuple[Future, str, StateRef]] = deque()
+
+    def start(self) -> None:
+        if self.pool is not None:
+            self.pool.start()
+
+    def resolve(self, scenario_id: str, state: StateRef) -> Any:
+        if isinstance(state, StateFile):
+            from .stream import read_state_file
+
+            return read_state_file(state.path)
+        if state is None and self.pool is None:
+            if scenario_id not in self.baselines:
+                self.baselines.update(preload_states(self.data_path, [scenario_id]))
+            return self.baselines[scenario_id]
+        return state
+
+    def submit(self, scenario_id: str, state: StateRef) -> Future:
+        if self.pool is None:
+            future: Future = Future()
+            self.backlog.append((future, scenario_id, state))
+            return future
+        try:
+            resolved = self.resolve(scenario_id, state)
+        except Exception as exc:
+            future = Future()
+            future.set_exception(exc)
+            return future
+        return self.pool.submit(scenario_id, resolved)
+
+    def step(self) -> None:
+        """Run the next in-process task that has not been cancelled."""
+        while self.backlog:
+            future, scenario_id, state = self.backlog.popleft()
+            if not future.set_running_or_notify_cancel():
+                continue
+            started = time.perf_counter()
+            try:
+                result = self.runner.run(scenario_id, state=self.resolve(scenario_id, state))
+            except Exception as exc:
+                future.set_exception(exc)
+            else:
+                result.details = dict(result.details or {})
+                result.details["exec_seconds"] = time.perf_counter() - started
+                future.set_result(result)
+            return
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.close()
+
+
+def run_worker(
+    address: Tuple[str, int],
+    authkey: bytes,
+    data_path: Union[str, Path] = "data",
+    workers: int = 0,
+    capacity: Optional[int] = None,
+    name: Optional[str] = None,
+) -> int:
+    """Pull, verify and report tasks until the coordinator says stop.
+
+    Keeps up to `capacity` tasks (default: twice the local workers) leased
+    at once. Returns the number of tasks this worker completed.
+    """
+    capacity = capacity or 2 * max(workers, 1)
+    name = name or f"{socket.gethostname()}:{os.getpid()}"
+    executor = _LocalExecutor(data_path, workers)
+    executor.start()
+    conn = Client(address, authkey=authkey)
+    in_flight: Dict[Future, int] = {}
+    by_task: Dict[int, Future] = {}
+    completed = 0
+    stopping = False
+
+    def cancel(task_ids: List[int]) -> None:
+        # Tasks stolen by another worker; ones already running still report.
+        for task_id in task_ids:
+            future = by_task.get(task_id)
+            if future is not None and future.cancel():
+                del in_flight[future]
+                del by_task[task_id]
+
+    try:
+        conn.send(("hello", name, max(workers, 1)))
+        while not (stopping and not in_flight):
+            if not stopping and len(in_flight) < capacity:
+                conn.send(("lease", capacity - len(in_flight), not in_flight))
+                reply = conn.recv()
+                if reply[0] == "stop":
+                    stopping = True
+                else:
+                    for task_id, scenario_id, state in reply[1]:
+                        if task_id in by_task:
+                            continue  # stolen back while our copy is running
+                        future = executor.submit(scenario_id, state)
+                        in_flight[future] = task_id
+                        by_task[task_id] = future
+                    cancel(reply[2])
+            if not in_flight:
+                continue
+            executor.step()
+            done, _ = wait(list(in_flight), timeout=0.05, return_when=FIRST_COMPLETED)
+            if not done:
+                continue
+            results = []
+            for future in done:
+                task_id = in_flight.pop(future)
+                del by_task[task_id]
+                exc = future.exception()
+                if exc is None:
+                    results.append((task_id, "ok", future.result()))
+                else:
+                    results.append((task_id, "error", f"{type(exc).__name__}: {exc}"))
+            conn.send(("results", results))
+            cancel(conn.recv()[1])
+            completed += len(results)
+    except (EOFError, OSError):
+        pass  # coordinator went away; its leases are re-issued elsewhere
+    finally:
+        conn.close()
+        executor.close()
+    return completed
@@ -0,0 +1,183 @@
+"""
+Fork server for `VerifierPool` workers.
+
+The server is one clean, single-threaded process that imports every verifier
+module and loads the selected scenarios, collects and freezes the GC
+(`gc.freeze`) so the preloaded objects are never touched by later
+collections, and then forks a worker per request. Workers inherit the
+preloaded image copy-on-write and skip the imports and JSON parsing that
+dominate the startup of a spawned worker.
+
+The pool talks to the server over a pipe: each fork request is answered
+with the worker's pid followed by the worker's end of a fresh pipe, passed
+as a file descriptor (`multiprocessing.reduction.send_handle`).
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+import signal
+import threading
+import time
+from multiprocessing import Pipe
+from multiprocessing.connection import Connection
+from multiprocessing.reduction import recv_handle, send_handle
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+from .pool import (
+    PoolLimits,
+    VerifierPoolError,
+    _serve,
+    preload_states,
+    preload_verifiers,
+)
+from .verifier import VerifierRunner
+
+
+class ForkedProcess:
+    """Process-like handle for a worker forked by the server.
+
+    The server ignores SIGCHLD so exited workers are reaped by the kernel;
+    the pool can only observe liveness, not the exit code.
+    """
+
+    exitcode = None
+
+    def __init__(self, pid: int):
+        self.pid = pid
+
+    def is_alive(self) -> bool:
+        try:
+            os.kill(self.pid, 0)
+        except ProcessLookupError:
+            return False
+        return True
+
+    def kill(self) -> None:
+        try:
+            os.kill(self.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.is_alive():
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+            time.sleep(0.005)
+
+
+def _fork_server_main(
+    conn, base_path: str, scenario_ids, limits: PoolLimits, sample_interval=None
+):
+    started = time.perf_counter()
+    runner = VerifierRunner(base_path)
+    functions = preload_verifiers(base_path, scenario_ids)
+    baselines = preload_states(base_path, scenario_ids)
+    gc.collect()
+    gc.freeze()
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    conn.send(("ready", time.perf_counter() - started))
+
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+
+        parent_end, child_end = Pipe()
+        pid = os.fork()
+        if pid == 0:
+            status = 0
+            try:
+                conn.close()
+                parent_end.close()
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                _serve(child_end, runner, functions, limits, baselines, sample_interval)
+            except BaseException:
+                status = 1
+            finally:
+                os._exit(status)
+
+        child_end.close()
+        conn.send(pid)
+        send_handle(conn, parent_end.fileno(), request)
+        parent_end.close()
+
+
+class ForkServer:
+    """Parent-side handle for the fork server process."""
+
+    def __init__(
+        self,
+        base_path: Path,
+        scenario_ids: Optional[Sequence[str]],
+        limits: PoolLimits,
+        context,
+        sample_interval: Optional[float] = None,
+    ):
+        self.base_path = base_path
+        self.scenario_ids = scenario_ids
+        self.limits = limits
+        self.sample_interval = sample_interval
+        self.preload_seconds: Optional[float] = None
+        self._context = context
+        self._process = None
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def start(self, timeout: float) -> None:
+        if self._process is not None:
+            return
+        parent_conn, child_conn = self._context.Pipe()
+        self._process = self._context.Process(
+            target=_fork_server_main,
+            args=(
+                child_conn,
+                str(self.base_path),
+                self.scenario_ids,
+                self.limits,
+                self.sample_interval,
+            ),
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+        if not self._conn.poll(timeout):
+            self.close()
+            raise VerifierPoolError("fork server did not finish preloading in time")
+        try:
+            _, self.preload_seconds = self._conn.recv()
+        except EOFError as exc:
+            self.close()
+            raise VerifierPoolError("fork server failed during preload") from exc
+
+    def fork(self, timeout: float) -> Tuple[ForkedProcess, Connection]:
+        with self._lock:
+            if self._process is None or not self._process.is_alive():
+                raise VerifierPoolError("fork server is not running")
+            self._conn.send(os.getpid())
+            if not self._conn.poll(timeout):
+                raise VerifierPoolError("fork server did not answer in time")
+            pid = self._conn.recv()
+            fd = recv_handle(self._conn)
+        return ForkedProcess(pid), Connection(fd)
+
+    def close(self) -> None:
+        if self._process is None:
+            return
+        try:
+            self._conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self._process.join(timeout=1.0)
+        if self._process.is_alive():
+            self._process.kill()
+            self._process.join()
+        self._conn.close()
+        self._process = None
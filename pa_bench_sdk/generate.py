@@ -0,0 +1,323 @@
+"""
+Synthetic large scenarios for `pa-bench generate`.
+
+`generate_scenario` copies a shipped scenario's `task.json`, `verifier.py`
+and `spec.json` unchanged, so the generated scenario keeps its family's
+task and verifier parameters, and writes a `data.json` of the same shape
+with the template's records plus synthetic filler:
+
+- `emails` in `threads` threads, from other users to the scenario's user;
+- `events` on the user's primary calendar;
+- `users` other users (contacts, directory entries and `otherUsersEvents`
+  calendars), each with `events_per_user` events.
+
+Counts are totals and never drop template records. Filler is dated in the
+`span_days` before the template's earliest record and uses neutral subjects
+and titles, so it does not match any verifier's checks: a generated
+scenario scores like its template while every verifier, the spec engine and
+the loader work through the larger state. Records are drawn from a seeded
+`random.Random` and streamed to disk, so millions of them fit in bounded
+memory.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import random
+import shutil
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from .scenario import ScenarioLoader
+
+COPIED_FILES = ("task.json", "verifier.py", "spec.json")
+
+_FIRST_NAMES = (
+    "Avery", "Blake", "Casey", "Devon", "Emery", "Finley", "Harper", "Jules",
+    "Kendall", "Logan", "Morgan", "Parker", "Quinn", "Reese", "Rowan", "Sage",
+)
+_LAST_NAMES = (
+    "Abbott", "Barros", "Castillo", "Dunn", "Eriksen", "Fontaine", "Gallo",
+    "Hughes", "Ibarra", "Jensen", "Kovac", "Lindqvist", "Moreau", "Novak",
+)
+_TOPICS = (
+    "quarterly numbers", "hiring pipeline", "design review", "vendor update",
+    "roadmap notes", "customer feedback", "team offsite", "budget draft",
+    "release checklist", "onboarding plan", "status report", "research notes",
+)
+_EVENT_TITLES = (
+    "Focus time", "Team sync", "1:1", "Planning session", "Design review",
+    "Office hours", "Interview loop", "Standup", "Reading block", "Lunch",
+)
+_BODY = (
+    "Sharing a few notes on the {topic} before we regroup. Nothing urgent on "
+    "my side, just keeping the thread current so everyone has the context. "
+    "Let me know if anything here looks off."
+)
+
+
+@dataclass
+class ScaleOptions:
+    emails: Optional[int] = None
+    threads: Optional[int] = None
+    events: Optional[int] = None
+    users: Optional[int] = None
+    events_per_user: Optional[int] = None
+    span_days: int = 365
+    seed: int = 0
+
+
+_encode = json.JSONEncoder(separators=(",", ":")).encode
+
+
+class _Stream:
+    """A JSON array written item by item."""
+
+    def __init__(self, items: Iterable[Any]):
+        self.items = items
+
+
+def _has_stream(value: Dict[str, Any]) -> bool:
+    return any(
+        isinstance(item, _Stream) or (isinstance(item, dict) and _has_stream(item))
+        for item in value.values()
+    )
+
+
+def _dump(value: Any, handle: IO[str]) -> None:
+    if isinstance(value, _Stream):
+        items = iter(value.items)
+        separator = ""
+        handle.write("[")
+        while True:
+            batch = list(itertools.islice(items, 1024))
+            if not batch:
+                break
+            handle.write(separator + ",".join(map(_encode, batch)))
+            separator = ","
+        handle.write("]")
+    elif isinstance(value, dict) and _has_stream(value):
+        handle.write("{")
+        for index, (key, item) in enumerate(value.items()):
+            handle.write(("," if index else "") + _encode(key) + ":")
+            _dump(item, handle)
+        handle.write("}")
+    else:
+        handle.write(_encode(value))
+
+
+def _parse(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _format(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def _earliest(gomail: Dict[str, Any], gocalendar: Dict[str, Any]) -> datetime:
+    moments = [_parse(email["timestamp"]) for email in gomail.get("emails", [])]
+    moments += [_parse(event["start"]) for event in gocalendar.get("events", [])]
+    for events in gocalendar.get("otherUsersEvents", {}).values():
+        moments += [_parse(event["start"]) for event in events]
+    if not moments:
+        return datetime.now(timezone.utc)
+    return min(moments)
+
+
+class _Filler:
+    def __init__(self, options: ScaleOptions, user: Dict[str, Any], end: datetime):
+        self.options = options
+        self.user = {"name": user.get("name"), "email": user.get("email")}
+        self.end = end.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=1)
+        self.random = random.Random(options.seed)
+
+    def moment(self) -> datetime:
+        minutes = self.random.randrange(max(self.options.span_days, 1) * 24 * 4) * 15
+        return self.end - timedelta(minutes=minutes)
+
+    def person(self, index: int) -> Dict[str, str]:
+        first = _FIRST_NAMES[index % len(_FIRST_NAMES)]
+        last = _LAST_NAMES[(index // len(_FIRST_NAMES)) % len(_LAST_NAMES)]
+        return {
+            "name": f"{first} {last}",
+            "email": f"{first}.{last}.{index}@generated.example".lower(),
+        }
+
+    def emails(self, count: int, people: List[Dict[str, str]]) -> Iterator[Dict[str, Any]]:
+        threads = max(self.options.threads or count, 1)
+        for index in range(count):
+            sender = people[self.random.randrange(len(people))]
+            thread = index % threads
+            topic = _TOPICS[thread % len(_TOPICS)]
+            body = _BODY.format(topic=topic)
+            yield {
+                "id": f"email_gen_{index:08x}",
+                "threadId": f"thread_gen_{thread:08x}",
+                "from": dict(sender),
+                "to": [dict(self.user)],
+                "cc": [],
+                "bcc": [],
+                "subject": f"Notes on the {topic}",
+                "body": body,
+                "snippet": body[:140],
+                "timestamp": self.moment().strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "isRead": True,
+                "isStarred": False,
+                "labels": ["INBOX"],
+                "hasAttachments": False,
+                "attachments": [],
+                "isImportant": False,
+                "category": "primary",
+                "isVerifiedSender": True,
+                "reactions": [],
+                "quotedContent": None,
+                "hasQuotedContent": None,
+            }
+
+    def events(
+        self, count: int, prefix: str, owner: Dict[str, str], people: List[Dict[str, str]]
+    ) -> Iterator[Dict[str, Any]]:
+        for index in range(count):
+            start = self.moment()
+            end = start + timedelta(minutes=15 * self.random.randint(1, 4))
+            attendees = [{**owner, "responseStatus": "accepted", "isOrganizer": True, "isSelf": True}]
+            if people:
+                guest = people[self.random.randrange(len(people))]
+                if guest["email"] != owner["email"]:
+                    attendees.append(
+                        {**guest, "responseStatus": "accepted", "isOrganizer": False, "isSelf": False}
+                    )
+            yield {
+                "id": f"event_{prefix}_{index:08x}",
+                "calendarId": "primary",
+                "title": _EVENT_TITLES[self.random.randrange(len(_EVENT_TITLES))],
+                "description": "",
+                "start": _format(start),
+                "end": _format(end),
+                "isAllDay": False,
+                "location": None,
+                "attendees": attendees,
+                "recurrence": None,
+                "color": None,
+                "status": "confirmed",
+                "visibility": "default",
+                "reminders": [{"method": "popup", "minutes": 10}],
+                "created": _format(start),
+                "updated": _format(start),
+                "conferenceData": None,
+                "eventType": "event",
+                "busyStatus": "busy",
+            }
+
+    def other_events(self, count: int, prefix: str) -> Iterator[Dict[str, Any]]:
+        for index in range(count):
+            start = self.moment()
+            yield {
+                "id": f"event_{prefix}_{index:08x}",
+                "calendarId": "primary",
+                "title": _EVENT_TITLES[self.random.randrange(len(_EVENT_TITLES))],
+                "start": _format(start),
+                "end": _format(start + timedelta(minutes=15 * self.random.randint(1, 4))),
+                "isAllDay": False,
+                "status": "confirmed",
+                "reminders": [{"method": "popup", "minutes": 10}],
+            }
+
+
+def _missing(total: Optional[int], present: int) -> int:
+    return max((total or 0) - present, 0)
+
+
+def generate_scenario(
+    data_path: Union[str, Path],
+    template_id: str,
+    output_dir: Union[str, Path],
+    options: Optional[ScaleOptions] = None,
+    name: Optional[str] = None,
+) -> Path:
+    """Write a scaled copy of `template_id` and return its folder."""
+    options = options or ScaleOptions()
+    template = ScenarioLoader(data_path).load(template_id)
+    target = Path(output_dir) / (name or f"{template_id}_scaled")
+    target.mkdir(parents=True, exist_ok=True)
+    for filename in COPIED_FILES:
+        source = template.path / filename
+        if source.exists():
+            shutil.copy2(source, target / filename)
+
+    gomail = dict(template.gmail_state)
+    gocalendar = dict(template.calendar_state)
+    owner = gomail.get("user") or gocalendar.get("user") or {}
+    filler = _Filler(options, owner, _earliest(gomail, gocalendar))
+
+    calendars: Dict[str, List[Any]] = dict(gocalendar.get("otherUsersEvents") or {})
+    directory = list(gocalendar.get("userDirectory") or [])
+    people = [{"name": entry.get("name"), "email": entry["email"]} for entry in directory]
+    taken = {person["email"] for person in people} | set(calendars)
+    added: List[Dict[str, str]] = []
+    index = 0
+    while len(calendars) + len(added) < (options.users or 0):
+        person = filler.person(index)
+        index += 1
+        if person["email"] not in taken:
+            added.append(person)
+    people += added
+
+    emails = gomail.get("emails") or []
+    events = gocalendar.get("events") or []
+    gomail["contacts"] = list(gomail.get("contacts") or []) + [
+        {**person, "avatar": None, "lastContacted": None} for person in added
+    ]
+    gomail["emails"] = _Stream(
+        itertools.chain(
+            emails, filler.emails(_missing(options.emails, len(emails)), people or [filler.user])
+        )
+    )
+    gocalendar["userDirectory"] = directory + [{**person, "avatar": None} for person in added]
+    gocalendar["events"] = _Stream(
+        itertools.chain(
+            events, filler.events(_missing(options.events, len(events)), "gen", filler.user, people)
+        )
+    )
+    other_events: Dict[str, _Stream] = {}
+    for number, (email, existing) in enumerate(calendars.items()):
+        other_events[email] = _Stream(
+            itertools.chain(
+                existing,
+                filler.other_events(
+                    _missing(options.events_per_user, len(existing)), f"gen{number}"
+                ),
+            )
+        )
+    for number, person in enumerate(added, start=len(calendars)):
+        other_events[person["email"]] = _Stream(
+            filler.other_events(options.events_per_user or 0, f"gen{number}")
+        )
+    gocalendar["otherUsersEvents"] = other_events
+
+    data = dict(template.raw_data)
+    data["gomail"] = gomail
+    data["gocalendar"] = gocalendar
+    with open(target / "data.json", "w", encoding="utf-8") as handle:
+        _dump(data, handle)
+    return target
+
+
+def resolve_templates(data_path: Union[str, Path], names: Iterable[str]) -> List[str]:
+    """Scenario ids for `names`: scenario ids, family names or `all`."""
+    scenario_ids = ScenarioLoader(data_path).list_scenarios()
+    resolved: List[str] = []
+    for name in names:
+        if name == "all":
+            matches = scenario_ids
+        elif name in scenario_ids:
+            matches = [name]
+        else:
+            matches = [scenario_id for scenario_id in scenario_ids if scenario_id.endswith(f"_{name}")][:1]
+        if not matches:
+            raise ValueError(f"No scenario or family named {name!r} under {data_path}")
+        resolved += [match for match in matches if match not in resolved]
+    return resolved
@@ -0,0 +1,143 @@
+"""
+Per-request phase timings for clone requests, from aiohttp's `TraceConfig`.
+
+`WorldsClient` creates its sessions with `trace_config()` and passes a fresh
+`RequestTimings` as each request's `trace_request_ctx`; the hooks below fill
+it in as aiohttp reaches each phase:
+
+- `queued`: waiting for a free connection under the connector's limits;
+- `dns`: host resolution (absent on cache hits);
+- `connect`: TCP (and TLS) setup after resolution, for new connections;
+- `send`: from having a connection to the request body being written;
+- `wait`: from the request being sent to the response headers (time to first
+  byte, i.e. mostly server processing);
+- `receive`: reading the response body.
+
+`reused` tells whether the connection came from the keep-alive pool. Requests
+made without a `RequestTimings` (e.g. on a caller's own session) are not
+timed.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+PHASES = ("queued", "dns", "connect", "send", "wait", "receive")
+
+
+@dataclass
+class RequestTimings:
+    """Phase durations of one request, in seconds."""
+
+    reused: Optional[bool] = None
+    queued: Optional[float] = None
+    dns: Optional[float] = None
+    connect: Optional[float] = None
+    send: Optional[float] = None
+    wait: Optional[float] = None
+    receive: Optional[float] = None
+    _connected: Optional[float] = field(default=None, repr=False)
+    _sent: Optional[float] = field(default=None, repr=False)
+    _first_byte: Optional[float] = field(default=None, repr=False)
+
+    def finish(self) -> None:
+        """Close the `receive` phase once the response body has been read."""
+        if self._first_byte is not None:
+            self.receive = time.perf_counter() - self._first_byte
+
+    def phases(self) -> Dict[str, float]:
+        return {
+            phase: getattr(self, phase) for phase in PHASES if getattr(self, phase) is not None
+        }
+
+    @property
+    def connection(self) -> Optional[str]:
+        if self.reused is None:
+            return None
+        return "reused" if self.reused else "new"
+
+
+def _timings(context: SimpleNamespace) -> Optional[RequestTimings]:
+    timings = context.trace_request_ctx
+    return timings if isinstance(timings, RequestTimings) else None
+
+
+async def _on_queued_start(session: Any, context: SimpleNamespace, params: Any) -> None:
+    context.queued_at = time.perf_counter()
+
+
+async def _on_queued_end(session: Any, context: SimpleNamespace, params: Any) -> None:
+    timings = _timings(context)
+    if timings is not None and hasattr(context, "queued_at"):
+        timings.queued = time.perf_counter() - context.queued_at
+
+
+async def _on_create_start(session: Any, context: SimpleNamespace, params: Any) -> None:
+    context.create_at = time.perf_counter()
+
+
+async def _on_dns_start(session: Any, context: SimpleNamespace, params: Any) -> None:
+    context.dns_at = time.perf_counter()
+
+
+async def _on_dns_end(session: Any, context: SimpleNamespace, params: Any) -> None:
+    timings = _timings(context)
+    if timings is not None and hasattr(context, "dns_at"):
+        timings.dns = time.perf_counter() - context.dns_at
+
+
+async def _on_create_end(session: Any, context: SimpleNamespace, params: Any) -> None:
+    timings = _timings(context)
+    if timings is None:
+        return
+    now = time.perf_counter()
+    timings.reused = False
+    timings._connected = now
+    if hasattr(context, "create_at"):
+        timings.connect = max(now - context.create_at - (timings.dns or 0.0), 0.0)
+
+
+async def _on_reuse(session: Any, context: SimpleNamespace, params: Any) -> None:
+    timings = _timings(context)
+    if timings is not None:
+        timings.reused = True
+        timings._connected = time.perf_counter()
+
+
+async def _on_sent(session: Any, context: SimpleNamespace, params: Any) -> None:
+    # Fires for the headers and again for each body chunk; the last one wins.
+    timings = _timings(context)
+    if timings is not None:
+        timings._sent = time.perf_counter()
+
+
+async def _on_request_end(session: Any, context: SimpleNamespace, params: Any) -> None:
+    timings = _timings(context)
+    if timings is None:
+        return
+    timings._first_byte = now = time.perf_counter()
+    sent = timings._sent if timings._sent is not None else now
+    if timings._connected is not None:
+        timings.send = sent - timings._connected
+    timings.wait = now - sent
+
+
+def trace_config() -> aiohttp.TraceConfig:
+    """A `TraceConfig` that fills in each request's `RequestTimings`."""
+    config = aiohttp.TraceConfig()
+    config.on_connection_queued_start.append(_on_queued_start)
+    config.on_connection_queued_end.append(_on_queued_end)
+    config.on_connection_create_start.append(_on_create_start)
+    config.on_dns_resolvehost_start.append(_on_dns_start)
+    config.on_dns_resolvehost_end.append(_on_dns_end)
+    config.on_connection_create_end.append(_on_create_end)
+    config.on_connection_reuseconn.append(_on_reuse)
+    config.on_request_headers_sent.append(_on_sent)
+    config.on_request_chunk_sent.append(_on_sent)
+    config.on_request_end.append(_on_request_end)
+    return config
@@ -0,0 +1,177 @@
+"""
+Durable progress journal and deterministic sharding for batch commands.
+
+`ProgressJournal` is an append-only file with one JSON array per completed
+work key (`[scenario_id, instance, rollout]`). Completed keys are loaded into
+a set on open, so a restarted batch skips finished work with an O(1) lookup.
+Appends are buffered and made durable (`flush` + `fsync`) every
+`sync_every` keys or `sync_interval` seconds, whichever comes first, and on
+close; a crash loses at most that window, which is then redone. A torn last
+line from a crash mid-write is ignored on the next open.
+
+An output file tracked with `track_output` is fsynced before each sync and
+its size recorded with the keys. On resume it is cut back to that size, so
+the rows of redone items are not written twice.
+
+`Shard` splits a job across independent nodes: a key belongs to shard
+`i/n` when a stable hash of the key is `i` modulo `n`, so every node
+computes the same partition without coordination.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Callable, List, Optional, Set, Tuple, Union
+
+WorkKey = Tuple[str, str, str]
+
+
+def work_key(scenario_id: Optional[str], instance: Optional[str], rollout: object) -> WorkKey:
+    return (scenario_id or "-", instance or "-", str(rollout))
+
+
+@dataclass(frozen=True)
+class Shard:
+    index: int
+    count: int
+
+    @classmethod
+    def parse(cls, spec: str) -> "Shard":
+        """Parse `i/n` (0-based `i`)."""
+        try:
+            index, count = (int(part) for part in spec.split("/"))
+        except ValueError:
+            raise ValueError(f"Shard must look like i/n, got {spec!r}") from None
+        if count < 1 or not 0 <= index < count:
+            raise ValueError(f"Shard index must be in [0, {count}), got {spec!r}")
+        return cls(index, count)
+
+    def owns(self, key: WorkKey) -> bool:
+        digest = hashlib.blake2b("\x1f".join(key).encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "big") % self.count == self.index
+
+
+class ProgressJournal:
+    """Append-only log of completed work keys with batched fsync."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        sync_every: int = 256,
+        sync_interval: float = 1.0,
+    ):
+        self.path = Path(path)
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.completed: Set[WorkKey] = set()
+        self.output: Optional[Tuple[str, int]] = None
+        self._before_sync: List[Callable[[], None]] = []
+        self._output: Optional[IO[str]] = None
+        # Keys after the last output mark, and where that mark ends.
+        self._trailing: List[WorkKey] = []
+        self._output_mark = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._load()
+        self._handle = open(self.path, "a", encoding="utf-8")
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        with open(self.path, "rb") as handle:
+            data = handle.read()
+        end = data.rfind(b"\n") + 1
+        offset = 0
+        for line in data[:end].splitlines(keepends=True):
+            offset += len(line)
+            try:
+                key = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(key, list) and len(key) == 3:
+                self.completed.add(tuple(key))
+                self._trailing.append(tuple(key))
+            elif isinstance(key, dict) and isinstance(key.get("output_size"), int):
+                self.output = (key.get("output"), key["output_size"])
+                self._trailing, self._output_mark = [], offset
+        if end < len(data):
+            # Drop a torn final line so the next append starts on a fresh one.
+            with open(self.path, "r+b") as handle:
+                handle.truncate(end)
+
+    def __contains__(self, key: WorkKey) -> bool:
+        return key in self.completed
+
+    def __len__(self) -> int:
+        return len(self.completed)
+
+    def before_sync(self, callback: Callable[[], None]) -> None:
+        """Run `callback` (e.g. committing a results store) before every
+        sync, so outputs are at least as durable as the journal entries."""
+        self._before_sync.append(callback)
+
+    def track_output(self, handle: IO[str]) -> None:
+        """Keep `handle`, an output file appended to across resumes, in step
+        with the journal.
+
+        The file and the journal are cut back to their last sync: rows and
+        keys past it were never fsynced together, so either may be missing
+        after a crash, and those items are redone. A different file than
+        last time is left as is.
+        """
+        handle.flush()
+        if self.output is not None and self.output[0] == os.path.abspath(handle.name):
+            if os.fstat(handle.fileno()).st_size > self.output[1]:
+                handle.truncate(self.output[1])
+            self.completed.difference_update(self._trailing)
+            self._handle.flush()
+            self._handle.truncate(self._output_mark)
+        self._trailing = []
+        self._output = handle
+
+    def record(self, key: WorkKey) -> None:
+        if key in self.completed:
+            return
+        self.completed.add(key)
+        self._handle.write(json.dumps(list(key)) + "\n")
+        self._unsynced += 1
+        if (
+            self._unsynced >= self.sync_every
+            or time.monotonic() - self._last_sync >= self.sync_interval
+        ):
+            self.sync()
+
+    def sync(self) -> None:
+        for callback in self._before_sync:
+            callback()
+        if self._output is not None:
+            self._output.flush()
+            os.fsync(self._output.fileno())
+            self.output = (
+                os.path.abspath(self._output.name),
+                os.fstat(self._output.fileno()).st_size,
+            )
+            entry = {"output": self.output[0], "output_size": self.output[1]}
+            self._handle.write(json.dumps(entry) + "\n")
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        if self._handle.closed:
+            return
+        self.sync()
+        self._handle.close()
+
+    def __enter__(self) -> "ProgressJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,408 @@
+"""
+In-process metrics: labelled counters, gauges and log-bucketed latency histograms.
+
+Histogram buckets are a fixed logarithmic grid (`BUCKETS_PER_OCTAVE`
+buckets per doubling, about 19% wide), so recording a value is one `log2`
+and one dict increment under the series' lock, with no bucket layout to
+configure, and any two snapshots merge exactly. Quantiles read back from
+the grid are upper bucket bounds, within 19% of the true value.
+
+`REGISTRY` holds the SDK's own metrics:
+
+- `pa_bench_scenario_loads_total{scenario_id, outcome}`;
+- `pa_bench_verifications_total{scenario_id, outcome}` (`passed`,
+  `failed` or `error`) and `pa_bench_verifier_seconds{scenario_id}`;
+- `pa_bench_http_requests_total{operation, status}`,
+  `pa_bench_http_request_seconds{operation}` and
+  `pa_bench_http_{sent,received}_bytes_total{operation}` for clone requests,
+  plus `pa_bench_http_phase_seconds{operation, phase, connection}` and
+  `pa_bench_http_connections_total{operation, connection}` from
+  `pa_bench_sdk.httptrace` (`connection` is `new` or `reused`);
+- `pa_bench_http_retries_total{operation, reason}` and
+  `pa_bench_http_concurrency_limit{backend}` when a `WorldsClient` runs with a
+  retry policy and adaptive limiter (see `pa_bench_sdk.adaptive`), and
+  `pa_bench_http_hedges_total{operation, outcome}` (`primary_won`,
+  `hedge_won` or `over_budget`) when it hedges `get_state`.
+
+`VerifierPool` workers record into their own process's registry and send
+what they recorded back with every result (`drain` / `merge`), so the
+parent's registry covers verifiers run anywhere in the pool. `pa-bench
+serve` exposes the registry at `GET /metrics` in the Prometheus text
+format; the global `--metrics PATH` switch dumps it as JSON every
+`--metrics-interval` seconds and when the command ends.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+BUCKETS_PER_OCTAVE = 4
+
+LabelValues = Tuple[str, ...]
+
+
+def bucket_index(value: float) -> Optional[int]:
+    """Grid bucket holding `value`; `None` for zero and negative values."""
+    if value <= 0:
+        return None
+    return math.floor(math.log2(value) * BUCKETS_PER_OCTAVE)
+
+
+def bucket_upper_bound(index: int) -> float:
+    return 2.0 ** ((index + 1) / BUCKETS_PER_OCTAVE)
+
+
+class _CounterSeries:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"value": self.value}
+
+    def merge(self, data: Dict[str, Any]) -> None:
+        self.inc(data["value"])
+
+
+class _GaugeSeries:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"value": self.value}
+
+    def merge(self, data: Dict[str, Any]) -> None:
+        self.value = data["value"]
+
+
+class _HistogramSeries:
+    __slots__ = ("count", "sum", "zero", "buckets", "_lock")
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.zero = 0
+        self.buckets: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bucket_index(value)
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            if index is None:
+                self.zero += 1
+            else:
+                self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the `q` quantile (0 when empty)."""
+        with self._lock:
+            rank = q * self.count
+            seen = self.zero
+            if not self.count or seen >= rank:
+                return 0.0
+            for index in sorted(self.buckets):
+                seen += self.buckets[index]
+                if seen >= rank:
+                    return bucket_upper_bound(index)
+        return 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "count": self.count,
+                "sum": self.sum,
+                "zero": self.zero,
+                "buckets": dict(self.buckets),
+            }
+
+    def merge(self, data: Dict[str, Any]) -> None:
+        with self._lock:
+            self.count += data["count"]
+            self.sum += data["sum"]
+            self.zero += data["zero"]
+            for index, count in data["buckets"].items():
+                index = int(index)
+                self.buckets[index] = self.buckets.get(index, 0) + count
+
+
+class _Metric:
+    kind = ""
+    _series_type: type = _CounterSeries
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.series: Dict[LabelValues, Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: Any) -> Any:
+        key = tuple(str(value) for value in values)
+        series = self.series.get(key)
+        if series is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} takes labels {self.labelnames}, got {key}")
+            with self._lock:
+                series = self.series.setdefault(key, self._series_type())
+        return series
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            items = list(self.series.items())
+        return {
+            "type": self.kind,
+            "help": self.help,
+            "labels": list(self.labelnames),
+            "series": [{"labels": list(key), **series.snapshot()} for key, series in items],
+        }
+
+    def merge(self, data: Dict[str, Any]) -> None:
+        for entry in data["series"]:
+            self.labels(*entry["labels"]).merge(entry)
+
+
+class Counter(_Metric):
+    kind = "counter"
+    _series_type = _CounterSeries
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+    _series_type = _GaugeSeries
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+    _series_type = _HistogramSeries
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls: type, name: str, help_text: str, labelnames: Sequence[str]) -> Any:
+        with self._lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = cls(name, help_text, labelnames)
+        if not isinstance(metric, cls):
+            raise ValueError(f"{name} is already registered as a {metric.kind}")
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get(Counter, name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get(Gauge, name, help_text, labelnames)
+
+    def histogram(
+        self, name: str, help_text: str, labelnames: Sequence[str] = ()
+    ) -> Histogram:
+        return self._get(Histogram, name, help_text, labelnames)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Every metric and series as plain data (picklable, JSON-ready)."""
+        with self._lock:
+            metrics = list(self.metrics.items())
+        return {name: metric.snapshot() for name, metric in metrics}
+
+    def drain(self) -> Optional[Dict[str, Any]]:
+        """Snapshot the recorded series and clear them; `None` when empty."""
+        with self._lock:
+            drained = {}
+            for name, metric in self.metrics.items():
+                with metric._lock:
+                    series, metric.series = metric.series, {}
+                if series:
+                    drained[name] = {
+                        "type": metric.kind,
+                        "help": metric.help,
+                        "labels": list(metric.labelnames),
+                        "series": [
+                            {"labels": list(key), **item.snapshot()} for key, item in series.items()
+                        ],
+                    }
+        return drained or None
+
+    def merge(self, snapshot: Dict[str, Any]) -> None:
+        """Add another registry's snapshot (e.g. from a worker process)."""
+        for name, data in snapshot.items():
+            cls = _METRIC_TYPES[data["type"]]
+            self._get(cls, name, data["help"], data["labels"]).merge(data)
+
+    def clear(self) -> None:
+        self.drain()
+
+    def to_json(self) -> Dict[str, Any]:
+        """`snapshot()` with bucket bounds and p50/p95/p99 for histograms."""
+        snapshot = self.snapshot()
+        for name, data in snapshot.items():
+            if data["type"] != "histogram":
+                continue
+            metric = self.metrics[name]
+            for entry in data["series"]:
+                series = metric.labels(*entry["labels"])
+                for q in (0.5, 0.95, 0.99):
+                    entry[f"p{round(q * 100)}"] = series.quantile(q)
+                entry["buckets"] = {
+                    f"{bucket_upper_bound(index):.6g}": count
+                    for index, count in sorted(entry["buckets"].items())
+                }
+        return snapshot
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = []
+        for name, data in sorted(self.snapshot().items()):
+            lines.append(f"# HELP {name} {data['help']}")
+            lines.append(f"# TYPE {name} {data['type']}")
+            if data["type"] != "histogram":
+                for entry in data["series"]:
+                    lines.append(f"{name}{_labels(data['labels'], entry['labels'])} {_number(entry['value'])}")
+                continue
+            indices = [index for entry in data["series"] for index in entry["buckets"]]
+            grid = range(min(indices), max(indices) + 1) if indices else range(0)
+            for entry in data["series"]:
+                cumulative = entry["zero"]
+                for index in grid:
+                    cumulative += entry["buckets"].get(index, 0)
+                    bound = f"{bucket_upper_bound(index):.6g}"
+                    labels = _labels(data["labels"] + ["le"], entry["labels"] + [bound])
+                    lines.append(f"{name}_bucket{labels} {cumulative}")
+                labels = _labels(data["labels"] + ["le"], entry["labels"] + ["+Inf"])
+                lines.append(f"{name}_bucket{labels} {entry['count']}")
+                labels = _labels(data["labels"], entry["labels"])
+                lines.append(f"{name}_sum{labels} {_number(entry['sum'])}")
+                lines.append(f"{name}_count{labels} {entry['count']}")
+        return "\n".join(lines) + "\n"
+
+
+_METRIC_TYPES = {"counter": Counter, "gauge": Gauge, "histogram": Histogram}
+
+
+def _number(value: float) -> str:
+    """A sample value at full precision (`:g` would print 12345678 as 1.23457e+07)."""
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [
+        name + '="' + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for name, value in zip(names, values)
+    ]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+REGISTRY = MetricsRegistry()
+
+SCENARIO_LOADS = REGISTRY.counter(
+    "pa_bench_scenario_loads_total", "Scenario loads from disk", ("scenario_id", "outcome")
+)
+VERIFICATIONS = REGISTRY.counter(
+    "pa_bench_verifications_total", "Verifier runs by outcome", ("scenario_id", "outcome")
+)
+VERIFIER_SECONDS = REGISTRY.histogram(
+    "pa_bench_verifier_seconds", "validation_function duration", ("scenario_id",)
+)
+HTTP_REQUESTS = REGISTRY.counter(
+    "pa_bench_http_requests_total", "Clone requests by status", ("operation", "status")
+)
+HTTP_SECONDS = REGISTRY.histogram(
+    "pa_bench_http_request_seconds", "Clone request duration", ("operation",)
+)
+HTTP_SENT_BYTES = REGISTRY.counter(
+    "pa_bench_http_sent_bytes_total", "Request body bytes sent to clones", ("operation",)
+)
+HTTP_RECEIVED_BYTES = REGISTRY.counter(
+    "pa_bench_http_received_bytes_total", "Response body bytes from clones", ("operation",)
+)
+HTTP_PHASE_SECONDS = REGISTRY.histogram(
+    "pa_bench_http_phase_seconds",
+    "Clone request phase duration (queued, dns, connect, send, wait, receive)",
+    ("operation", "phase", "connection"),
+)
+HTTP_CONNECTIONS = REGISTRY.counter(
+    "pa_bench_http_connections_total",
+    "Clone requests by whether their connection was new or reused",
+    ("operation", "connection"),
+)
+HTTP_RETRIES = REGISTRY.counter(
+    "pa_bench_http_retries_total", "Clone requests retried after a failure", ("operation", "reason")
+)
+HTTP_CONCURRENCY_LIMIT = REGISTRY.gauge(
+    "pa_bench_http_concurrency_limit", "Adaptive concurrency limit per backend", ("backend",)
+)
+HTTP_HEDGES = REGISTRY.counter(
+    "pa_bench_http_hedges_total",
+    "Slow requests that were hedged, by which copy won, or skipped over budget",
+    ("operation", "outcome"),
+)
+
+
+def write_json(path: Union[str, Path], registry: MetricsRegistry = REGISTRY) -> None:
+    """Write `registry.to_json()` to `path` atomically."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + ".tmp")
+    partial.write_text(json.dumps(registry.to_json(), indent=2) + "\n")
+    os.replace(partial, path)
+
+
+class MetricsDumper:
+    """Writes the registry as JSON every `interval` seconds and on `stop`."""
+
+    def __init__(
+        self, path: Union[str, Path], interval: float = 10.0, registry: MetricsRegistry = REGISTRY
+    ):
+        self.path = Path(path)
+        self.interval = interval
+        self.registry = registry
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-dump", daemon=True)
+
+    def start(self) -> "MetricsDumper":
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            write_json(self.path, self.registry)
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        write_json(self.path, self.registry)
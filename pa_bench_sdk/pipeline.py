@@ -0,0 +1,247 @@
+"""
+End-to-end asyncio pipeline: load → agent → fetch → verify.
+
+`EpisodePipeline` runs episodes (one rollout of one scenario each) over a
+fixed set of instance pairs, with bounded queues between the stages:
+
+- prepare: reads the scenario and encodes its `set_state` bodies in a thread
+  (once per scenario), staying up to `prefetch` episodes ahead of the pairs;
+- one driver per instance pair: loads the prepared bodies, awaits the
+  user's agent coroutine and fetches the resulting states (only the parts
+  the scenario's verifier reads, see `pa_bench_sdk.projection`). The pair
+  takes the next prepared episode as soon as its states are fetched;
+- verify: scores fetched states on a `VerifierPool` (or anything with the
+  same `submit`, such as a distributed `Coordinator`), or with a
+  `VerifierRunner` in an executor.
+
+`PipelineLimits` caps how many loads, agents and fetches run at once across
+all pairs (default: one per pair), and how many verifications run at once
+(default: `verify_queue`; the pool or coordinator queues the rest).
+When verification falls behind, its queue fills and drivers wait before
+taking more work, and prepare stops `prefetch` episodes ahead of the pairs.
+
+A failing stage marks its episode with `error` and `stage` and the episode
+is yielded without running the later stages; the pipeline keeps going.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .scenario import ScenarioLoader, ScenarioMetadata
+from .verifier import VerificationResult, VerifierRunner
+from .worlds import InstanceEndpoints, WorldsClient, encode_payload
+
+Bodies = Tuple[bytes, bytes]
+
+
+@dataclass
+class Episode:
+    scenario_id: str
+    rollout: int = 0
+    metadata: Optional[ScenarioMetadata] = None
+    endpoints: Optional[InstanceEndpoints] = None
+    output: Any = None
+    state: Optional[Dict[str, Dict[str, Any]]] = None
+    result: Optional[VerificationResult] = None
+    error: Optional[str] = None
+    stage: Optional[str] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    def fail(self, stage: str, exc: BaseException) -> None:
+        self.stage = stage
+        self.error = f"{type(exc).__name__}: {exc}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        row: Dict[str, Any] = {"scenario_id": self.scenario_id, "rollout": self.rollout}
+        if self.endpoints is not None:
+            row["instance"] = self.endpoints.gmail_clone
+        if self.error is not None:
+            row["error"] = self.error
+            row["stage"] = self.stage
+        elif self.result is not None:
+            row.update(self.result.to_dict())
+        for stage, seconds in self.timings.items():
+            row[f"{stage}_seconds"] = seconds
+        return row
+
+
+AgentHook = Callable[[Episode], Awaitable[Any]]
+
+
+@dataclass
+class PipelineLimits:
+    prefetch: int = 2
+    loads: Optional[int] = None
+    agents: Optional[int] = None
+    fetches: Optional[int] = None
+    verify: Optional[int] = None
+    verify_queue: int = 8
+
+
+_DONE = object()
+
+
+class EpisodePipeline:
+    """Runs load → agent → fetch → verify for many episodes concurrently."""
+
+    def __init__(
+        self,
+        pairs: Sequence[InstanceEndpoints],
+        agent: AgentHook,
+        client: WorldsClient,
+        data_path: Union[str, Path] = "data",
+        verifier: Any = None,
+        executor: Optional[Executor] = None,
+        limits: Optional[PipelineLimits] = None,
+    ):
+        if not pairs:
+            raise ValueError("EpisodePipeline needs at least one instance pair")
+        self.pairs = list(pairs)
+        self.agent = agent
+        self.client = client
+        self.loader = ScenarioLoader(data_path)
+        self.runner = VerifierRunner(data_path)
+        self.verifier = verifier
+        self.executor = executor
+        self.limits = limits or PipelineLimits()
+        self._prepared: Dict[str, "asyncio.Future[Tuple[ScenarioMetadata, Bodies]]"] = {}
+
+    def _encode(self, scenario_id: str) -> Tuple[ScenarioMetadata, Bodies]:
+        # Import the verifier here, off the event loop, for the fetch's projection.
+        self.runner.projection(scenario_id)
+        scenario = self.loader.load(scenario_id)
+        payloads = scenario.clone_payloads()
+        return scenario.metadata, (
+            encode_payload(payloads["gomail"]),
+            encode_payload(payloads["gocalendar"]),
+        )
+
+    def _scenario(self, scenario_id: str) -> "asyncio.Future[Tuple[ScenarioMetadata, Bodies]]":
+        future = self._prepared.get(scenario_id)
+        if future is None:
+            future = self._prepared[scenario_id] = asyncio.ensure_future(
+                asyncio.to_thread(self._encode, scenario_id)
+            )
+        return future
+
+    async def _verify(self, episode: Episode) -> VerificationResult:
+        if self.verifier is not None:
+            return await asyncio.wrap_future(self.verifier.submit(episode.scenario_id, episode.state))
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, self.runner.run, episode.scenario_id, episode.state
+        )
+
+    async def run(self, episodes: Iterable[Union[Episode, str]]) -> AsyncIterator[Episode]:
+        """Yield every episode, scored or failed, in completion order."""
+        limits = self.limits
+        pairs = len(self.pairs)
+        verifiers = limits.verify or limits.verify_queue
+        loads = asyncio.Semaphore(limits.loads or pairs)
+        agents = asyncio.Semaphore(limits.agents or pairs)
+        fetches = asyncio.Semaphore(limits.fetches or pairs)
+        prepared: "asyncio.Queue[Any]" = asyncio.Queue(limits.prefetch)
+        fetched: "asyncio.Queue[Any]" = asyncio.Queue(limits.verify_queue)
+        finished: "asyncio.Queue[Any]" = asyncio.Queue()
+
+        async def prepare() -> None:
+            for item in episodes:
+                episode = item if isinstance(item, Episode) else Episode(item)
+                started = time.perf_counter()
+                try:
+                    episode.metadata, bodies = await self._scenario(episode.scenario_id)
+                except Exception as exc:
+                    episode.fail("prepare", exc)
+                    await finished.put(episode)
+                    continue
+                episode.timings["prepare"] = time.perf_counter() - started
+                await prepared.put((episode, bodies, time.perf_counter()))
+            for _ in self.pairs:
+                await prepared.put(None)
+
+        async def drive(endpoints: InstanceEndpoints) -> None:
+            while True:
+                item = await prepared.get()
+                if item is None:
+                    return
+                episode, bodies, queued = item
+                episode.endpoints = endpoints
+                episode.timings["pair_wait"] = time.perf_counter() - queued
+                stage = "load"
+                try:
+                    async with loads:
+                        started = time.perf_counter()
+                        await self.client.set_states(endpoints, *bodies)
+                    episode.timings["load"] = time.perf_counter() - started
+                    stage = "agent"
+                    async with agents:
+                        started = time.perf_counter()
+                        episode.output = await self.agent(episode)
+                    episode.timings["agent"] = time.perf_counter() - started
+                    stage = "fetch"
+                    async with fetches:
+                        started = time.perf_counter()
+                        episode.state = await self.client.get_states(
+                            endpoints, self.runner.projection(episode.scenario_id)
+                        )
+                    episode.timings["fetch"] = time.perf_counter() - started
+                except Exception as exc:
+                    episode.fail(stage, exc)
+                    await finished.put(episode)
+                    continue
+                await fetched.put((episode, time.perf_counter()))
+
+        async def verify() -> None:
+            while True:
+                item = await fetched.get()
+                if item is None:
+                    return
+                episode, queued = item
+                started = time.perf_counter()
+                episode.timings["verify_wait"] = started - queued
+                try:
+                    episode.result = await self._verify(episode)
+                except Exception as exc:
+                    episode.fail("verify", exc)
+                episode.timings["verify"] = time.perf_counter() - started
+                await finished.put(episode)
+
+        async def stages() -> None:
+            scorers = [asyncio.ensure_future(verify()) for _ in range(verifiers)]
+            try:
+                await asyncio.gather(prepare(), *(drive(pair) for pair in self.pairs))
+                for _ in scorers:
+                    await fetched.put(None)
+                await asyncio.gather(*scorers)
+            finally:
+                for scorer in scorers:
+                    scorer.cancel()
+                finished.put_nowait(_DONE)
+
+        runner = asyncio.ensure_future(stages())
+        try:
+            while True:
+                episode = await finished.get()
+                if episode is _DONE:
+                    break
+                yield episode
+            await runner
+        finally:
+            runner.cancel()
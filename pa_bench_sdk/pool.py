@@ -0,0 +1,610 @@
+"""
+Persistent pool of warm verifier worker processes.
+
+Each worker imports every scenario's `verifier.py` once at startup and then
+serves `(scenario_id, state)` requests over a pipe. Calls are bounded by a
+wall-clock timeout (enforced by the parent, which kills the worker) and by
+optional CPU-time and memory limits (enforced inside the worker with
+`RLIMIT_CPU`/`RLIMIT_AS` where the platform provides them). Workers that
+time out, exceed a limit or crash are replaced transparently; the failing
+call raises a `VerifierPoolError` subclass from its future.
+
+A `None` state verifies the scenario's stored state. States may also be
+passed as a `SharedStateHandle` (see `pa_bench_sdk.shared`);
+workers attach each segment once and read it in place.
+
+Results are the usual `VerificationResult`, with `queue_seconds` (time spent
+waiting for a free worker), `exec_seconds` and `cpu_seconds` (measured in
+the worker around `validation_function`) added to `details`.
+
+With a `cost_model` (see `pa_bench_sdk.scheduling`) queued jobs are taken
+longest-estimated-first instead of FIFO, and every completed call updates
+the model with its `exec_seconds`.
+
+With `sample_interval` set, every worker runs a signal-based `StackSampler`
+(see `pa_bench_sdk.sampling`) around its verifier calls and returns the
+samples with each reply; the pool merges them into `VerifierPool.samples`.
+Workers likewise send back what they recorded in `pa_bench_sdk.metrics`,
+which the pool merges into the parent's `REGISTRY`.
+"""
+
+from __future__ import annotations
+
+import math
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from . import metrics
+from .scenario import ScenarioLoader
+from .scheduling import CostModel, CostQueue
+from .shared import AttachedState, SharedStateHandle, attach_state
+from .verifier import VerificationResult, VerifierRunner
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    resource = None
+
+
+StateLike = Union[Dict[str, Dict[str, Any]], SharedStateHandle]
+
+
+class VerifierPoolError(RuntimeError):
+    """Base class for failures raised by `VerifierPool` futures."""
+
+
+class VerifierTimeout(VerifierPoolError):
+    """The verifier exceeded the pool's wall-clock timeout."""
+
+
+class VerifierLimitExceeded(VerifierPoolError):
+    """The verifier exceeded the pool's CPU-time or memory limit."""
+
+
+class VerifierCrashed(VerifierPoolError):
+    """The worker process died while running the verifier."""
+
+
+class VerifierFailed(VerifierPoolError):
+    """The verifier raised an exception; the message carries its repr."""
+
+
+@dataclass
+class PoolLimits:
+    """Per-call limits; `None` disables a limit.
+
+    `cpu_seconds` is rounded up to whole seconds by `RLIMIT_CPU`, and
+    `memory_bytes` is the address space a call may add on top of the worker's
+    current size.
+    """
+
+    timeout: Optional[float] = 30.0
+    cpu_seconds: Optional[float] = None
+    memory_bytes: Optional[int] = None
+
+
+@dataclass
+class PoolStats:
+    """Counters and latency samples collected by a pool."""
+
+    completed: int = 0
+    failed: int = 0
+    timeouts: int = 0
+    limit_errors: int = 0
+    crashes: int = 0
+    restarts: int = 0
+    queue_seconds: List[float] = field(default_factory=list)
+    exec_seconds: List[float] = field(default_factory=list)
+    spawn_seconds: List[float] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "limit_errors": self.limit_errors,
+            "crashes": self.crashes,
+            "restarts": self.restarts,
+            "queue": latency_summary(self.queue_seconds),
+            "exec": latency_summary(self.exec_seconds),
+            "spawn": latency_summary(self.spawn_seconds),
+        }
+
+
+def latency_summary(samples: Sequence[float]) -> Dict[str, float]:
+    """Mean, p50, p95, p99 and max of a list of latencies in seconds."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def quantile(q: float) -> float:
+        return ordered[min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1)]
+
+    return {
+        "count": len(ordered),
+        "mean": sum(ordered) / len(ordered),
+        "p50": quantile(0.50),
+        "p95": quantile(0.95),
+        "p99": quantile(0.99),
+        "max": ordered[-1],
+    }
+
+
+def worker_memory(pids: Iterable[int]) -> Dict[int, Dict[str, int]]:
+    """Read RSS and PSS for each pid from `/proc` (empty where unavailable).
+
+    PSS splits shared pages between the processes mapping them, so its sum
+    is the real footprint of a pool whose workers share copy-on-write pages.
+    """
+    usage = {}
+    for pid in pids:
+        values = {}
+        try:
+            with open(f"/proc/{pid}/smaps_rollup") as handle:
+                for line in handle:
+                    key, _, rest = line.partition(":")
+                    if key in ("Rss", "Pss"):
+                        values[key.lower()] = int(rest.split()[0]) * 1024
+        except OSError:
+            continue
+        usage[pid] = values
+    return usage
+
+
+class _LimitExceeded(Exception):
+    pass
+
+
+def _raise_cpu_limit(signum, frame):
+    raise _LimitExceeded("CPU time limit exceeded")
+
+
+def _vm_bytes() -> int:
+    with open("/proc/self/statm") as handle:
+        return int(handle.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _set_call_limits(limits: PoolLimits) -> None:
+    if resource is None:
+        return
+    if limits.cpu_seconds is not None:
+        used = time.process_time()
+        _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        soft = math.ceil(used + limits.cpu_seconds)
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    if limits.memory_bytes is not None and os.path.exists("/proc/self/statm"):
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        soft = _vm_bytes() + limits.memory_bytes
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (soft, hard))
+
+
+def _clear_call_limits(limits: PoolLimits) -> None:
+    if resource is None:
+        return
+    if limits.cpu_seconds is not None:
+        _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+    if limits.memory_bytes is not None:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        resource.setrlimit(resource.RLIMIT_AS, (hard, hard))
+
+
+def preload_verifiers(
+    base_path: Union[str, Path], scenario_ids: Optional[Iterable[str]] = None
+) -> Dict[str, Any]:
+    """Import the `validation_function` of each selected scenario."""
+    runner = VerifierRunner(base_path)
+    if scenario_ids is None:
+        scenario_ids = sorted(
+            path.name
+            for path in runner.base_path.iterdir()
+            if (path / "verifier.py").exists()
+        )
+    return {
+        scenario_id: runner.load_validation_function(
+            runner.base_path / scenario_id / "verifier.py", scenario_id
+        )
+        for scenario_id in scenario_ids
+    }
+
+
+def preload_states(
+    base_path: Union[str, Path], scenario_ids: Optional[Iterable[str]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Load the stored clone states of each selected scenario."""
+    loader = ScenarioLoader(base_path)
+    states = {}
+    for scenario_id in scenario_ids if scenario_ids is not None else loader.list_scenarios():
+        scenario = loader.load(scenario_id)
+        states[scenario_id] = {
+            "gomail": scenario.gmail_state,
+            "gocalendar": scenario.calendar_state,
+        }
+    return states
+
+
+def _serve(
+    conn,
+    runner: VerifierRunner,
+    functions: Dict[str, Any],
+    limits: PoolLimits,
+    baselines: Optional[Dict[str, Dict[str, Any]]] = None,
+    sample_interval: Optional[float] = None,
+):
+    if resource is not None and limits.cpu_seconds is not None:
+        signal.signal(signal.SIGXCPU, _raise_cpu_limit)
+    sampler = None
+    if sample_interval is not None:
+        from .sampling import StackSampler
+
+        sampler = StackSampler(sample_interval, mode="signal").start()
+    attached: Dict[str, AttachedState] = {}
+    # Anything recorded before this point (preloading, or a fork server's
+    # history) is not this worker's to report.
+    metrics.REGISTRY.clear()
+    conn.send(("ready", os.getpid()))
+    try:
+        _serve_requests(conn, runner, functions, limits, attached, baselines or {}, sampler)
+    finally:
+        if sampler is not None:
+            sampler.stop()
+        for segment in attached.values():
+            segment.close()
+
+
+def _serve_requests(conn, runner, functions, limits, attached, baselines, sampler=None) -> None:
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        scenario_id, state = request
+
+        fatal = False
+        started = time.perf_counter()
+        cpu_started = time.process_time()
+        try:
+            if state is None:
+                state = baselines.get(scenario_id)
+                if state is None:
+                    state = baselines[scenario_id] = preload_states(
+                        runner.base_path, [scenario_id]
+                    )[scenario_id]
+            elif isinstance(state, SharedStateHandle):
+                segment = attached.get(state.name)
+                if segment is None:
+                    segment = attached[state.name] = attach_state(state)
+                state = segment.state
+            function = functions.get(scenario_id)
+            if function is None:
+                function = runner.load_validation_function(
+                    runner.base_path / scenario_id / "verifier.py", scenario_id
+                )
+                functions[scenario_id] = function
+            _set_call_limits(limits)
+            try:
+                if sampler is not None:
+                    with sampler.labelled(scenario_id):
+                        result = runner.evaluate(function, scenario_id, state)
+                else:
+                    result = runner.evaluate(function, scenario_id, state)
+            finally:
+                _clear_call_limits(limits)
+            reply = ("ok", result)
+        except (_LimitExceeded, MemoryError) as exc:
+            reply = ("limit", str(exc) or type(exc).__name__)
+            fatal = True
+        except Exception as exc:  # verifier code is arbitrary
+            reply = ("error", f"{type(exc).__name__}: {exc}")
+        timings = (time.perf_counter() - started, time.process_time() - cpu_started)
+        samples = sampler.drain() if sampler is not None and sampler.samples else None
+
+        conn.send(reply + timings + (samples, metrics.REGISTRY.drain()))
+        if fatal:
+            return
+
+
+def _worker_main(
+    conn, base_path: str, scenario_ids, limits: PoolLimits, sample_interval=None
+):
+    runner = VerifierRunner(base_path)
+    functions = preload_verifiers(base_path, scenario_ids)
+    _serve(conn, runner, functions, limits, sample_interval=sample_interval)
+
+
+@dataclass
+class _Job:
+    scenario_id: str
+    state: Optional[StateLike]
+    future: Future
+    submitted: float
+
+
+class _Worker:
+    """One worker process plus the parent-side thread that feeds it."""
+
+    def __init__(self, pool: "VerifierPool", slot: int):
+        self.pool = pool
+        self.slot = slot
+        self.process = None
+        self.conn = None
+        self.thread = threading.Thread(
+            target=self._loop, name=f"verifier-pool-{slot}", daemon=True
+        )
+
+    def spawn(self) -> None:
+        started = time.perf_counter()
+        self.process, self.conn = self.pool._launch()
+        if not self.conn.poll(self.pool.startup_timeout):
+            self.kill()
+            raise VerifierPoolError(f"worker {self.slot} did not start in time")
+        try:
+            self.conn.recv()
+        except EOFError as exc:
+            self.kill()
+            raise VerifierPoolError(f"worker {self.slot} failed during preload") from exc
+        with self.pool._lock:
+            self.pool.stats.spawn_seconds.append(time.perf_counter() - started)
+
+    def kill(self) -> None:
+        if self.process is not None and self.process.is_alive():
+            self.process.kill()
+        if self.process is not None:
+            self.process.join()
+        if self.conn is not None:
+            self.conn.close()
+
+    def respawn(self) -> None:
+        self.kill()
+        with self.pool._lock:
+            self.pool.stats.restarts += 1
+        self.spawn()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1.0)
+        self.kill()
+
+    def _loop(self) -> None:
+        pool = self.pool
+        while True:
+            job = pool._jobs.get()
+            if job is None:
+                return
+            if not job.future.set_running_or_notify_cancel():
+                continue
+            queue_seconds = time.perf_counter() - job.submitted
+            try:
+                result = self._call(job)
+            except BaseException as exc:
+                with pool._lock:
+                    pool.stats.failed += 1
+                    pool.stats.queue_seconds.append(queue_seconds)
+                job.future.set_exception(exc)
+                continue
+            result.details["queue_seconds"] = queue_seconds
+            with pool._lock:
+                pool.stats.completed += 1
+                pool.stats.queue_seconds.append(queue_seconds)
+                pool.stats.exec_seconds.append(result.details["exec_seconds"])
+            if pool.cost_model is not None:
+                pool.cost_model.observe(job.scenario_id, result.details["exec_seconds"])
+            job.future.set_result(result)
+
+    def _call(self, job: _Job) -> VerificationResult:
+        pool = self.pool
+        timeout = pool.limits.timeout
+        try:
+            self.conn.send((job.scenario_id, job.state))
+            ready = self.conn.poll(timeout)
+        except (OSError, EOFError):
+            ready = False
+            timeout = None
+        if not ready:
+            crashed = timeout is None or not self.process.is_alive()
+            with pool._lock:
+                if crashed:
+                    pool.stats.crashes += 1
+                else:
+                    pool.stats.timeouts += 1
+            self.respawn()
+            if crashed:
+                raise VerifierCrashed(f"worker crashed running {job.scenario_id}")
+            raise VerifierTimeout(
+                f"{job.scenario_id} exceeded the {pool.limits.timeout}s timeout"
+            )
+
+        try:
+            status, payload, exec_seconds, cpu_seconds, samples, recorded = self.conn.recv()
+        except (OSError, EOFError):
+            with pool._lock:
+                pool.stats.crashes += 1
+            # The pipe can close just before the process is reaped.
+            self.process.join(timeout=0.1)
+            pid, exitcode = self.process.pid, self.process.exitcode
+            self.respawn()
+            if exitcode is None:  # e.g. a fork-server worker, reaped by the server
+                raise VerifierCrashed(f"worker pid {pid} died running {job.scenario_id}")
+            raise VerifierCrashed(
+                f"worker crashed running {job.scenario_id} (exit code {exitcode})"
+            )
+        if samples:
+            pool.samples.merge(samples)
+        if recorded:
+            metrics.REGISTRY.merge(recorded)
+
+        if status == "limit":
+            with pool._lock:
+                pool.stats.limit_errors += 1
+            self.respawn()
+            raise VerifierLimitExceeded(f"{job.scenario_id}: {payload}")
+        if status == "error":
+            raise VerifierFailed(f"{job.scenario_id}: {payload}")
+
+        payload.details["exec_seconds"] = exec_seconds
+        payload.details["cpu_seconds"] = cpu_seconds
+        return payload
+
+
+class VerifierPool:
+    """Long-lived worker processes that run preloaded scenario verifiers.
+
+    `scenario_ids` restricts the preload (default: every scenario under
+    `base_path`); verifiers outside it are imported on first use.
+    `start_method` selects the multiprocessing context (`spawn`, `fork`,
+    `forkserver`; default: the platform default).
+
+    With `fork_server=True` a single helper process imports the verifiers
+    and loads the scenarios once, freezes the GC and forks every worker from
+    that image (see `pa_bench_sdk.forkserver`), so workers start in
+    milliseconds and share those pages copy-on-write. Passing `state=None`
+    verifies a scenario's stored state, which the fork server has preloaded.
+
+    `sample_interval` enables the workers' stack samplers; the merged
+    samples are available from `samples` at any time.
+
+    `cost_model` switches the job queue to longest-estimated-first.
+    """
+
+    def __init__(
+        self,
+        base_path: Union[str, Path] = "data",
+        workers: Optional[int] = None,
+        limits: Optional[PoolLimits] = None,
+        scenario_ids: Optional[Sequence[str]] = None,
+        start_method: Optional[str] = None,
+        startup_timeout: float = 60.0,
+        fork_server: bool = False,
+        sample_interval: Optional[float] = None,
+        cost_model: Optional[CostModel] = None,
+    ):
+        self.base_path = Path(base_path)
+        self.workers = workers or os.cpu_count() or 1
+        self.limits = limits or PoolLimits()
+        self.scenario_ids = list(scenario_ids) if scenario_ids is not None else None
+        self.startup_timeout = startup_timeout
+        self.stats = PoolStats()
+        self._context = multiprocessing.get_context(start_method)
+        self.cost_model = cost_model
+        if cost_model is not None:
+            self._jobs = CostQueue(cost_model, key=lambda job: job.scenario_id)
+        else:
+            self._jobs = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._workers: List[_Worker] = []
+        self._closed = False
+        self.sample_interval = sample_interval
+        self.samples = None
+        if sample_interval is not None:
+            from .sampling import SampleProfile
+
+            self.samples = SampleProfile(sample_interval)
+        self._fork_server = None
+        if fork_server:
+            from .forkserver import ForkServer
+
+            self._fork_server = ForkServer(
+                self.base_path,
+                self.scenario_ids,
+                self.limits,
+                self._context,
+                sample_interval,
+            )
+
+    def _launch(self):
+        if self._fork_server is not None:
+            return self._fork_server.fork(self.startup_timeout)
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(
+                child_conn,
+                str(self.base_path),
+                self.scenario_ids,
+                self.limits,
+                self.sample_interval,
+            ),
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        return process, parent_conn
+
+    def start(self) -> "VerifierPool":
+        """Spawn every worker and wait until each has preloaded its verifiers."""
+        if self._workers:
+            return self
+        if self._fork_server is not None:
+            self._fork_server.start(self.startup_timeout)
+        for slot in range(self.workers):
+            worker = _Worker(self, slot)
+            worker.spawn()
+            self._workers.append(worker)
+        for worker in self._workers:
+            worker.thread.start()
+        return self
+
+    def submit(
+        self, scenario_id: str, state: Optional[StateLike] = None
+    ) -> "Future[VerificationResult]":
+        if self._closed:
+            raise RuntimeError("VerifierPool is closed")
+        if not self._workers:
+            self.start()
+        future: Future = Future()
+        self._jobs.put(_Job(scenario_id, state, future, time.perf_counter()))
+        return future
+
+    def run(
+        self, scenario_id: str, state: Optional[StateLike] = None
+    ) -> VerificationResult:
+        return self.submit(scenario_id, state).result()
+
+    def map(
+        self, requests: Iterable[Tuple[str, Optional[StateLike]]]
+    ) -> List[VerificationResult]:
+        """Run every request and return results in order; the first failure raises."""
+        futures = [self.submit(scenario_id, state) for scenario_id, state in requests]
+        return [future.result() for future in futures]
+
+    def pids(self) -> List[int]:
+        return [worker.process.pid for worker in self._workers]
+
+    def memory(self) -> Dict[int, Dict[str, int]]:
+        """RSS and PSS (proportional set size) in bytes per worker pid."""
+        return worker_memory(self.pids())
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._workers:
+            self._jobs.put(None)
+        for worker in self._workers:
+            worker.thread.join()
+            worker.stop()
+        if self._fork_server is not None:
+            self._fork_server.close()
+
+    def __enter__(self) -> "VerifierPool":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
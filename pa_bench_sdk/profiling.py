@@ -0,0 +1,174 @@
+"""
+Per-stage profilers behind the CLI's `--profile` switch.
+
+A profiler is attached to `StageTimings` and wraps every stage:
+
+- `cprofile`: one `cProfile.Profile` per stage, written as `<stage>.pstats`
+  and as `<stage>.collapsed`. cProfile only records caller/callee pairs, so
+  the collapsed stacks follow each function's heaviest caller and are an
+  approximation of the true call paths.
+- `tracemalloc`: peak traced memory per stage plus the top allocation sites
+  that grew during the stage, written as `<stage>.tracemalloc.txt`.
+
+Stages that run concurrently (the overlapped verifier import) are profiled
+in their own thread by cProfile; tracemalloc peaks are process-wide.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import pstats
+import re
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+PROFILERS = ("cprofile", "tracemalloc")
+
+FuncKey = Tuple[str, int, str]
+
+
+def _slug(stage: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", stage).strip("_") or "stage"
+
+
+def _label(func: FuncKey) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name
+    return f"{name} ({Path(filename).name}:{line})"
+
+
+def collapsed_stacks(stats: pstats.Stats, max_depth: int = 64) -> List[str]:
+    """Approximate collapsed stacks (`a;b;c weight_us`) from a pstats table."""
+    table = stats.stats
+    lines = []
+    for func, (_, _, tottime, _, callers) in table.items():
+        if tottime <= 0:
+            continue
+        path = [func]
+        seen = {func}
+        current = callers
+        while current and len(path) < max_depth:
+            parent = max(current, key=lambda caller: current[caller][3])
+            if parent in seen:
+                break
+            path.append(parent)
+            seen.add(parent)
+            current = table.get(parent, (0, 0, 0, 0, {}))[4]
+        stack = ";".join(_label(frame) for frame in reversed(path))
+        lines.append(f"{stack} {int(tottime * 1_000_000)}")
+    return sorted(lines)
+
+
+class StageProfiler:
+    """Base class: no profiling, just the output directory bookkeeping."""
+
+    kind = "none"
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        self._counts: Dict[Tuple[str, str], int] = {}
+
+    def _path(self, stage: str, suffix: str) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = _slug(stage)
+        count = self._counts.get((name, suffix), 0)
+        self._counts[(name, suffix)] = count + 1
+        if count:
+            name = f"{name}.{count}"
+        return self.directory / f"{name}{suffix}"
+
+    def start(self, stage: str) -> Any:
+        return None
+
+    def stop(self, stage: str, token: Any) -> Dict[str, Any]:
+        return {}
+
+
+class CProfileProfiler(StageProfiler):
+    kind = "cprofile"
+
+    def start(self, stage: str) -> Optional[cProfile.Profile]:
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ allows one active cProfile per process; a stage
+            # overlapping another profiled stage is timed but not profiled.
+            return None
+        return profile
+
+    def stop(self, stage: str, token: Optional[cProfile.Profile]) -> Dict[str, Any]:
+        if token is None:
+            return {}
+        token.disable()
+        stats = pstats.Stats(token)
+        pstats_path = self._path(stage, ".pstats")
+        stats.dump_stats(pstats_path)
+        collapsed_path = self._path(stage, ".collapsed")
+        collapsed_path.write_text("\n".join(collapsed_stacks(stats)) + "\n")
+        return {"output": str(pstats_path), "calls": stats.total_calls}
+
+
+class TracemallocProfiler(StageProfiler):
+    kind = "tracemalloc"
+
+    def __init__(self, directory: Union[str, Path], top: int = 25):
+        super().__init__(directory)
+        self.top = top
+
+    def start(self, stage: str) -> tracemalloc.Snapshot:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(16)
+        tracemalloc.reset_peak()
+        return tracemalloc.take_snapshot()
+
+    def stop(self, stage: str, token: tracemalloc.Snapshot) -> Dict[str, Any]:
+        _, peak = tracemalloc.get_traced_memory()
+        growth = tracemalloc.take_snapshot().compare_to(token, "lineno")
+        path = self._path(stage, ".tracemalloc.txt")
+        lines = [f"stage: {stage}", f"peak traced bytes: {peak}", ""]
+        lines.extend(str(stat) for stat in growth[: self.top])
+        path.write_text("\n".join(lines) + "\n")
+        return {"output": str(path), "peak_bytes": peak}
+
+
+def make_profiler(kind: Optional[str], directory: Union[str, Path]) -> Optional[StageProfiler]:
+    if kind is None:
+        return None
+    if kind == "cprofile":
+        return CProfileProfiler(directory)
+    if kind == "tracemalloc":
+        return TracemallocProfiler(directory)
+    raise ValueError(f"Unknown profiler {kind!r}; expected one of {', '.join(PROFILERS)}")
+
+
+def format_summary(
+    stages: Iterable[Tuple[str, float]],
+    reports: Dict[str, List[Dict[str, Any]]],
+    total: float,
+) -> str:
+    """Render the end-of-command table of stage timings and profiler output."""
+    rows = [("stage", "wall ms", "share", "peak KiB", "output")]
+    for name, seconds in stages:
+        stage_reports = reports.get(name, [])
+        peak = max((report.get("peak_bytes", 0) for report in stage_reports), default=None)
+        outputs = ", ".join(report["output"] for report in stage_reports if "output" in report)
+        rows.append(
+            (
+                name,
+                f"{seconds * 1000:.1f}",
+                f"{seconds / total:.0%}" if total else "-",
+                f"{peak / 1024:.0f}" if peak else "-",
+                outputs or "-",
+            )
+        )
+    rows.append(("total", f"{total * 1000:.1f}", "100%", "-", "-"))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    rendered = []
+    for index, row in enumerate(rows):
+        rendered.append("  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip())
+        if index == 0:
+            rendered.append("  ".join("-" * width for width in widths))
+    return "\n".join(rendered)
@@ -0,0 +1,72 @@
+"""
+Projections of clone states onto the paths a verifier reads.
+
+Each scenario's `verifier.py` declares the state it reads as `STATE_PATHS`,
+dotted paths into the state `validation_function` receives:
+`"gocalendar.events"` is the `events` field of the Gocalendar clone,
+`"gomail"` the whole Gomail clone, and a path that does not start with a
+clone name (e.g. `"otherUsersEvents"`) a key at the root of the state.
+Segments past the clone field are accepted but keep the whole field.
+
+`Projection` turns those paths into what to fetch (`clones`, and `fields`
+per clone for `get_state?fields=...`) and trims a state down to them
+(`apply`). A verifier without `STATE_PATHS` gets no projection and sees the
+full state.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+CLONES = ("gomail", "gocalendar")
+
+
+class Projection:
+    """The parts of a state selected by `paths`."""
+
+    def __init__(self, paths: Iterable[str]):
+        self.paths = tuple(paths)
+        self._clones: Dict[str, Optional[Set[str]]] = {}
+        self._root: Set[str] = set()
+        for path in self.paths:
+            segments = path.split(".")
+            if not all(segments):
+                raise ValueError(f"Invalid state path: {path!r}")
+            head = segments[0]
+            if head not in CLONES:
+                self._root.add(head)
+            elif len(segments) == 1:
+                self._clones[head] = None
+            elif head not in self._clones or self._clones[head] is not None:
+                self._clones.setdefault(head, set()).add(segments[1])
+
+    def __repr__(self) -> str:
+        return f"Projection({list(self.paths)!r})"
+
+    @property
+    def clones(self) -> Tuple[str, ...]:
+        """The clones any path reads from."""
+        return tuple(clone for clone in CLONES if clone in self._clones)
+
+    def fields(self, clone: str) -> Optional[List[str]]:
+        """The top-level fields read from `clone`, or `None` for all of them."""
+        fields = self._clones.get(clone, set())
+        return sorted(fields) if fields is not None else None
+
+    def apply_clone(self, clone: str, state: Dict[str, Any]) -> Dict[str, Any]:
+        fields = self._clones.get(clone, set())
+        if fields is None:
+            return state
+        return {key: value for key, value in state.items() if key in fields}
+
+    def apply(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """`state` without the clones, fields and root keys no path reads."""
+        projected = {}
+        for key, value in state.items():
+            if key in self._clones:
+                projected[key] = (
+                    self.apply_clone(key, value) if isinstance(value, dict) else value
+                )
+            elif key in self._root:
+                projected[key] = value
+        return projected
@@ -0,0 +1,343 @@
+"""
+SQLite store for verification results.
+
+`ResultsStore` records one `results` row per verified state (run id, agent
+id, scenario id and type, record id, state hash, reward, pass/fail or error,
+and timings as JSON) plus one `checks` row per `TaskVerifier`. The database
+runs in WAL mode so readers (`pa-bench results ...`) never block a batch
+that is writing, and rows are buffered and written `batch_size` at a time in
+one transaction with `executemany`.
+
+Checks carry their result's `run_id` and `scenario_id`, so per-scenario and
+per-check aggregations are answered from the indexes without a join.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .scenario import ScenarioLoader
+from .verifier import VerificationResult
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    agent_id TEXT,
+    scenario_id TEXT,
+    scenario_type TEXT,
+    record_id TEXT,
+    state_hash TEXT,
+    passed INTEGER,
+    reward REAL,
+    message TEXT,
+    error TEXT,
+    timings TEXT,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS checks (
+    result_id INTEGER NOT NULL REFERENCES results(id),
+    run_id TEXT NOT NULL,
+    scenario_id TEXT,
+    name TEXT NOT NULL,
+    verdict INTEGER NOT NULL,
+    reason TEXT
+);
+CREATE INDEX IF NOT EXISTS results_by_scenario ON results(scenario_id, run_id, passed, reward);
+CREATE INDEX IF NOT EXISTS results_by_run ON results(run_id, agent_id);
+CREATE INDEX IF NOT EXISTS results_by_type ON results(scenario_type, run_id);
+CREATE INDEX IF NOT EXISTS results_by_state ON results(state_hash);
+CREATE INDEX IF NOT EXISTS checks_by_scenario ON checks(scenario_id, name, run_id, verdict);
+CREATE INDEX IF NOT EXISTS checks_by_result ON checks(result_id);
+"""
+
+_RESULT_COLUMNS = (
+    "id", "run_id", "agent_id", "scenario_id", "scenario_type", "record_id",
+    "state_hash", "passed", "reward", "message", "error", "timings", "created_at",
+)
+
+# Row keys that are stored in their own columns rather than in `timings`.
+_ROW_KEYS = {"index", "id", "scenario_id", "passed", "reward", "message", "checks", "error", "state_hash"}
+
+
+def new_run_id() -> str:
+    return time.strftime("%Y%m%dT%H%M%S") + "-" + uuid.uuid4().hex[:8]
+
+
+def state_hash(state: Dict[str, Any]) -> str:
+    """Stable digest of a state, independent of key order and formatting."""
+    canonical = json.dumps(state, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def hash_records(records: Iterable[Any]) -> Iterator[Any]:
+    """Fill in `state_hash` on `StateRecord`s that carry a state."""
+    for record in records:
+        if record.state is not None and record.state_hash is None:
+            record.state_hash = state_hash(record.state)
+        yield record
+
+
+def _timings(row: Dict[str, Any], timings: Optional[Dict[str, float]]) -> Optional[str]:
+    values = {
+        key: value
+        for key, value in row.items()
+        if key not in _ROW_KEYS and key.endswith("_seconds") and isinstance(value, (int, float))
+    }
+    if timings:
+        values.update(timings)
+    return json.dumps(values) if values else None
+
+
+class ResultsStore:
+    """Buffered writer and query helper for a results database."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        batch_size: int = 2000,
+        data_path: Optional[Union[str, Path]] = None,
+    ):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self._loader = ScenarioLoader(data_path) if data_path is not None else None
+        self._types: Dict[str, Optional[str]] = {}
+        self._pending: List[Tuple[Dict[str, Any], str, Optional[str], Optional[str]]] = []
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL keeps the database consistent on power loss with NORMAL; only
+        # the last transactions may be lost.
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=30000")
+        self._conn.executescript(SCHEMA)
+
+    def scenario_type(self, scenario_id: Optional[str]) -> Optional[str]:
+        if scenario_id is None or self._loader is None:
+            return None
+        if scenario_id not in self._types:
+            try:
+                self._types[scenario_id] = self._loader.task(scenario_id).get("type")
+            except (OSError, ValueError):
+                self._types[scenario_id] = None
+        return self._types[scenario_id]
+
+    def add_row(
+        self,
+        row: Dict[str, Any],
+        run_id: str,
+        agent_id: Optional[str] = None,
+        timings: Optional[Dict[str, float]] = None,
+    ) -> None:
+        """Buffer one result row (`VerificationResult.to_dict()` or a stream row)."""
+        self._pending.append((row, run_id, agent_id, _timings(row, timings)))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def add(
+        self,
+        result: VerificationResult,
+        run_id: str,
+        agent_id: Optional[str] = None,
+        record_id: Any = None,
+        state_digest: Optional[str] = None,
+        timings: Optional[Dict[str, float]] = None,
+    ) -> None:
+        row = result.to_dict()
+        row["id"] = record_id
+        row["state_hash"] = state_digest
+        self.add_row(row, run_id, agent_id, timings)
+
+    def sync(self) -> None:
+        """Commit buffered rows and make every committed row durable.
+
+        With `synchronous=NORMAL` a commit only reaches the WAL; SQLite
+        fsyncs the WAL before a checkpoint.
+        """
+        self.flush()
+        self._conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        created = time.time()
+        conn = self._conn
+        # BEGIN IMMEDIATE takes the write lock up front, so the ids assigned
+        # below cannot collide with another writer's.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            next_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM results").fetchone()[0]
+            results = []
+            checks = []
+            for offset, (row, run_id, agent_id, timings) in enumerate(pending):
+                result_id = next_id + offset
+                scenario_id = row.get("scenario_id")
+                error = row.get("error")
+                record_id = row.get("id")
+                results.append(
+                    (
+                        result_id,
+                        run_id,
+                        agent_id,
+                        scenario_id,
+                        self.scenario_type(scenario_id),
+                        None if record_id is None else str(record_id),
+                        row.get("state_hash"),
+                        None if error is not None else int(bool(row.get("passed"))),
+                        row.get("reward"),
+                        row.get("message"),
+                        error,
+                        timings,
+                        created,
+                    )
+                )
+                for check in row.get("checks") or ():
+                    checks.append(
+                        (
+                            result_id,
+                            run_id,
+                            scenario_id,
+                            check["name"],
+                            int(bool(check["verdict"])),
+                            check.get("reason"),
+                        )
+                    )
+            conn.executemany(
+                f"INSERT INTO results ({', '.join(_RESULT_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(_RESULT_COLUMNS))})",
+                results,
+            )
+            conn.executemany(
+                "INSERT INTO checks (result_id, run_id, scenario_id, name, verdict, reason) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                checks,
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def query(
+        self,
+        run_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        scenario_id: Optional[str] = None,
+        check: Optional[str] = None,
+        failed: bool = False,
+        limit: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Result rows matching every given filter, with their checks.
+
+        `check` keeps results whose check of that name failed.
+        """
+        clauses, params = self._filters(run_id, agent_id, scenario_id)
+        if failed:
+            clauses.append("(r.passed = 0 OR r.error IS NOT NULL)")
+        if check is not None:
+            clauses.append(
+                "r.id IN (SELECT result_id FROM checks WHERE name = ? AND verdict = 0"
+                + (" AND scenario_id = ?" if scenario_id is not None else "")
+                + ")"
+            )
+            params.append(check)
+            if scenario_id is not None:
+                params.append(scenario_id)
+        sql = "SELECT r.* FROM results r"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY r.id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        for row in self._conn.execute(sql, params):
+            record = dict(row)
+            record["passed"] = None if record["passed"] is None else bool(record["passed"])
+            record["timings"] = json.loads(record["timings"]) if record["timings"] else {}
+            record["checks"] = [
+                {"name": name, "verdict": bool(verdict), "reason": reason}
+                for name, verdict, reason in self._conn.execute(
+                    "SELECT name, verdict, reason FROM checks WHERE result_id = ?", (record["id"],)
+                )
+            ]
+            yield record
+
+    def summary(
+        self,
+        by: str = "scenario",
+        run_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        scenario_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Aggregate pass rates and rewards by `scenario`, `type`, `run` or `check`."""
+        if by == "check":
+            clauses, params = self._filters(run_id, None, scenario_id, alias="c")
+            if agent_id is not None:
+                clauses.append("c.result_id IN (SELECT id FROM results WHERE agent_id = ?)")
+                params.append(agent_id)
+            sql = (
+                "SELECT c.scenario_id, c.name AS check_name, COUNT(*) AS checks, "
+                "SUM(c.verdict) AS passed, AVG(c.verdict) AS pass_rate FROM checks c"
+            )
+            if clauses:
+                sql += " WHERE " + " AND ".join(clauses)
+            sql += " GROUP BY c.scenario_id, c.name ORDER BY c.scenario_id, c.name"
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+        columns = {"scenario": "r.scenario_id", "type": "r.scenario_type", "run": "r.run_id"}
+        if by not in columns:
+            raise ValueError(f"Cannot summarize by {by!r}; expected scenario, type, run or check")
+        key = columns[by]
+        clauses, params = self._filters(run_id, agent_id, scenario_id)
+        sql = (
+            f"SELECT {key} AS {by}, COUNT(*) AS results, "
+            "SUM(r.error IS NOT NULL) AS errors, SUM(r.passed) AS passed, "
+            "AVG(r.passed) AS pass_rate, AVG(r.reward) AS mean_reward FROM results r"
+        )
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" GROUP BY {key} ORDER BY {key}"
+        return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        """Run a read-only SQL statement against the store."""
+        self._conn.execute("PRAGMA query_only=ON")
+        try:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+        finally:
+            self._conn.execute("PRAGMA query_only=OFF")
+
+    @staticmethod
+    def _filters(
+        run_id: Optional[str],
+        agent_id: Optional[str],
+        scenario_id: Optional[str],
+        alias: str = "r",
+    ) -> Tuple[List[str], List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        for column, value in (("run_id", run_id), ("agent_id", agent_id), ("scenario_id", scenario_id)):
+            if value is not None:
+                clauses.append(f"{alias}.{column} = ?")
+                params.append(value)
+        return clauses, params
+
+    def close(self) -> None:
+        if self._conn is None:
+            return
+        self.flush()
+        self._conn.close()
+        self._conn = None
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,219 @@
+"""
+Low-overhead statistical stack sampler for batch and serve runs.
+
+`StackSampler` records the Python stack of labelled threads at a fixed
+interval instead of tracing every call, so it can stay enabled in
+`verify-all` and `serve`. Code that verifies a scenario wraps the call in
+`sampler.labelled(scenario_id)`; only labelled threads are sampled, and
+their stacks are cut at the function that entered the label.
+
+Two modes:
+
+- `signal`: `ITIMER_PROF` delivers `SIGPROF` every `interval` seconds of
+  process CPU time and the handler records the main thread's stack. This is
+  the cheapest mode and what pool workers use, but it only sees the main
+  thread and must be started from it.
+- `thread`: a daemon thread wakes every `interval` seconds of wall time and
+  reads every labelled thread's stack from `sys._current_frames()`. Used for
+  in-process verification in worker threads (`serve` without `--workers`).
+
+`SampleProfile` merges drained samples from any number of samplers and
+processes, keyed by scenario, verifier function and stack, and writes them
+as flamegraph-compatible collapsed stacks (`scenario;frame;...;frame count`).
+"""
+
+from __future__ import annotations
+
+import signal
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Dict, List, Optional, Tuple, Union
+
+from .profiling import _label
+
+DEFAULT_INTERVAL = 0.01
+SAMPLER_MODES = ("signal", "thread")
+
+# (scenario label, verifier function, collapsed frames) -> sample count
+SampleKey = Tuple[str, str, str]
+
+
+def _frame_label(code: CodeType) -> str:
+    name = getattr(code, "co_qualname", code.co_name)
+    return _label((code.co_filename, code.co_firstlineno, name))
+
+
+def _verifier_label(codes: Tuple[CodeType, ...], scenario: str) -> str:
+    """Innermost function defined in the scenario's own folder, if any."""
+    for code in reversed(codes):
+        if Path(code.co_filename).parent.name == scenario:
+            return getattr(code, "co_qualname", code.co_name)
+    return "-"
+
+
+Label = Tuple[str, FrameType]
+
+
+class _Labelled:
+    # A plain class rather than @contextmanager: it wraps every verifier call.
+    __slots__ = ("_labels", "_label", "_ident")
+
+    def __init__(self, labels: Dict[int, Label], label: str):
+        self._labels = labels
+        self._label = label
+
+    def __enter__(self) -> None:
+        self._ident = threading.get_ident()
+        self._labels[self._ident] = (self._label, sys._getframe(1))
+
+    def __exit__(self, *exc_info) -> None:
+        self._labels.pop(self._ident, None)
+
+
+class StackSampler:
+    """Periodically samples the stacks of threads inside `labelled` blocks."""
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_INTERVAL,
+        mode: str = "signal",
+        max_depth: int = 128,
+    ):
+        if mode not in SAMPLER_MODES:
+            raise ValueError(f"Unknown sampler mode {mode!r}; expected one of {', '.join(SAMPLER_MODES)}")
+        self.interval = interval
+        self.mode = mode
+        self.max_depth = max_depth
+        self.samples: Counter = Counter()
+        self._labels: Dict[int, Label] = {}
+        self._main = threading.main_thread().ident
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        # Guards `samples` against the sampler thread; the signal handler runs
+        # between bytecodes of the main thread and must not take it.
+        self._lock = threading.Lock()
+        self._previous_handler = None
+
+    def labelled(self, label: str) -> "_Labelled":
+        """Context manager marking the current thread as verifying `label`."""
+        return _Labelled(self._labels, label)
+
+    def _record(self, label: Label, frame: Optional[FrameType]) -> None:
+        name, root = label
+        codes = []
+        while frame is not None and len(codes) < self.max_depth:
+            codes.append(frame.f_code)
+            if frame is root:
+                break
+            frame = frame.f_back
+        codes.reverse()
+        self.samples[(name, tuple(codes))] += 1
+
+    def _on_signal(self, signum, frame) -> None:
+        label = self._labels.get(self._main)
+        if label is not None:
+            self._record(label, frame)
+
+    def _run_thread(self) -> None:
+        own = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            if not self._labels:
+                continue
+            frames = sys._current_frames()
+            with self._lock:
+                for ident, label in list(self._labels.items()):
+                    if ident != own and ident in frames:
+                        self._record(label, frames[ident])
+
+    def start(self) -> "StackSampler":
+        if self.mode == "signal":
+            if threading.get_ident() != self._main:
+                raise RuntimeError("signal sampling must be started from the main thread")
+            self._previous_handler = signal.signal(signal.SIGPROF, self._on_signal)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        else:
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run_thread, name="pa-bench-sampler", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self.mode == "signal":
+            if self._previous_handler is not None:
+                signal.setitimer(signal.ITIMER_PROF, 0, 0)
+                signal.signal(signal.SIGPROF, self._previous_handler)
+                self._previous_handler = None
+        elif self._thread is not None:
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
+
+    def drain(self) -> Dict[SampleKey, int]:
+        """Return the samples taken so far as picklable keys and reset them."""
+        with self._lock:
+            samples, self.samples = self.samples, Counter()
+        drained: Dict[SampleKey, int] = {}
+        for (label, codes), count in samples.items():
+            key = (label, _verifier_label(codes, label), ";".join(_frame_label(code) for code in codes))
+            drained[key] = drained.get(key, 0) + count
+        return drained
+
+    def __enter__(self) -> "StackSampler":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+class SampleProfile:
+    """Samples merged across samplers and processes."""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def merge(self, samples: Dict[SampleKey, int]) -> None:
+        with self._lock:
+            self.samples.update(samples)
+
+    def collect(self, sampler: StackSampler) -> None:
+        self.merge(sampler.drain())
+
+    def reset(self) -> None:
+        with self._lock:
+            self.samples.clear()
+
+    def collapsed(self) -> List[str]:
+        """Flamegraph input: one `scenario;frames count` line per stack."""
+        with self._lock:
+            items = list(self.samples.items())
+        lines: Counter = Counter()
+        for (scenario, _, stack), count in items:
+            lines[f"{scenario};{stack}" if stack else scenario] += count
+        return [f"{stack} {count}" for stack, count in sorted(lines.items())]
+
+    def write(self, path: Union[str, Path]) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("".join(line + "\n" for line in self.collapsed()))
+        return path
+
+    def summary(self) -> Dict[str, Dict[str, object]]:
+        """Per-scenario sample counts, estimated CPU seconds and per-verifier split."""
+        with self._lock:
+            items = list(self.samples.items())
+        scenarios: Dict[str, Dict[str, object]] = {}
+        for (scenario, verifier, _), count in items:
+            entry = scenarios.setdefault(scenario, {"samples": 0, "verifiers": Counter()})
+            entry["samples"] += count
+            entry["verifiers"][verifier] += count
+        for entry in scenarios.values():
+            entry["seconds"] = entry["samples"] * self.interval
+            entry["verifiers"] = dict(entry["verifiers"].most_common())
+        return scenarios
@@ -4,6 +4,12 @@ Scenario loading helpers for PA Bench.
 Scenarios already ship with Gmail/Calendar clone states. The loader simply
 reads the stored JSON blobs, validates the expected structure, and exposes
 metadata alongside the two world states.
+
+`load` keeps everything by default (the "full" profile, which `set_state`
+needs). The "slim" profile drops the sections that only the clones' UIs
+use (`SLIM_DROPPED`, plus the users' avatars), and a `Projection` keeps
+only the paths a verifier reads; either is enough to verify a stored state
+and takes less memory to hold and less time to pickle to pool workers.
 """
 
 from __future__ import annotations
@@ -11,10 +17,29 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Union
+
+from . import metrics, tracing
+from .projection import Projection
+
+if TYPE_CHECKING:
+    from .shared import SharedScenarioStore
 
 
 ScenarioId = str
+Profile = Union[str, Projection]
+
+SLIM_DROPPED = {
+    "gomail": ("contacts", "labels"),
+    "gocalendar": (
+        "viewState",
+        "calendars",
+        "tasks",
+        "appointmentSchedules",
+        "meetWithParticipants",
+        "userDirectory",
+    ),
+}
 
 
 @dataclass
@@ -31,6 +56,48 @@ class ScenarioDefinition:
     calendar_state: Dict[str, Any]
     raw_data: Dict[str, Any]
     path: Path
+    profile: str = "full"
+
+    def clone_payloads(self) -> Dict[str, Dict[str, Any]]:
+        """`set_state` payloads per clone, stamped with the scenario's `today`."""
+        if self.profile != "full":
+            raise ValueError(
+                f"Scenario {self.metadata.scenario_id!r} was loaded with the "
+                f"{self.profile!r} profile; set_state needs the full one"
+            )
+        gomail_payload = dict(self.gmail_state)
+        gocalendar_payload = dict(self.calendar_state)
+        if self.metadata.today:
+            gomail_payload["today"] = self.metadata.today
+            gocalendar_payload["today"] = self.metadata.today
+        return {"gomail": gomail_payload, "gocalendar": gocalendar_payload}
+
+
+def _slim_clone(clone: str, state: Dict[str, Any]) -> Dict[str, Any]:
+    slim = {key: value for key, value in state.items() if key not in SLIM_DROPPED[clone]}
+    if isinstance(slim.get("user"), dict):
+        slim["user"] = {key: value for key, value in slim["user"].items() if key != "avatar"}
+    return slim
+
+
+def _trim(scenario: ScenarioDefinition, profile: Profile) -> ScenarioDefinition:
+    if isinstance(profile, Projection):
+        scenario.gmail_state = profile.apply_clone("gomail", scenario.gmail_state)
+        scenario.calendar_state = profile.apply_clone("gocalendar", scenario.calendar_state)
+        scenario.profile = "projection"
+    elif profile == "slim":
+        scenario.gmail_state = _slim_clone("gomail", scenario.gmail_state)
+        scenario.calendar_state = _slim_clone("gocalendar", scenario.calendar_state)
+        scenario.profile = "slim"
+    elif profile != "full":
+        raise ValueError(f"Unknown load profile {profile!r}; expected 'full' or 'slim'")
+    if scenario.profile != "full":
+        scenario.raw_data = {
+            **scenario.raw_data,
+            "gomail": scenario.gmail_state,
+            "gocalendar": scenario.calendar_state,
+        }
+    return scenario
 
 
 class ScenarioLoader:
@@ -39,13 +106,42 @@ class ScenarioLoader:
     def __init__(self, base_path: Union[str, Path] = "data"):
         self.base_path = Path(base_path)
 
-    def load(self, scenario_id: ScenarioId) -> ScenarioDefinition:
+    def locate(self, scenario_id: ScenarioId) -> Path:
+        """Return the scenario folder without reading any of its files."""
         scenario_path = self.base_path / scenario_id
 
         if not scenario_path.exists():
             raise FileNotFoundError(
                 f"Scenario '{scenario_id}' not found at {scenario_path}"
             )
+        return scenario_path
+
+    def task(self, scenario_id: ScenarioId) -> Dict[str, Any]:
+        """Read only the scenario's `task.json` (type, description, today)."""
+        with open(self.locate(scenario_id) / "task.json", encoding="utf-8") as f:
+            return json.load(f)
+
+    def load(self, scenario_id: ScenarioId, profile: Profile = "full") -> ScenarioDefinition:
+        """Read a scenario, keeping the clone state `profile` selects."""
+        with tracing.span("scenario.load", scenario_id=scenario_id) as span:
+            try:
+                scenario = _trim(self._load(scenario_id), profile)
+            except Exception:
+                metrics.SCENARIO_LOADS.labels(scenario_id, "error").inc()
+                raise
+            metrics.SCENARIO_LOADS.labels(scenario_id, "ok").inc()
+            if span.recording:
+                span.set_attributes(
+                    {
+                        "data_bytes": (scenario.path / "data.json").stat().st_size,
+                        "emails": len(scenario.gmail_state.get("emails") or ()),
+                        "events": len(scenario.calendar_state.get("events") or ()),
+                    }
+                )
+            return scenario
+
+    def _load(self, scenario_id: ScenarioId) -> ScenarioDefinition:
+        scenario_path = self.locate(scenario_id)
 
         data_path = scenario_path / "data.json"
         task_path = scenario_path / "task.json"
@@ -86,6 +182,27 @@ class ScenarioLoader:
             path=scenario_path,
         )
 
+    def publish_shared(
+        self,
+        scenario_ids: Optional[Iterable[ScenarioId]] = None,
+        store: Optional["SharedScenarioStore"] = None,
+    ) -> "SharedScenarioStore":
+        """Load scenarios and publish their clone states to shared memory.
+
+        Workers receive the store's `SharedStateHandle`s instead of the
+        states; see `pa_bench_sdk.shared`.
+        """
+        from .shared import SharedScenarioStore
+
+        store = store if store is not None else SharedScenarioStore()
+        for scenario_id in scenario_ids if scenario_ids is not None else self.list_scenarios():
+            scenario = self.load(scenario_id)
+            store.publish(
+                scenario_id,
+                {"gomail": scenario.gmail_state, "gocalendar": scenario.calendar_state},
+            )
+        return store
+
     def list_scenarios(self) -> List[ScenarioId]:
         if not self.base_path.exists():
             return []
@@ -0,0 +1,108 @@
+"""
+Cost-aware scheduling for batch verification.
+
+`CostModel` learns each scenario's verifier cost from observed
+`exec_seconds` (an exponentially weighted moving average) and can be saved
+between runs. `CostQueue` is a drop-in for the pool's job queue that hands
+out the job with the highest estimated cost first, in submission order
+among equal estimates: running the long verifiers first keeps a batch from
+ending with one worker busy on an expensive scenario while the rest idle.
+Scenarios without observations are estimated at the mean of the known
+ones, so an untrained model schedules in plain FIFO order.
+
+The local `VerifierPool` shares one queue between its workers, so a free
+worker always takes the next job. The distributed `Coordinator` leases
+batches to each worker, and there an idle worker steals the most recently
+leased tasks from the worker with the largest estimated backlog (see
+`pa_bench_sdk.distributed`).
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import json
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, TypeVar, Union
+
+SCHEDULES = ("fifo", "longest")
+
+T = TypeVar("T")
+
+
+class CostModel:
+    """Per-scenario verifier cost estimates in seconds."""
+
+    def __init__(self, alpha: float = 0.3, costs: Optional[Dict[str, float]] = None):
+        self.alpha = alpha
+        self.costs: Dict[str, float] = dict(costs or {})
+        self._lock = threading.Lock()
+
+    def estimate(self, scenario_id: Optional[str]) -> float:
+        cost = self.costs.get(scenario_id)
+        if cost is not None:
+            return cost
+        if not self.costs:
+            return 0.0
+        return sum(self.costs.values()) / len(self.costs)
+
+    def observe(self, scenario_id: Optional[str], seconds: float) -> None:
+        if scenario_id is None:
+            return
+        with self._lock:
+            previous = self.costs.get(scenario_id)
+            if previous is None:
+                self.costs[scenario_id] = seconds
+            else:
+                self.costs[scenario_id] = previous + self.alpha * (seconds - previous)
+
+    def observe_result(self, scenario_id: Optional[str], result: Any) -> None:
+        """Learn from a `VerificationResult` carrying `exec_seconds`."""
+        seconds = (getattr(result, "details", None) or {}).get("exec_seconds")
+        if isinstance(seconds, (int, float)):
+            self.observe(scenario_id, seconds)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], alpha: float = 0.3) -> "CostModel":
+        path = Path(path)
+        if not path.exists():
+            return cls(alpha)
+        return cls(alpha, json.loads(path.read_text()))
+
+    def save(self, path: Union[str, Path]) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            costs = dict(sorted(self.costs.items()))
+        path.write_text(json.dumps(costs, indent=2) + "\n")
+
+
+class CostQueue(Generic[T]):
+    """Blocking queue returning the most expensive item first.
+
+    `key(item)` gives the item's scenario id; `None` items (the pool's stop
+    sentinels) sort after every job.
+    """
+
+    def __init__(self, model: CostModel, key: Callable[[T], Optional[str]]):
+        self.model = model
+        self.key = key
+        self._heap: List[Tuple[float, int, Optional[T]]] = []
+        self._counter = itertools.count()
+        self._ready = threading.Condition()
+
+    def put(self, item: Optional[T]) -> None:
+        priority = float("inf") if item is None else -self.model.estimate(self.key(item))
+        with self._ready:
+            heapq.heappush(self._heap, (priority, next(self._counter), item))
+            self._ready.notify()
+
+    def get(self) -> Optional[T]:
+        with self._ready:
+            while not self._heap:
+                self._ready.wait()
+            return heapq.heappop(self._heap)[2]
+
+    def __len__(self) -> int:
+        return len(self._heap)
@@ -0,0 +1,284 @@
+"""
+Long-running verification service behind `pa-bench serve`.
+
+Keeps scenarios, imported verifiers and one pooled `WorldsClient` session
+warm across requests, so an agent loop pays for the interpreter, imports
+and TCP/TLS setup once instead of per `pa-bench verify` call.
+
+Routes:
+
+- `GET /scenarios`: scenario ids and whether each is cached.
+- `POST /load` `{"scenario_id": ...}`: push a scenario's states to the clones.
+- `POST /verify` `{"scenario_id": ..., "state"?: {...}}`: verify the given
+  state, or fetch the current one from the clones; returns
+  `VerificationResult.to_dict()` plus per-stage `timings`.
+- `GET /profile`: collapsed verifier stacks from the sampling profiler
+  (`?format=summary` for per-scenario totals, `?reset=1` to start over);
+  404 unless the service runs with `sample_interval`.
+- `GET /metrics`: `pa_bench_sdk.metrics.REGISTRY` in the Prometheus text
+  format.
+
+`gomail_url`/`gocalendar_url` in a request body override the instance URLs
+resolved at first use. Verification runs off the event loop, in a thread
+pool or, with `workers > 0`, in a `VerifierPool` of warm processes. A
+`hedge` (`adaptive.Hedger`) hedges slow clone state fetches.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import aiohttp
+from aiohttp import web
+
+from . import metrics
+from .adaptive import Hedger
+from .pool import VerifierPool, VerifierPoolError
+from .sampling import SampleProfile, StackSampler
+from .scenario import ScenarioDefinition, ScenarioLoader
+from .timing import StageTimings
+from .verifier import VerificationResult, VerifierRunner
+from .worlds import InstanceEndpoints, WorldsClient, resolve_instance_urls
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@dataclass
+class ServeOptions:
+    host: str = "127.0.0.1"
+    port: int = 8787
+    unix_socket: Optional[Path] = None
+    preload: bool = False
+    sample_profile: Optional[Path] = None
+
+
+class VerificationService:
+    """Warm caches and handlers shared by every request of one server."""
+
+    def __init__(
+        self,
+        data_path: Union[str, Path] = "data",
+        workers: int = 0,
+        threads: Optional[int] = None,
+        gomail_url: Optional[str] = None,
+        gocalendar_url: Optional[str] = None,
+        env_file: Optional[Path] = None,
+        worlds_base_url: Optional[str] = None,
+        sample_interval: Optional[float] = None,
+        hedge: Optional[Hedger] = None,
+    ):
+        self.loader = ScenarioLoader(data_path)
+        self.runner = VerifierRunner(data_path)
+        self.client = WorldsClient(hedge=hedge)
+        self.pool = None
+        self.sampler: Optional[StackSampler] = None
+        self.samples: Optional[SampleProfile] = None
+        if workers:
+            self.pool = VerifierPool(data_path, workers=workers, sample_interval=sample_interval)
+            self.samples = self.pool.samples
+        elif sample_interval is not None:
+            # Verifiers run in executor threads, out of reach of SIGPROF.
+            self.sampler = StackSampler(sample_interval, mode="thread")
+            self.samples = SampleProfile(sample_interval)
+        self._executor = ThreadPoolExecutor(
+            max_workers=threads, thread_name_prefix="pa-bench-verify"
+        )
+        self._scenarios: Dict[str, ScenarioDefinition] = {}
+        self._endpoint_args = {
+            "gmail_url": gomail_url,
+            "calendar_url": gocalendar_url,
+            "env_path": env_file,
+            "base_url": worlds_base_url,
+        }
+        self._endpoints: Optional[InstanceEndpoints] = None
+        self._endpoints_lock = asyncio.Lock()
+
+    async def start(self, preload: bool = False) -> None:
+        await self.client.open()
+        if self.sampler is not None:
+            self.sampler.start()
+        loop = asyncio.get_running_loop()
+        if self.pool is not None:
+            await loop.run_in_executor(self._executor, self.pool.start)
+        if preload:
+            await loop.run_in_executor(self._executor, self.preload)
+
+    async def close(self) -> None:
+        await self.client.close()
+        if self.sampler is not None:
+            self.sampler.stop()
+        if self.pool is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.pool.close)
+        self._executor.shutdown(wait=False)
+
+    def preload(self) -> None:
+        """Load every scenario and import every verifier up front."""
+        for scenario_id in self.loader.list_scenarios():
+            scenario = self.scenario(scenario_id)
+            self.runner.load_validation_function(scenario.path / "verifier.py", scenario_id)
+
+    def scenario(self, scenario_id: str) -> ScenarioDefinition:
+        scenario = self._scenarios.get(scenario_id)
+        if scenario is None:
+            scenario = self._scenarios[scenario_id] = self.loader.load(scenario_id)
+        return scenario
+
+    async def endpoints(self, body: Dict[str, Any]) -> InstanceEndpoints:
+        if body.get("gomail_url") and body.get("gocalendar_url"):
+            return InstanceEndpoints(body["gomail_url"], body["gocalendar_url"])
+        async with self._endpoints_lock:
+            if self._endpoints is None:
+                self._endpoints = await resolve_instance_urls(**self._endpoint_args)
+        return self._endpoints
+
+    async def load(self, scenario_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        timings = StageTimings()
+        with timings.stage("scenario"):
+            scenario = await asyncio.get_running_loop().run_in_executor(
+                self._executor, self.scenario, scenario_id
+            )
+        with timings.stage("resolve"):
+            endpoints = await self.endpoints(body)
+        payloads = scenario.clone_payloads()
+        with timings.stage("set_state"):
+            await self.client.set_states(
+                endpoints,
+                gmail_state=payloads["gomail"],
+                calendar_state=payloads["gocalendar"],
+            )
+        return {
+            "scenario_id": scenario_id,
+            **endpoints.as_mapping(),
+            "timings": timings.as_dict(),
+        }
+
+    async def verify(
+        self,
+        scenario_id: str,
+        body: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        timings = StageTimings()
+        self.loader.locate(scenario_id)
+        state = body.get("state")
+        projection = self.runner.projection(scenario_id)
+        if state is None:
+            with timings.stage("resolve"):
+                endpoints = await self.endpoints(body)
+            with timings.stage("fetch"):
+                state = await self.client.get_states(endpoints, projection)
+        elif projection is not None:
+            # Less to pickle to a pool worker.
+            state = projection.apply(state)
+        with timings.stage("verify"):
+            result = await self._run(scenario_id, state)
+        payload = result.to_dict()
+        payload["timings"] = timings.as_dict()
+        return payload
+
+    async def _run(self, scenario_id: str, state: Dict[str, Any]) -> VerificationResult:
+        if self.pool is not None:
+            return await asyncio.wrap_future(self.pool.submit(scenario_id, state))
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._run_in_thread, scenario_id, state
+        )
+
+    def _run_in_thread(self, scenario_id: str, state: Dict[str, Any]) -> VerificationResult:
+        if self.sampler is None:
+            return self.runner.run(scenario_id, state)
+        with self.sampler.labelled(scenario_id):
+            return self.runner.run(scenario_id, state)
+
+    def profile(self) -> Optional[SampleProfile]:
+        """Samples collected so far, or `None` when sampling is off."""
+        if self.sampler is not None:
+            self.samples.collect(self.sampler)
+        return self.samples
+
+    def app(self) -> web.Application:
+        app = web.Application(client_max_size=256 * 1024 ** 2)
+        app.router.add_get("/scenarios", self._handle_scenarios)
+        app.router.add_post("/load", self._handle_load)
+        app.router.add_post("/verify", self._handle_verify)
+        app.router.add_get("/profile", self._handle_profile)
+        app.router.add_get("/metrics", self._handle_metrics)
+        return app
+
+    async def _handle_scenarios(self, request: web.Request) -> web.Response:
+        scenarios = [
+            {"scenario_id": scenario_id, "loaded": scenario_id in self._scenarios}
+            for scenario_id in self.loader.list_scenarios()
+        ]
+        return web.json_response({"scenarios": scenarios})
+
+    async def _handle_profile(self, request: web.Request) -> web.Response:
+        profile = self.profile()
+        if profile is None:
+            return _error(404, "Sampling is off; start the server with --sample-profile")
+        if request.query.get("format") == "summary":
+            response = web.json_response(
+                {"interval": profile.interval, "scenarios": profile.summary()}
+            )
+        else:
+            response = web.Response(text="".join(line + "\n" for line in profile.collapsed()))
+        if request.query.get("reset") == "1":
+            profile.reset()
+        return response
+
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(
+            body=metrics.REGISTRY.render_prometheus().encode("utf-8"),
+            headers={"Content-Type": PROMETHEUS_CONTENT_TYPE},
+        )
+
+    async def _handle_load(self, request: web.Request) -> web.Response:
+        return await self._dispatch(request, self.load)
+
+    async def _handle_verify(self, request: web.Request) -> web.Response:
+        return await self._dispatch(request, self.verify)
+
+    async def _dispatch(self, request: web.Request, handler) -> web.Response:
+        try:
+            body = await request.json()
+        except ValueError:
+            return _error(400, "Request body must be a JSON object")
+        if not isinstance(body, dict) or not isinstance(body.get("scenario_id"), str):
+            return _error(400, "Request body must include a `scenario_id` string")
+        try:
+            return web.json_response(await handler(body["scenario_id"], body))
+        except FileNotFoundError as exc:
+            return _error(404, str(exc))
+        except VerifierPoolError as exc:
+            return _error(500, str(exc))
+        except (aiohttp.ClientError, RuntimeError) as exc:
+            return _error(502, str(exc))
+        except EnvironmentError as exc:
+            return _error(503, str(exc))
+
+
+def _error(status: int, message: str) -> web.Response:
+    return web.json_response({"error": message}, status=status)
+
+
+def serve(service: VerificationService, options: ServeOptions) -> None:
+    """Run the service until interrupted."""
+
+    async def on_startup(app: web.Application) -> None:
+        await service.start(preload=options.preload)
+
+    async def on_cleanup(app: web.Application) -> None:
+        await service.close()
+        profile = service.profile()
+        if profile is not None and options.sample_profile is not None:
+            profile.write(options.sample_profile)
+
+    app = service.app()
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    if options.unix_socket is not None:
+        web.run_app(app, path=str(options.unix_socket))
+    else:
+        web.run_app(app, host=options.host, port=options.port)
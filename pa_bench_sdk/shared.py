@@ -0,0 +1,236 @@
+"""
+Scenario states published into `multiprocessing.shared_memory`.
+
+A published state is laid out as one segment: a small pickled index of the
+top-level mappings followed by the records. Mappings are kept in the index
+down to `MAX_DEPTH`, lists of records get an offset table so each record can
+be decoded on its own, and every other value is stored as one pickle blob.
+
+Handing a scenario to another process only transfers a `SharedStateHandle`
+(segment name and size), independent of the scenario's size. Workers call
+`attach_state` and read through `SharedMapping`/`SharedSequence`, read-only
+views that decode records from the segment on access, so N workers share
+one copy of the data. `AttachedState.materialize()` trades that back for
+plain dicts when a worker re-reads the same state many times.
+"""
+
+from __future__ import annotations
+
+import pickle
+import struct
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+MAGIC = b"PABSHM01"
+MAX_DEPTH = 3
+
+_HEADER = struct.Struct("<8sQ")
+_SPAN = struct.Struct("<QQ")
+
+Node = Tuple[Any, ...]
+
+
+@dataclass(frozen=True)
+class SharedStateHandle:
+    """Picklable reference to a published state segment."""
+
+    name: str
+    size: int
+    scenario_id: Optional[str] = None
+
+
+def _encode(value: Any, depth: int, data: bytearray) -> Node:
+    if isinstance(value, dict) and depth < MAX_DEPTH:
+        return ("d", {key: _encode(item, depth + 1, data) for key, item in value.items()})
+    if isinstance(value, list) and value and all(isinstance(item, dict) for item in value):
+        spans = []
+        for item in value:
+            start = len(data)
+            data += pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL)
+            spans.append((start, len(data)))
+        data += b"\0" * (-len(data) % 8)
+        table = len(data)
+        for span in spans:
+            data += _SPAN.pack(*span)
+        return ("l", table, len(spans))
+    start = len(data)
+    data += pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    return ("v", start, len(data))
+
+
+def _decode(buffer: memoryview, base: int, node: Node) -> Any:
+    kind = node[0]
+    if kind == "d":
+        return SharedMapping(buffer, base, node[1])
+    if kind == "l":
+        return SharedSequence(buffer, base, node[1], node[2])
+    return pickle.loads(buffer[base + node[1] : base + node[2]])
+
+
+class SharedMapping(Mapping):
+    """Read-only mapping whose values live in a shared memory segment."""
+
+    __slots__ = ("_buffer", "_base", "_nodes")
+
+    def __init__(self, buffer: memoryview, base: int, nodes: Dict[str, Node]):
+        self._buffer = buffer
+        self._base = base
+        self._nodes = nodes
+
+    def __getitem__(self, key: str) -> Any:
+        return _decode(self._buffer, self._base, self._nodes[key])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def materialize(self) -> Dict[str, Any]:
+        return {key: _materialize(self[key]) for key in self._nodes}
+
+
+class SharedSequence(Sequence):
+    """Read-only list of records, each decoded from the segment on access."""
+
+    __slots__ = ("_buffer", "_base", "_table", "_count")
+
+    def __init__(self, buffer: memoryview, base: int, table: int, count: int):
+        self._buffer = buffer
+        self._base = base
+        self._table = table
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("SharedSequence index out of range")
+        start, end = _SPAN.unpack_from(
+            self._buffer, self._base + self._table + index * _SPAN.size
+        )
+        return pickle.loads(self._buffer[self._base + start : self._base + end])
+
+    def __iter__(self) -> Iterator[Any]:
+        for index in range(self._count):
+            yield self[index]
+
+    def materialize(self) -> List[Any]:
+        return list(self)
+
+
+def _materialize(value: Any) -> Any:
+    if isinstance(value, (SharedMapping, SharedSequence)):
+        return value.materialize()
+    return value
+
+
+class SharedState:
+    """Owner side of a published segment; `unlink` releases the memory."""
+
+    def __init__(self, state: Dict[str, Any], scenario_id: Optional[str] = None):
+        data = bytearray()
+        index = pickle.dumps(_encode(state, 0, data), protocol=pickle.HIGHEST_PROTOCOL)
+        size = _HEADER.size + len(index) + len(data)
+
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        self._shm.buf[: _HEADER.size] = _HEADER.pack(MAGIC, len(index))
+        offset = _HEADER.size
+        self._shm.buf[offset : offset + len(index)] = index
+        offset += len(index)
+        self._shm.buf[offset : offset + len(data)] = data
+        self.handle = SharedStateHandle(self._shm.name, size, scenario_id)
+
+    def unlink(self) -> None:
+        if self._shm is None:
+            return
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+
+def _open_segment(name: str) -> shared_memory.SharedMemory:
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 registers every attach with the resource tracker.
+        # Pool workers share the publisher's tracker, where the registration
+        # is a no-op, so the segment still lives until the owner unlinks it.
+        return shared_memory.SharedMemory(name=name)
+
+
+class AttachedState:
+    """Reader side of a segment; `state` is a read-only `SharedMapping`."""
+
+    def __init__(self, handle: SharedStateHandle):
+        self.handle = handle
+        self._shm = _open_segment(handle.name)
+        self._buffer = self._shm.buf.toreadonly()
+        magic, index_size = _HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"Segment {handle.name} does not hold a published state")
+        base = _HEADER.size + index_size
+        root = pickle.loads(self._buffer[_HEADER.size : base])
+        self.state = _decode(self._buffer, base, root)
+
+    def materialize(self) -> Dict[str, Any]:
+        return self.state.materialize()
+
+    def close(self) -> None:
+        if self._shm is None:
+            return
+        self.state = None
+        self._buffer.release()
+        self._shm.close()
+        self._shm = None
+
+
+def publish_state(
+    state: Dict[str, Any], scenario_id: Optional[str] = None
+) -> SharedState:
+    return SharedState(state, scenario_id)
+
+
+def attach_state(handle: SharedStateHandle) -> AttachedState:
+    return AttachedState(handle)
+
+
+class SharedScenarioStore:
+    """Published scenario states, keyed by scenario id."""
+
+    def __init__(self):
+        self._states: Dict[str, SharedState] = {}
+
+    def publish(self, scenario_id: str, state: Dict[str, Any]) -> SharedStateHandle:
+        existing = self._states.get(scenario_id)
+        if existing is not None:
+            return existing.handle
+        shared = publish_state(state, scenario_id)
+        self._states[scenario_id] = shared
+        return shared.handle
+
+    def handle(self, scenario_id: str) -> SharedStateHandle:
+        return self._states[scenario_id].handle
+
+    @property
+    def handles(self) -> Dict[str, SharedStateHandle]:
+        return {scenario_id: shared.handle for scenario_id, shared in self._states.items()}
+
+    def close(self) -> None:
+        for shared in self._states.values():
+            shared.unlink()
+        self._states.clear()
+
+    def __enter__(self) -> "SharedScenarioStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
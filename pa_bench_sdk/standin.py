@@ -0,0 +1,123 @@
+"""
+Stand-in Gomail/Gocalendar clones for offline benchmarks and tests.
+
+`standin_app` serves `POST /{pair}/{clone}/api/set_state` and
+`GET /{pair}/{clone}/api/get_state`, keeping each clone's last state as the
+JSON body it was sent (an empty object until the first `set_state`).
+`get_state?fields=a,b` answers with only those top-level fields; pass
+`fields_param=FIELDS_PARAM` to `WorldsClient` to use it. The
+clones do no work of their own, so measurements against them isolate the
+SDK's side of a round trip; `latency` adds a fixed delay per request to
+emulate the network.
+
+`StandinServer` runs the app in a child process, so a benchmark's CPU and
+memory figures cover only the client, and hands out `InstanceEndpoints` for
+any number of independent pairs. `pa-bench standin` runs it in the
+foreground.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import multiprocessing
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+from .worlds import InstanceEndpoints
+
+FIELDS_PARAM = "fields"
+
+
+def standin_app(latency: float = 0.0) -> web.Application:
+    states: Dict[Tuple[str, str], bytes] = {}
+    # Decoded lazily, for `fields` requests.
+    decoded: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    async def set_state(request: web.Request) -> web.Response:
+        body = await request.read()
+        if latency:
+            await asyncio.sleep(latency)
+        key = request.match_info["pair"], request.match_info["clone"]
+        states[key] = body
+        decoded.pop(key, None)
+        return web.json_response({"ok": True})
+
+    async def get_state(request: web.Request) -> web.Response:
+        if latency:
+            await asyncio.sleep(latency)
+        key = request.match_info["pair"], request.match_info["clone"]
+        body = states.get(key, b"{}")
+        if FIELDS_PARAM in request.query:
+            state = decoded.get(key)
+            if state is None:
+                state = decoded[key] = json.loads(body)
+            fields = request.query[FIELDS_PARAM].split(",")
+            body = json.dumps({field: state[field] for field in fields if field in state}).encode()
+        return web.Response(body=body, content_type="application/json")
+
+    app = web.Application(client_max_size=1024 ** 3)
+    app.router.add_post("/{pair}/{clone}/api/set_state", set_state)
+    app.router.add_get("/{pair}/{clone}/api/get_state", get_state)
+    return app
+
+
+def standin_pairs(base_url: str, count: int) -> List[InstanceEndpoints]:
+    base_url = base_url.rstrip("/")
+    return [
+        InstanceEndpoints(f"{base_url}/pair{n}/gomail", f"{base_url}/pair{n}/gocalendar")
+        for n in range(count)
+    ]
+
+
+def _serve(conn, host: str, port: int, latency: float) -> None:
+    async def main() -> None:
+        runner = web.AppRunner(standin_app(latency), access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+        conn.send(runner.addresses[0][1])
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+class StandinServer:
+    """Stand-in clones in a child process."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.url: Optional[str] = None
+        self._process = None
+
+    def start(self, timeout: float = 30.0) -> "StandinServer":
+        context = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = context.Pipe()
+        self._process = context.Process(
+            target=_serve, args=(child_conn, self.host, self.port, self.latency), daemon=True
+        )
+        self._process.start()
+        child_conn.close()
+        if not parent_conn.poll(timeout):
+            self.close()
+            raise RuntimeError("stand-in server did not start in time")
+        self.url = f"http://{self.host}:{parent_conn.recv()}"
+        return self
+
+    def pairs(self, count: int) -> List[InstanceEndpoints]:
+        return standin_pairs(self.url, count)
+
+    def close(self) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+
+    def __enter__(self) -> "StandinServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,245 @@
+"""
+Offline re-scoring of saved final states.
+
+`iter_json_documents` parses JSONL or concatenated JSON incrementally: it
+keeps at most one document plus one read chunk in memory, so archives of any
+size stream through in bounded memory. A document that is malformed, cut
+short or larger than `max_document_size` is yielded as a `MalformedDocument`
+and parsing resumes at the next line that starts with `{`, so one bad record
+costs one error row rather than the run. `verify_stream` feeds the parsed
+states to a `VerifierPool` with a bounded window of in-flight requests and
+yields results in input order as soon as they are ready.
+
+Each document is either a bare state (`{"gomail": ..., "gocalendar": ...}`)
+or a record `{"state": {...}, "scenario_id"?: ..., "id"?: ..., "instance"?: ...}`;
+a record's `scenario_id` overrides the default one. A record whose `state` is `None`
+verifies the scenario's stored state.
+"""
+
+from __future__ import annotations
+
+import json
+from collections import deque
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Deque, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from .verifier import VerifierRunner
+
+if TYPE_CHECKING:
+    # `pool` pulls in multiprocessing; offline single-file verifies skip it.
+    from .pool import VerifierPool
+    from .sampling import StackSampler
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+DEFAULT_MAX_DOCUMENT_SIZE = 64 << 20
+
+_WHITESPACE = " \t\r\n"
+
+
+@dataclass
+class MalformedDocument:
+    """Stands in for a document that could not be parsed."""
+
+    message: str
+
+
+def _incomplete(error: json.JSONDecodeError, buffer: str) -> bool:
+    # A document cut off by the end of the buffer fails on its last, partial
+    # token (a literal, an escape, or a string, which cannot span lines), so
+    # no newline follows the error. Past a newline the input itself is bad.
+    return buffer.find("\n", error.pos) == -1
+
+
+def iter_json_documents(
+    handle: IO[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_document_size: int = DEFAULT_MAX_DOCUMENT_SIZE,
+) -> Iterator[Any]:
+    """Yield each JSON document of a JSONL or concatenated-JSON text stream.
+
+    Unparseable documents are yielded as `MalformedDocument`s.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+    read_size = chunk_size
+
+    while True:
+        while position < len(buffer) and buffer[position] in _WHITESPACE:
+            position += 1
+        if position == len(buffer):
+            if eof:
+                return
+            buffer, position = handle.read(chunk_size), 0
+            eof = not buffer
+            continue
+        try:
+            document, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as exc:
+            size = len(buffer) - position
+            if not _incomplete(exc, buffer):
+                error = f"Malformed JSON document: {exc}"
+            elif eof:
+                error = f"Truncated JSON document: {exc}"
+            elif size > max_document_size:
+                error = f"JSON document exceeds {max_document_size} characters"
+            else:
+                # Incomplete document: read more, doubling the read size so a
+                # document larger than the chunk is rescanned a bounded number
+                # of times.
+                more = handle.read(min(read_size, max_document_size + 1 - size))
+                read_size *= 2
+                eof = not more
+                buffer = buffer[position:] + more
+                position = 0
+                continue
+            yield MalformedDocument(error)
+            read_size = chunk_size
+            # Resume at the next line that opens a document, reading on in
+            # chunks (keeping the last character in case it is the newline).
+            while True:
+                start = buffer.find("\n{", position + 1)
+                if start != -1:
+                    position = start + 1
+                    break
+                if eof:
+                    position = len(buffer)
+                    break
+                more = handle.read(chunk_size)
+                eof = not more
+                buffer, position = buffer[-1:] + more, -1
+            continue
+        if end == len(buffer) and not eof and not isinstance(document, (dict, list)):
+            # A scalar that ends at the buffer edge may continue in the next chunk.
+            more = handle.read(chunk_size)
+            eof = not more
+            buffer = buffer[position:] + more
+            position = 0
+            continue
+        read_size = chunk_size
+        position = end
+        yield document
+
+
+@dataclass
+class StateRecord:
+    index: int
+    scenario_id: Optional[str]
+    state: Optional[Dict[str, Any]]
+    record_id: Any = None
+    state_hash: Optional[str] = None
+    instance: Optional[str] = None
+    error: Optional[str] = None
+
+
+def to_state_record(document: Any, index: int, scenario_id: Optional[str]) -> StateRecord:
+    if isinstance(document, MalformedDocument):
+        return StateRecord(index=index, scenario_id=scenario_id, state=None, error=document.message)
+    if not isinstance(document, dict):
+        raise ValueError(f"Document {index} is not a JSON object")
+    if "state" in document:
+        return StateRecord(
+            index=index,
+            scenario_id=document.get("scenario_id") or scenario_id,
+            state=document["state"],
+            record_id=document.get("id"),
+            instance=document.get("instance"),
+        )
+    return StateRecord(index=index, scenario_id=scenario_id, state=document)
+
+
+def read_state_file(path: Union[str, Path]) -> Dict[str, Any]:
+    """Read one saved state (bare or wrapped in a `state` record)."""
+    with open(path, encoding="utf-8") as f:
+        return to_state_record(json.load(f), 0, None).state
+
+
+def iter_state_records(
+    handle: IO[str], scenario_id: Optional[str] = None
+) -> Iterator[StateRecord]:
+    for index, document in enumerate(iter_json_documents(handle)):
+        yield to_state_record(document, index, scenario_id)
+
+
+def _error_row(record: StateRecord, message: str) -> Dict[str, Any]:
+    row = {
+        "index": record.index,
+        "id": record.record_id,
+        "scenario_id": record.scenario_id,
+        "error": message,
+    }
+    if record.state_hash is not None:
+        row["state_hash"] = record.state_hash
+    return row
+
+
+def _result_row(record: StateRecord, result) -> Dict[str, Any]:
+    row = {"index": record.index, "id": record.record_id}
+    row.update(result.to_dict())
+    if record.state_hash is not None:
+        row["state_hash"] = record.state_hash
+    return row
+
+
+def verify_stream(
+    records: Iterable[StateRecord],
+    data_path: Union[str, Path] = "data",
+    pool: Optional["VerifierPool"] = None,
+    max_in_flight: int = 64,
+    sampler: Optional["StackSampler"] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Verify records in parallel and yield one result row per record, in order.
+
+    Without a pool the records are verified in-process, one at a time,
+    labelled for `sampler` when one is given.
+    """
+    if pool is None:
+        runner = VerifierRunner(data_path)
+        baselines: Dict[str, Dict[str, Any]] = {}
+        for record in records:
+            if record.error is not None or record.scenario_id is None:
+                yield _error_row(record, record.error or "No scenario_id for this record")
+                continue
+            try:
+                state = record.state
+                if state is None:
+                    state = baselines.get(record.scenario_id)
+                    if state is None:
+                        from .pool import preload_states
+
+                        state = baselines[record.scenario_id] = preload_states(
+                            data_path, [record.scenario_id]
+                        )[record.scenario_id]
+                if sampler is not None:
+                    with sampler.labelled(record.scenario_id):
+                        result = runner.run(record.scenario_id, state=state)
+                else:
+                    result = runner.run(record.scenario_id, state=state)
+                yield _result_row(record, result)
+            except Exception as exc:
+                yield _error_row(record, f"{type(exc).__name__}: {exc}")
+        return
+
+    window: Deque[Tuple[StateRecord, Any]] = deque()
+
+    def drain_one() -> Dict[str, Any]:
+        record, future = window.popleft()
+        if future is None:
+            return _error_row(record, record.error or "No scenario_id for this record")
+        try:
+            return _result_row(record, future.result())
+        except Exception as exc:
+            return _error_row(record, f"{type(exc).__name__}: {exc}")
+
+    for record in records:
+        future = None
+        if record.error is None and record.scenario_id is not None:
+            future = pool.submit(record.scenario_id, record.state)
+        # The pool holds its own reference while the request is queued.
+        window.append((replace(record, state=None), future))
+        while len(window) >= max_in_flight:
+            yield drain_one()
+    while window:
+        yield drain_one()
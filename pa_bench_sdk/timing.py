@@ -0,0 +1,71 @@
+"""
+Per-stage wall-clock timings for CLI commands.
+
+`StageTimings` records how long each named stage of a command took, including
+stages that run concurrently in a worker thread, and renders them as a
+single breakdown line or, via `summary()`, as a table. An optional
+`StageProfiler` (see `pa_bench_sdk.profiling`) wraps every stage, and each
+stage is a `stage.<name>` tracing span.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+from . import tracing
+
+if TYPE_CHECKING:
+    from .profiling import StageProfiler
+
+T = TypeVar("T")
+
+
+class StageTimings:
+    """Durations of named stages, in the order they were first recorded."""
+
+    def __init__(self, profiler: Optional["StageProfiler"] = None):
+        self.stages: Dict[str, float] = {}
+        self.reports: Dict[str, List[Dict[str, Any]]] = {}
+        self.profiler = profiler
+        self._started = time.perf_counter()
+
+    def record(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        token = self.profiler.start(name) if self.profiler is not None else None
+        started = time.perf_counter()
+        try:
+            with tracing.span(f"stage.{name}"):
+                yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+            if self.profiler is not None:
+                report = self.profiler.stop(name, token)
+                self.reports.setdefault(name, []).append(report)
+
+    def timed(self, name: str, function: Callable[..., T], *args: Any) -> T:
+        """Call `function(*args)` as stage `name`; usable from worker threads."""
+        with self.stage(name):
+            return function(*args)
+
+    @property
+    def total(self) -> float:
+        return time.perf_counter() - self._started
+
+    def as_dict(self) -> Dict[str, float]:
+        """Stage durations plus `total`, in seconds."""
+        return {**self.stages, "total": self.total}
+
+    def summary(self) -> str:
+        from .profiling import format_summary
+
+        return format_summary(self.stages.items(), self.reports, self.total)
+
+    def format(self) -> str:
+        parts = [f"{name} {seconds * 1000:.1f} ms" for name, seconds in self.stages.items()]
+        parts.append(f"total {self.total * 1000:.1f} ms")
+        return " | ".join(parts)
@@ -0,0 +1,346 @@
+"""
+Lightweight request tracing.
+
+`span(name, **attributes)` times a block as a `Span`, nested under the
+span that is current in the calling context (a `contextvars` variable, so
+asyncio tasks and `asyncio.to_thread` calls inherit it). Until `configure`
+installs an exporter, `span` hands back one shared no-op span and records
+nothing; instrumented code checks `span.recording` before computing costly
+attributes.
+
+Finished spans go to every configured `SpanExporter`. The interface
+mirrors OpenTelemetry's (`export(spans)`, `force_flush()`, `shutdown()`),
+and `OTelExporter` replays spans into an OpenTelemetry tracer when the
+optional `opentelemetry-api` package is installed. Built in:
+
+- `JsonlExporter`: one JSON object per span;
+- `ChromeTraceExporter`: Chrome trace-event JSON for `chrome://tracing` or
+  Perfetto.
+
+The SDK emits spans for CLI commands and their stages, `ScenarioLoader.load`,
+`VerifierRunner._load_module`, `validation_function` and each `WorldsClient`
+request. Verifiers running in `VerifierPool` worker processes are not
+traced: a forked child (a pool worker, the fork server and its workers)
+starts with no exporters, and the parent flushes its exporters before
+forking, so nothing it buffered is written twice.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional, Sequence, Union
+
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "pa_bench_span", default=None
+)
+
+
+class Span:
+    """A timed operation; times are `time.time_ns()` nanoseconds."""
+
+    recording = True
+
+    def __init__(self, name: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.name = name
+        self.parent_id = parent.span_id if parent is not None else None
+        self.trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.attributes = attributes
+        self.status = "ok"
+        self.pid = os.getpid()
+        self.thread_id = threading.get_ident()
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self._token: Optional[contextvars.Token] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        self.attributes.update(attributes)
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.status = "error"
+        self.attributes["error.type"] = type(exc).__name__
+        self.attributes["error.message"] = str(exc)
+
+    @property
+    def duration_ns(self) -> int:
+        return (self.end_ns or time.time_ns()) - self.start_ns
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": self.duration_ns / 1e6,
+            "status": self.status,
+            "pid": self.pid,
+            "thread_id": self.thread_id,
+            "attributes": self.attributes,
+        }
+
+    def __enter__(self) -> "Span":
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.end_ns = time.time_ns()
+        if exc is not None:
+            self.record_exception(exc)
+        if self._token is not None:
+            try:
+                _current.reset(self._token)
+            except ValueError:
+                # Exited in a different context (e.g. an async generator).
+                _current.set(None)
+        _TRACER.finish(self)
+
+
+class _NoOpSpan:
+    recording = False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        pass
+
+    def record_exception(self, exc: BaseException) -> None:
+        pass
+
+    def __enter__(self) -> "_NoOpSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+NOOP_SPAN = _NoOpSpan()
+
+
+class SpanExporter:
+    """Receives finished spans; same method names as OpenTelemetry's."""
+
+    def export(self, spans: Sequence[Span]) -> None:
+        raise NotImplementedError
+
+    def force_flush(self) -> None:
+        pass
+
+    def shutdown(self) -> None:
+        pass
+
+
+class _FileExporter(SpanExporter):
+    def __init__(self, target: Union[str, Path, IO[str]]):
+        if isinstance(target, (str, Path)):
+            Path(target).parent.mkdir(parents=True, exist_ok=True)
+            self.handle: IO[str] = open(target, "w", encoding="utf-8")
+            self._owns_handle = True
+        else:
+            self.handle = target
+            self._owns_handle = False
+        self._lock = threading.Lock()
+
+    def force_flush(self) -> None:
+        with self._lock:
+            self.handle.flush()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._close()
+            if self._owns_handle:
+                self.handle.close()
+            else:
+                self.handle.flush()
+
+    def _close(self) -> None:
+        pass
+
+
+class JsonlExporter(_FileExporter):
+    """Writes each span as one JSON line."""
+
+    def export(self, spans: Sequence[Span]) -> None:
+        lines = "".join(json.dumps(span.to_dict(), default=str) + "\n" for span in spans)
+        with self._lock:
+            self.handle.write(lines)
+
+
+class ChromeTraceExporter(_FileExporter):
+    """Writes Chrome trace-event "complete" events, one per span.
+
+    The array is closed on `shutdown`; viewers also accept the unterminated
+    file a crashed run leaves behind.
+    """
+
+    def __init__(self, target: Union[str, Path, IO[str]]):
+        super().__init__(target)
+        self.handle.write("[\n")
+        self._first = True
+
+    def export(self, spans: Sequence[Span]) -> None:
+        events = []
+        for span in spans:
+            args = dict(span.attributes, trace_id=span.trace_id, span_id=span.span_id)
+            if span.status != "ok":
+                args["status"] = span.status
+            events.append(
+                json.dumps(
+                    {
+                        "name": span.name,
+                        "cat": span.name.split(".")[0],
+                        "ph": "X",
+                        "ts": span.start_ns / 1000,
+                        "dur": span.duration_ns / 1000,
+                        "pid": span.pid,
+                        "tid": span.thread_id,
+                        "args": args,
+                    },
+                    default=str,
+                )
+            )
+        if not events:
+            return
+        with self._lock:
+            self.handle.write(("" if self._first else ",\n") + ",\n".join(events))
+            self._first = False
+
+    def _close(self) -> None:
+        self.handle.write("\n]\n")
+
+
+class OTelExporter(SpanExporter):
+    """Replays finished spans into an OpenTelemetry tracer.
+
+    Spans are held until their trace's root span ends, then started in
+    order with their recorded times and parents. Needs `opentelemetry-api`
+    (and an SDK with an exporter configured to see anything).
+    """
+
+    def __init__(self, tracer: Any = None):
+        from opentelemetry import trace
+
+        self._trace = trace
+        self.tracer = tracer or trace.get_tracer("pa_bench_sdk")
+        self._pending: Dict[str, List[Span]] = {}
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[Span]) -> None:
+        for span in spans:
+            with self._lock:
+                pending = self._pending.setdefault(span.trace_id, [])
+                pending.append(span)
+                if span.parent_id is not None:
+                    continue
+                del self._pending[span.trace_id]
+            self._replay(pending)
+
+    def _replay(self, spans: List[Span]) -> None:
+        started: Dict[str, Any] = {}
+        for span in sorted(spans, key=lambda item: item.start_ns):
+            parent = started.get(span.parent_id)
+            context = self._trace.set_span_in_context(parent) if parent is not None else None
+            otel_span = self.tracer.start_span(
+                span.name,
+                context=context,
+                attributes={key: _otel_value(value) for key, value in span.attributes.items()},
+                start_time=span.start_ns,
+            )
+            if span.status != "ok":
+                otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR))
+            started[span.span_id] = otel_span
+        for span in spans:
+            started[span.span_id].end(end_time=span.end_ns)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pending = [span for spans in self._pending.values() for span in spans]
+            self._pending.clear()
+        if pending:
+            self._replay(pending)
+
+
+def _otel_value(value: Any) -> Any:
+    if isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+class Tracer:
+    def __init__(self):
+        self.exporters: List[SpanExporter] = []
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.exporters)
+
+    def span(self, name: str, **attributes: Any) -> Union[Span, _NoOpSpan]:
+        if not self.exporters:
+            return NOOP_SPAN
+        return Span(name, _current.get(), attributes)
+
+    def finish(self, span: Span) -> None:
+        for exporter in self.exporters:
+            exporter.export((span,))
+
+
+_TRACER = Tracer()
+
+
+def span(name: str, **attributes: Any) -> Union[Span, _NoOpSpan]:
+    """A span for `with`; a shared no-op unless tracing is configured."""
+    return _TRACER.span(name, **attributes)
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def enabled() -> bool:
+    return _TRACER.enabled
+
+
+def configure(*exporters: SpanExporter) -> None:
+    """Send spans to `exporters` (replacing any configured before)."""
+    shutdown()
+    _TRACER.exporters = list(exporters)
+
+
+def shutdown() -> None:
+    """Flush and close every exporter; tracing becomes a no-op again."""
+    exporters, _TRACER.exporters = _TRACER.exporters, []
+    for exporter in exporters:
+        exporter.shutdown()
+
+
+def _flush_before_fork() -> None:
+    for exporter in _TRACER.exporters:
+        exporter.force_flush()
+
+
+def _forget_exporters() -> None:
+    # The exporters' files are the parent's; only it writes (and closes) them.
+    _TRACER.exporters = []
+    _current.set(None)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=_flush_before_fork, after_in_child=_forget_exporters)
+
+
+def exporter_for(path: Union[str, Path]) -> SpanExporter:
+    """`JsonlExporter` for `.jsonl` paths, `ChromeTraceExporter` otherwise."""
+    if str(path).endswith(".jsonl"):
+        return JsonlExporter(path)
+    return ChromeTraceExporter(path)
+
@@ -9,10 +9,13 @@ from __future__ import annotations
 
 import importlib.util
 import sys
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
+from . import metrics, tracing
+from .projection import Projection
 from .scenario import ScenarioDefinition
 
 
@@ -30,12 +33,34 @@ class VerificationResult:
     message: str
     details: Optional[Dict[str, Any]] = None
 
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready form; `TaskVerifier` checks become plain mappings."""
+        details = dict(self.details or {})
+        checks = details.pop("checks", [])
+        return {
+            "scenario_id": details.pop("scenario_id", None),
+            "passed": self.passed,
+            "reward": self.reward,
+            "message": self.message,
+            "checks": [
+                {"name": check.name, "verdict": bool(check.verdict), "reason": check.reason}
+                for check in checks
+            ],
+            **details,
+        }
+
 
 class VerifierRunner:
-    """Loads verifier modules that ships with each scenario."""
+    """Loads verifier modules that ships with each scenario.
+
+    Each `validation_function` is imported once per runner and reused by
+    later calls.
+    """
 
     def __init__(self, base_path: Union[str, Path] = "data"):
         self.base_path = Path(base_path)
+        self._functions: Dict[Path, Callable[[Dict[str, Any]], Any]] = {}
+        self._projections: Dict[str, Optional[Projection]] = {}
 
     def _load_module(self, verifier_path: Path):
         spec = importlib.util.spec_from_file_location(
@@ -44,9 +69,10 @@ class VerifierRunner:
         if spec is None or spec.loader is None:
             raise ImportError(f"Unable to import verifier from {verifier_path}")
 
-        module = importlib.util.module_from_spec(spec)
-        sys.modules[spec.name] = module
-        spec.loader.exec_module(module)
+        with tracing.span("verifier.load_module", path=str(verifier_path)):
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[spec.name] = module
+            spec.loader.exec_module(module)
         return module
 
     def run(
@@ -66,9 +92,32 @@ class VerifierRunner:
             scenario_path = self.base_path / scenario_id
 
         verifier_path = scenario_path / "verifier.py"
+        validation_function = self.load_validation_function(verifier_path, scenario_id)
+
+        if state is not None:
+            resolved_state = state
+        elif scenario_obj is not None:
+            resolved_state = {
+                "gomail": scenario_obj.gmail_state,
+                "gocalendar": scenario_obj.calendar_state,
+            }
+        else:
+            raise ValueError("State must be provided when passing a scenario id")
+
+        return self.evaluate(validation_function, scenario_id, resolved_state)
+
+    def load_validation_function(
+        self, verifier_path: Path, scenario_id: Optional[str] = None
+    ) -> Callable[[Dict[str, Any]], Any]:
+        """Import a scenario's `verifier.py` and return its `validation_function`."""
+        cached = self._functions.get(verifier_path)
+        if cached is not None:
+            return cached
+
         if not verifier_path.exists():
             raise FileNotFoundError(
-                f"Verifier not found for scenario '{scenario_id}' at {verifier_path}"
+                f"Verifier not found for scenario '{scenario_id or verifier_path.parent.name}' "
+                f"at {verifier_path}"
             )
 
         module = self._load_module(verifier_path)
@@ -78,18 +127,43 @@ class VerifierRunner:
             raise AttributeError(
                 f"Verifier at {verifier_path} must expose `validation_function`"
             )
+        self._functions[verifier_path] = validation_function
+        return validation_function
 
-        if state is not None:
-            resolved_state = state
-        elif scenario_obj is not None:
-            resolved_state = {
-                "gomail": scenario_obj.gmail_state,
-                "gocalendar": scenario_obj.calendar_state,
-            }
-        else:
-            raise ValueError("State must be provided when passing a scenario id")
+    def projection(self, scenario_id: str) -> Optional[Projection]:
+        """The state the scenario's verifier reads, from its `STATE_PATHS`.
 
-        reward, checks = validation_function(resolved_state)
+        `None` when the verifier does not declare them.
+        """
+        if scenario_id not in self._projections:
+            function = self.load_validation_function(
+                self.base_path / scenario_id / "verifier.py", scenario_id
+            )
+            paths = getattr(function, "__globals__", {}).get("STATE_PATHS")
+            self._projections[scenario_id] = Projection(paths) if paths is not None else None
+        return self._projections[scenario_id]
+
+    def evaluate(
+        self,
+        validation_function: Callable[[Dict[str, Any]], Any],
+        scenario_id: str,
+        state: Dict[str, Dict[str, Any]],
+    ) -> VerificationResult:
+        """Call a loaded `validation_function` and adapt its return value."""
+        with tracing.span("verifier.validation_function", scenario_id=scenario_id) as span:
+            started = time.perf_counter()
+            try:
+                reward, checks = validation_function(state)
+            except Exception:
+                metrics.VERIFICATIONS.labels(scenario_id, "error").inc()
+                raise
+            finally:
+                metrics.VERIFIER_SECONDS.labels(scenario_id).observe(time.perf_counter() - started)
+            if span.recording and isinstance(checks, Sequence):
+                passed_checks = sum(bool(getattr(check, "verdict", False)) for check in checks)
+                span.set_attributes(
+                    {"reward": reward, "checks": len(checks), "checks_passed": passed_checks}
+                )
 
         if not isinstance(reward, (int, float)):
             raise TypeError("Verifier reward must be numeric")
@@ -104,6 +178,7 @@ class VerifierRunner:
             task_verifiers.append(check)
 
         passed = all(tv.verdict for tv in task_verifiers)
+        metrics.VERIFICATIONS.labels(scenario_id, "passed" if passed else "failed").inc()
         message = (
             "All verifier checks passed"
             if passed
@@ -2,22 +2,42 @@
 Client helpers for interacting with Vibrant Labs worlds.
 
 Works with Gomail and Gocalendar clones by name and mirrors the simple
-client pattern from the existing scraper scripts.
+client pattern from the existing scraper scripts. Sessions the client
+creates carry `httptrace.trace_config()`, so every request's queueing, DNS,
+connect, send, time-to-first-byte and receive phases go to the metrics
+registry and to the request's tracing span.
 """
 
 from __future__ import annotations
 
 import os
 import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
 
 import aiohttp
 
+from . import metrics, tracing
+from .adaptive import AdaptiveLimiter, Hedger, RetryPolicy, is_overload, request_kind
+from .httptrace import RequestTimings, trace_config
+from .projection import Projection
+
 DEFAULT_WORLDS_BASE_URL: Optional[str] = None
 DEFAULT_ENV_PATH = Path(__file__).parent.parent / ".env"
 
+# A `set_state` payload, or its JSON body already encoded by `encode_payload`.
+Payload = Union[Dict[str, Any], bytes]
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def encode_payload(payload: Dict[str, Any]) -> bytes:
+    """Serialize a `set_state` payload ahead of time (e.g. off the event loop)."""
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
 
 @dataclass
 class InstanceEndpoints:
@@ -136,36 +156,287 @@ async def resolve_instance_urls(
     return endpoints
 
 
+def _record(
+    operation: str,
+    status: Union[int, str],
+    started: float,
+    timings: RequestTimings,
+    span: Any,
+) -> None:
+    metrics.HTTP_REQUESTS.labels(operation, status).inc()
+    metrics.HTTP_SECONDS.labels(operation).observe(time.perf_counter() - started)
+    connection = timings.connection
+    if connection is None:
+        return
+    metrics.HTTP_CONNECTIONS.labels(operation, connection).inc()
+    phases = timings.phases()
+    for phase, seconds in phases.items():
+        metrics.HTTP_PHASE_SECONDS.labels(operation, phase, connection).observe(seconds)
+    if span.recording:
+        span.set_attribute("connection", connection)
+        span.set_attributes({f"{phase}_ms": seconds * 1000 for phase, seconds in phases.items()})
+
+
+class WorldsRequestError(RuntimeError):
+    """A clone answered with a status other than 200."""
+
+    def __init__(
+        self, operation: str, status: int, text: str, retry_after: Optional[float] = None
+    ):
+        super().__init__(f"{operation} failed: {status} – {text}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    try:
+        return max(float(value), 0.0) if value is not None else None
+    except ValueError:  # an HTTP date; fall back to the backoff schedule
+        return None
+
+
 class WorldsClient:
-    """Minimal HTTP client for Vibrant Labs clones."""
-
-    async def _post(self, url: str, payload: Dict[str, Any]) -> None:
-        endpoint = f"{url}/api/set_state"
-        async with aiohttp.ClientSession() as session:
-            async with session.post(endpoint, json=payload) as resp:
-                if resp.status != 200:
-                    text = await resp.text()
-                    raise RuntimeError(f"set_state failed: {resp.status} – {text}")
-
-    async def _get(self, url: str) -> Dict[str, Any]:
-        endpoint = f"{url}/api/get_state"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(endpoint) as resp:
-                if resp.status != 200:
-                    text = await resp.text()
-                    raise RuntimeError(f"get_state failed: {resp.status} – {text}")
-                return await resp.json()
+    """Minimal HTTP client for Vibrant Labs clones.
+
+    By default every request opens its own `aiohttp.ClientSession`. Pass a
+    session, or use the client as an async context manager, to keep one
+    pooled session (and its keep-alive connections) across requests. A
+    session passed in is used as is; create it with
+    `trace_configs=[httptrace.trace_config()]` to keep the phase timings.
+
+    With a `limiter` (`adaptive.AdaptiveLimiter`) requests wait for a slot
+    under the per-host and per-clone adaptive limits; with a `retry` policy
+    (`adaptive.RetryPolicy`) failed requests that are safe to repeat are
+    retried after a jittered backoff. With a `hedge` (`adaptive.Hedger`)
+    a `get_state` whose response is slow to start is raced against a
+    duplicate request.
+
+    `get_states` with a `projection` (`projection.Projection`) fetches only
+    the clones it reads and trims their states to the projected fields. The
+    Worlds clones are not known to accept extra query parameters, so asking
+    the server to do the trimming is opt-in: with `fields_param` set (e.g.
+    `standin.FIELDS_PARAM` for the stand-in clones) the fields are sent as
+    that query parameter.
+    """
+
+    def __init__(
+        self,
+        session: Optional[aiohttp.ClientSession] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        hedge: Optional[Hedger] = None,
+        fields_param: Optional[str] = None,
+    ):
+        self._session = session
+        self._owns_session = False
+        self.limiter = limiter
+        self.retry = retry
+        self.hedge = hedge
+        self.fields_param = fields_param
+
+    async def open(self) -> "WorldsClient":
+        if self._session is None:
+            self._session = aiohttp.ClientSession(trace_configs=[trace_config()])
+            self._owns_session = True
+        return self
+
+    async def close(self) -> None:
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+        self._session = None
+        self._owns_session = False
+
+    async def __aenter__(self) -> "WorldsClient":
+        return await self.open()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @asynccontextmanager
+    async def _session_scope(self) -> AsyncIterator[aiohttp.ClientSession]:
+        if self._session is not None:
+            yield self._session
+            return
+        async with aiohttp.ClientSession(trace_configs=[trace_config()]) as session:
+            yield session
+
+    async def _attempt(
+        self,
+        operation: str,
+        method: str,
+        endpoint: str,
+        request: Dict[str, Any],
+        responded: Optional[Callable[[], None]] = None,
+    ) -> bytes:
+        """Send one request and return the response body.
+
+        `responded` is called once the response headers have arrived.
+        """
+        status: Union[int, str] = "error"
+        timings = RequestTimings()
+        started = time.perf_counter()
+        with tracing.span(f"worlds.{operation}", url=endpoint) as span:
+            data = request.get("data")
+            if isinstance(data, bytes):
+                metrics.HTTP_SENT_BYTES.labels(operation).inc(len(data))
+                if span.recording:
+                    span.set_attribute("request_bytes", len(data))
+            try:
+                async with self._session_scope() as session:
+                    async with session.request(
+                        method, endpoint, trace_request_ctx=timings, **request
+                    ) as resp:
+                        status = resp.status
+                        span.set_attribute("status", resp.status)
+                        if responded is not None:
+                            responded()
+                        if resp.status != 200:
+                            raise WorldsRequestError(
+                                operation,
+                                resp.status,
+                                await resp.text(),
+                                _retry_after(resp.headers.get("Retry-After")),
+                            )
+                        body = await resp.read()
+                        timings.finish()
+                        metrics.HTTP_RECEIVED_BYTES.labels(operation).inc(len(body))
+                        if span.recording:
+                            span.set_attribute("response_bytes", len(body))
+                        return body
+            except asyncio.CancelledError:
+                status = "cancelled"
+                raise
+            finally:
+                _record(operation, status, started, timings, span)
+
+    async def _limited(
+        self,
+        operation: str,
+        method: str,
+        url: str,
+        endpoint: str,
+        request: Dict[str, Any],
+        responded: Optional[Callable[[], None]] = None,
+    ) -> bytes:
+        if self.limiter is None:
+            return await self._attempt(operation, method, endpoint, request, responded)
+        data = request.get("data")
+        kind = request_kind(operation, len(data) if isinstance(data, bytes) else None)
+        async with self.limiter.slot(url, kind) as slot:
+            try:
+                return await self._attempt(operation, method, endpoint, request, responded)
+            except Exception as exc:
+                slot.overloaded = is_overload(exc)
+                raise
+
+    def _copy(
+        self, operation: str, method: str, url: str, endpoint: str, request: Dict[str, Any]
+    ) -> Tuple["asyncio.Task[bytes]", asyncio.Event]:
+        """One copy of a hedged request, and an event set when it responds."""
+        hedge = self.hedge
+        responded = asyncio.Event()
+        started = time.perf_counter()
+
+        def on_response() -> None:
+            hedge.observe(url, time.perf_counter() - started)
+            responded.set()
+
+        task = asyncio.ensure_future(
+            self._limited(operation, method, url, endpoint, request, on_response)
+        )
+        return task, responded
+
+    async def _hedged(
+        self, operation: str, method: str, url: str, endpoint: str, request: Dict[str, Any]
+    ) -> bytes:
+        """Race a duplicate request when the first is slow to respond."""
+        hedge = self.hedge
+        hedge.count_request()
+        primary, responded = self._copy(operation, method, url, endpoint, request)
+        tasks = {primary}
+        try:
+            waiter = asyncio.ensure_future(responded.wait())
+            try:
+                await asyncio.wait(
+                    {primary, waiter}, timeout=hedge.delay(url), return_when=asyncio.FIRST_COMPLETED
+                )
+            finally:
+                waiter.cancel()
+            if primary.done() or responded.is_set():
+                return await primary
+            if not hedge.allow():
+                metrics.HTTP_HEDGES.labels(operation, "over_budget").inc()
+                return await primary
+            second, _ = self._copy(operation, method, url, endpoint, request)
+            tasks.add(second)
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                succeeded = [task for task in done if task.exception() is None]
+                if succeeded:
+                    winner = "primary_won" if succeeded[0] is primary else "hedge_won"
+                    metrics.HTTP_HEDGES.labels(operation, winner).inc()
+                    return succeeded[0].result()
+            return primary.result()  # both failed: raise the primary's error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _request(
+        self, operation: str, method: str, url: str, request: Dict[str, Any], hedged: bool = False
+    ) -> bytes:
+        endpoint = f"{url}/api/{operation}"
+        send = self._hedged if hedged and self.hedge is not None else self._limited
+        attempt = 0
+        while True:
+            try:
+                return await send(operation, method, url, endpoint, request)
+            except Exception as exc:
+                reason = self.retry.reason(operation, exc) if self.retry is not None else None
+                if reason is None or attempt >= self.retry.retries:
+                    raise
+                delay = self.retry.delay(attempt, exc)
+            metrics.HTTP_RETRIES.labels(operation, reason).inc()
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _post(self, url: str, payload: Payload) -> None:
+        if isinstance(payload, bytes):
+            request = {"data": payload, "headers": JSON_HEADERS}
+        else:
+            request = {"json": payload}
+        await self._request("set_state", "POST", url, request)
+
+    async def _get(self, url: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        request: Dict[str, Any] = {}
+        if fields is not None and self.fields_param is not None:
+            request["params"] = {self.fields_param: ",".join(fields)}
+        return json.loads(await self._request("get_state", "GET", url, request, hedged=True))
 
     async def set_states(
-        self, endpoints: InstanceEndpoints, gmail_state: Dict[str, Any], calendar_state: Dict[str, Any]
+        self, endpoints: InstanceEndpoints, gmail_state: Payload, calendar_state: Payload
     ) -> None:
         await self._post(endpoints.gmail_clone, gmail_state)
         await self._post(endpoints.calendar_clone, calendar_state)
 
-    async def get_states(self, endpoints: InstanceEndpoints) -> Dict[str, Dict[str, Any]]:
-        gmail_state = await self._get(endpoints.gmail_clone)
-        calendar_state = await self._get(endpoints.calendar_clone)
+    async def get_states(
+        self, endpoints: InstanceEndpoints, projection: Optional[Projection] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        if projection is None:
+            gmail_state, calendar_state = await asyncio.gather(
+                self._get(endpoints.gmail_clone),
+                self._get(endpoints.calendar_clone),
+            )
+            return {
+                "gomail": gmail_state,
+                "gocalendar": calendar_state,
+            }
+        clones = projection.clones
+        states = await asyncio.gather(
+            *(
+                self._get(endpoints.for_clone(clone), projection.fields(clone))
+                for clone in clones
+            )
+        )
         return {
-            "gomail": gmail_state,
-            "gocalendar": calendar_state,
+            clone: projection.apply_clone(clone, state) for clone, state in zip(clones, states)
         }
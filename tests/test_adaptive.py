@@ -0,0 +1,179 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from pa_bench_sdk import metrics
+from pa_bench_sdk.adaptive import AdaptiveLimit, AdaptiveLimiter, Hedger, RetryPolicy
+from pa_bench_sdk.worlds import WorldsClient, WorldsRequestError
+
+
+def test_limit_grows_additively_and_backs_off_once_per_round():
+    async def exercise():
+        limit = AdaptiveLimit(initial=2, maximum=4)
+        await limit.acquire()
+        await limit.acquire()
+        third = asyncio.ensure_future(limit.acquire())
+        await asyncio.sleep(0)
+        blocked = not third.done()
+
+        started = time.perf_counter()
+        limit.release(started, 0.01, False)
+        await third
+        grown = limit.limit
+        for _ in range(40):
+            limit.release(time.perf_counter(), 0.01, False)
+            limit.in_flight += 1
+        capped = limit.limit
+
+        round_started = time.perf_counter()
+        limit.release(round_started, None, True)
+        limit.release(round_started, None, True)
+        after_overloads = limit.limit
+        limit.release(time.perf_counter(), 0.05, False)
+        return blocked, grown, capped, after_overloads, limit.limit
+
+    blocked, grown, capped, after_overloads, after_inflation = asyncio.run(exercise())
+
+    assert blocked
+    assert grown == 2.5
+    assert capped == 4
+    assert after_overloads == 2
+    assert after_inflation == 1
+
+
+def test_worlds_clones_share_one_backend_limit():
+    urls = ["http://a1b2c3.worlds.vibrantlabs.com", "http://d4e5f6.worlds.vibrantlabs.com"]
+
+    async def hold(limiter, url):
+        async with limiter.slot(url):
+            await asyncio.sleep(0)
+
+    async def second_waits(limiter):
+        async with limiter.slot(urls[0]):
+            second = asyncio.ensure_future(hold(limiter, urls[1]))
+            await asyncio.sleep(0.01)
+            blocked = not second.done()
+        await second
+        return blocked
+
+    shared = AdaptiveLimiter(initial=1)
+    per_url = AdaptiveLimiter(initial=1, group=lambda url: url)
+
+    assert asyncio.run(second_waits(shared))
+    assert list(shared.backends) == ["http://vibrantlabs.com"] and len(shared.clones) == 2
+    assert not asyncio.run(second_waits(per_url))
+
+
+def _flaky_app(calls):
+    async def set_state(request):
+        calls["set_state"] += 1
+        if calls["set_state"] <= 2:
+            return web.Response(status=503, text="busy", headers={"Retry-After": "0"})
+        return web.json_response({"ok": True})
+
+    async def get_state(request):
+        calls["get_state"] += 1
+        return web.Response(status=500, text="broken")
+
+    app = web.Application()
+    app.router.add_post("/api/set_state", set_state)
+    app.router.add_get("/api/get_state", get_state)
+    return app
+
+
+def test_client_retries_overloads_and_backs_off_the_host_limit():
+    calls = {"set_state": 0, "get_state": 0}
+    limiter = AdaptiveLimiter(initial=8)
+    metrics.REGISTRY.clear()
+
+    async def exercise():
+        async with TestServer(_flaky_app(calls)) as server:
+            url = str(server.make_url("")).rstrip("/")
+            async with WorldsClient(limiter=limiter, retry=RetryPolicy(base_delay=0)) as client:
+                await client._post(url, b"{}")
+                with pytest.raises(WorldsRequestError) as failure:
+                    await client._get(url)
+                return failure.value
+
+    error = asyncio.run(exercise())
+
+    assert calls == {"set_state": 3, "get_state": 1}
+    assert error.status == 500
+    (backend_limit,) = limiter.backends.values()
+    assert backend_limit.limit < 8 and backend_limit.in_flight == 0
+    retries = metrics.REGISTRY.snapshot()["pa_bench_http_retries_total"]["series"]
+    assert [(entry["labels"], entry["value"]) for entry in retries] == [
+        (["set_state", "503"], 2)
+    ]
+
+
+def _sized_app():
+    async def set_state(request):
+        body = await request.read()
+        # Latency grows with the payload, as an upload's does; nothing is overloaded.
+        await asyncio.sleep(len(body) / 20e6)
+        return web.json_response({"ok": True})
+
+    app = web.Application(client_max_size=4 << 20)
+    app.router.add_post("/api/set_state", set_state)
+    return app
+
+
+def test_mixed_payload_sizes_do_not_look_like_overload():
+    limiter = AdaptiveLimiter(initial=4)
+    small, large = b"x" * 160_000, b"x" * 1_300_000
+
+    async def exercise():
+        async with TestServer(_sized_app()) as server:
+            url = str(server.make_url("")).rstrip("/")
+            async with WorldsClient(limiter=limiter) as client:
+                for payload in [small, large] * 10:
+                    await client._post(url, payload)
+
+    asyncio.run(exercise())
+
+    (backend_limit,) = limiter.backends.values()
+    assert backend_limit.limit > 4
+    assert sorted(backend_limit.baselines) == ["set_state:18", "set_state:21"]
+
+
+def _stalling_app(calls, stall):
+    async def get_state(request):
+        calls.append(time.perf_counter())
+        if len(calls) % 4 == 0:
+            await asyncio.sleep(stall)
+        return web.json_response({"events": []})
+
+    app = web.Application()
+    app.router.add_get("/api/get_state", get_state)
+    return app
+
+
+@pytest.mark.parametrize("budget", [0.5, 0.0])
+def test_slow_get_state_is_hedged_within_budget(budget):
+    calls = []
+    hedger = Hedger(budget=budget, initial_delay=0.05, warmup=1000)
+    metrics.REGISTRY.clear()
+
+    async def exercise():
+        async with TestServer(_stalling_app(calls, stall=0.5)) as server:
+            url = str(server.make_url("")).rstrip("/")
+            async with WorldsClient(hedge=hedger) as client:
+                started = time.perf_counter()
+                states = [await client._get(url) for _ in range(7)]
+                return states, time.perf_counter() - started
+
+    states, elapsed = asyncio.run(exercise())
+
+    assert states == [{"events": []}] * 7
+    hedges = metrics.REGISTRY.snapshot()["pa_bench_http_hedges_total"]["series"]
+    outcomes = {entry["labels"][1]: entry["value"] for entry in hedges}
+    if budget:
+        assert outcomes == {"hedge_won": 2} and len(calls) == 9
+        assert elapsed < 0.5
+    else:
+        assert outcomes == {"over_budget": 1} and len(calls) == 7
+        assert elapsed >= 0.5
@@ -0,0 +1,47 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from pa_bench_sdk.batch import BatchSummary, baseline_records
+from pa_bench_sdk.scenario import ScenarioLoader
+from pa_bench_sdk.stream import verify_stream
+
+
+SCENARIO_IDS = ["scenario_003_meeting_modification", "scenario_007_meeting_rescheduling"]
+
+
+def test_baseline_batch_verifies_stored_states():
+    records = baseline_records(Path("data"), SCENARIO_IDS, repeat=2)
+    summary = BatchSummary()
+    rows = list(verify_stream(records, Path("data")))
+    for row in rows:
+        summary.add(row)
+
+    assert [row["id"] for row in rows] == [
+        f"{scenario_id}/{rollout}" for scenario_id in SCENARIO_IDS for rollout in range(2)
+    ]
+    assert summary.scenarios[SCENARIO_IDS[0]].mean_reward == rows[0]["reward"]
+    assert summary.scenarios[SCENARIO_IDS[1]].count == 2
+
+
+def test_cli_verify_all_writes_rows_and_sampled_stacks(tmp_path):
+    output = tmp_path / "results.jsonl"
+    stacks = tmp_path / "stacks.collapsed"
+    result = subprocess.run(
+        [
+            sys.executable, "-m", "pa_bench_sdk.cli", "verify-all",
+            "--repeat", "20", "--workers", "1", "--output", str(output),
+            "--sample-profile", str(stacks), "--sample-interval", "0.001",
+        ],
+        capture_output=True,
+        text=True,
+    )
+
+    scenario_count = len(ScenarioLoader(Path("data")).list_scenarios())
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert len(rows) == 20 * scenario_count
+    assert result.returncode == 0
+    assert f"Verified {len(rows)} states (0 errors)" in result.stderr
+    lines = stacks.read_text().splitlines()
+    assert lines and all(line.startswith("scenario_") for line in lines)
@@ -0,0 +1,47 @@
+import asyncio
+
+from pa_bench_sdk.bench import Benchmark, compare
+from pa_bench_sdk.standin import StandinServer
+from pa_bench_sdk.worlds import WorldsClient
+
+SCENARIOS = ["scenario_001_multi_meeting_coordination", "scenario_007_meeting_rescheduling"]
+
+
+def test_bench_workloads_against_standin_clones():
+    async def run(pairs):
+        async with WorldsClient() as client:
+            bench = Benchmark("data", SCENARIOS, pairs, client)
+            rows = [
+                (await bench.run(workload, 2, requests=4)).summary()
+                for workload in ("load", "verify", "get-state", "cycle")
+            ]
+            return rows, await client.get_states(pairs[1])
+
+    with StandinServer() as standin:
+        rows, state = asyncio.run(run(standin.pairs(2)))
+
+    assert [(row["workload"], row["requests"], row["errors"]) for row in rows] == [
+        ("load", 4, 0), ("verify", 4, 0), ("get-state", 4, 0), ("cycle", 4, 0),
+    ]
+    assert all(row["p50_ms"] <= row["p95_ms"] <= row["p99_ms"] for row in rows)
+    assert all(row["throughput"] > 0 and row["rss_mb"] > 0 for row in rows)
+    assert "today" in state["gomail"] and "gocalendar" in state
+
+
+def test_compare_flags_regressions_beyond_the_margin():
+    baseline = [
+        {"workload": "load", "concurrency": 1, "throughput": 100.0, "p95_ms": 10.0},
+        {"workload": "verify", "concurrency": 1, "throughput": 100.0, "p95_ms": 10.0},
+    ]
+    rows = [
+        {"workload": "load", "concurrency": 1, "throughput": 95.0, "p95_ms": 10.5},
+        {"workload": "verify", "concurrency": 1, "throughput": 80.0, "p95_ms": 10.0},
+        {"workload": "verify", "concurrency": 4, "throughput": 1.0, "p95_ms": 99.0},
+    ]
+
+    changes = compare(rows, baseline, max_regression=0.1)
+
+    assert [(c["workload"], c["concurrency"], c["regressed"]) for c in changes] == [
+        ("load", 1, False), ("verify", 1, True),
+    ]
+    assert round(changes[1]["throughput_change"], 2) == -0.2
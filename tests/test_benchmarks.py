@@ -0,0 +1,171 @@
+"""
+Micro-benchmarks over the shipped scenarios, checked against stored thresholds.
+
+The thresholds are wall-clock timings from one machine, so the module only
+runs when `PA_BENCH_BENCHMARKS=1` is set; a plain `pytest` run skips it.
+Each benchmark keeps the best of several timed repeats (per call) and fails
+when it exceeds its threshold in `benchmarks.json` by more than
+`PA_BENCH_MARGIN` (a fraction, default 0.5). Run with
+`PA_BENCH_UPDATE_THRESHOLDS=1` to store the current timings instead, e.g.
+after an intended change or on new CI hardware. Timings swing by up to 2x
+between processes (set iteration order in some verifiers follows the hash
+seed), so the stored thresholds are the slowest of several such runs.
+Clone round trips go to the stand-in clones, so nothing touches the
+network.
+"""
+
+import asyncio
+import json
+import os
+import re
+import timeit
+from pathlib import Path
+
+import pytest
+
+from gordon import SpecEngine, compare_results
+from pa_bench_sdk.results import state_hash
+from pa_bench_sdk.scenario import ScenarioLoader
+from pa_bench_sdk.standin import StandinServer
+from pa_bench_sdk.verifier import VerifierRunner
+from pa_bench_sdk.worlds import WorldsClient, encode_payload
+
+if os.environ.get("PA_BENCH_BENCHMARKS") != "1":
+    pytest.skip("benchmarks run with PA_BENCH_BENCHMARKS=1", allow_module_level=True)
+
+DATA = Path("data")
+THRESHOLDS = Path(__file__).with_name("benchmarks.json")
+MARGIN = float(os.environ.get("PA_BENCH_MARGIN", "0.5"))
+UPDATE = os.environ.get("PA_BENCH_UPDATE_THRESHOLDS") == "1"
+
+LOADER = ScenarioLoader(DATA)
+SCENARIOS = LOADER.list_scenarios()
+FAMILIES = sorted({re.sub(r"^scenario_\d+_", "", scenario_id) for scenario_id in SCENARIOS})
+
+
+def _stored_state(scenario_id):
+    scenario = LOADER.load(scenario_id)
+    return {"gomail": scenario.gmail_state, "gocalendar": scenario.calendar_state}
+
+
+STATES = {scenario_id: _stored_state(scenario_id) for scenario_id in SCENARIOS}
+
+
+@pytest.fixture(scope="module")
+def benchmark():
+    stored = json.loads(THRESHOLDS.read_text()) if THRESHOLDS.exists() else {}
+    measured = {}
+
+    def check(name, function, number=1, repeat=5, setup="pass"):
+        seconds = min(timeit.repeat(function, setup=setup, number=number, repeat=repeat)) / number
+        measured[name] = seconds
+        if UPDATE:
+            return
+        threshold = stored.get(name)
+        if threshold is None:
+            pytest.fail(f"No stored threshold for {name}; run with PA_BENCH_UPDATE_THRESHOLDS=1")
+        assert seconds <= threshold * (1 + MARGIN), (
+            f"{name}: {seconds * 1e3:.3f} ms per call, threshold {threshold * 1e3:.3f} ms "
+            f"+{MARGIN:.0%}"
+        )
+
+    yield check
+    if UPDATE:
+        stored.update(measured)
+        THRESHOLDS.write_text(json.dumps(dict(sorted(stored.items())), indent=2) + "\n")
+
+
+@pytest.fixture(scope="module")
+def standin():
+    with StandinServer() as server:
+        yield server
+
+
+def _evict_page_cache():
+    for scenario_id in SCENARIOS:
+        for name in ("data.json", "task.json"):
+            fd = os.open(DATA / scenario_id / name, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+
+
+def _load_all():
+    for scenario_id in SCENARIOS:
+        LOADER.load(scenario_id)
+
+
+def test_load_cold(benchmark):
+    if not hasattr(os, "posix_fadvise"):  # e.g. macOS
+        pytest.skip("no posix_fadvise to evict the page cache with")
+    benchmark("load_cold", _load_all, setup=_evict_page_cache)
+
+
+def test_load_cached(benchmark):
+    _load_all()
+    benchmark("load_cached", _load_all)
+
+
+@pytest.mark.parametrize("family", FAMILIES)
+def test_verifier_family(benchmark, family):
+    runner = VerifierRunner(DATA)
+    scenario_ids = [scenario_id for scenario_id in SCENARIOS if scenario_id.endswith(family)]
+
+    def run():
+        for scenario_id in scenario_ids:
+            runner.run(scenario_id, STATES[scenario_id])
+
+    run()
+    benchmark(f"verify_{family}", run, number=20)
+
+
+def test_state_hash(benchmark):
+    states = list(STATES.values())
+    benchmark("state_hash", lambda: [state_hash(state) for state in states])
+
+
+def test_result_diff(benchmark):
+    runner = VerifierRunner(DATA)
+    engine = SpecEngine(DATA)
+    pairs = []
+    for scenario_id in SCENARIOS:
+        function = runner.load_validation_function(DATA / scenario_id / "verifier.py")
+        state = STATES[scenario_id]
+        pairs.append((function(state), engine.evaluate(scenario_id, state)))
+
+    benchmark(
+        "result_diff",
+        lambda: [compare_results(expected, actual) for expected, actual in pairs],
+        number=200,
+    )
+
+
+def test_json_encode(benchmark):
+    states = list(STATES.values())
+    benchmark("json_encode", lambda: [encode_payload(state) for state in states])
+
+
+def test_json_decode(benchmark):
+    bodies = [encode_payload(state) for state in STATES.values()]
+    benchmark("json_decode", lambda: [json.loads(body) for body in bodies])
+
+
+def test_standin_round_trip(benchmark, standin):
+    pair = standin.pairs(1)[0]
+    loop = asyncio.new_event_loop()
+    client = WorldsClient()
+    state = STATES[SCENARIOS[0]]
+    bodies = encode_payload(state["gomail"]), encode_payload(state["gocalendar"])
+
+    async def round_trip():
+        await client.set_states(pair, *bodies)
+        await client.get_states(pair)
+
+    try:
+        loop.run_until_complete(client.open())
+        loop.run_until_complete(round_trip())
+        benchmark("standin_round_trip", lambda: loop.run_until_complete(round_trip()), number=5)
+    finally:
+        loop.run_until_complete(client.close())
+        loop.close()
@@ -1,7 +1,14 @@
 import asyncio
+import gc
+import json
+import os
+import subprocess
+import sys
 from pathlib import Path
 from unittest.mock import AsyncMock, patch
 
+import pytest
+
 from pa_bench_sdk.cli import (
     CLIArgs,
     run_load,
@@ -76,3 +83,149 @@ def test_cli_verify_fetches_states(
     args = make_args()
     asyncio.run(run_verify(args))
     mock_client.get_states.assert_awaited_once()
+
+
+@patch("pa_bench_sdk.cli.resolve_instance_urls", new_callable=AsyncMock)
+@patch("pa_bench_sdk.cli.VerifierRunner")
+def test_cli_verify_retrieves_import_error_when_resolve_fails(mock_verifier_runner, mock_resolve):
+    async def unreachable(**kwargs):
+        await asyncio.sleep(0.05)
+        raise ConnectionError("worlds unreachable")
+
+    mock_resolve.side_effect = unreachable
+    mock_verifier_runner.return_value.load_validation_function.side_effect = ImportError("broken")
+    unhandled = []
+
+    async def main():
+        asyncio.get_running_loop().set_exception_handler(
+            lambda loop, context: unhandled.append(context["message"])
+        )
+        try:
+            await run_verify(make_args())
+        except ConnectionError:
+            pass
+        else:
+            raise AssertionError("resolve error was swallowed")
+        gc.collect()
+
+    asyncio.run(main())
+    assert unhandled == []
+
+
+# Cumulative import time of everything a command imports, interpreter
+# startup (site, encodings) included.
+IMPORT_BUDGET_MS = float(os.environ.get("PA_BENCH_IMPORT_BUDGET_MS", "90"))
+OFFLINE_EXCLUDED = ("aiohttp", "asyncio", "multiprocessing", "gordon.spec")
+
+
+def _import_times(*args):
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+    )
+    # `verify` exits 1 when a check fails, as the stored states do.
+    assert completed.returncode in (0, 1), completed.stderr
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(cumulative) / 1000, not name.startswith("  "))
+    return times
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        ["--help"],
+        ["verify", FIXTURE_SCENARIO, "--state-file", "{state_file}"],
+    ],
+    ids=["help", "verify-state-file"],
+)
+def test_offline_commands_skip_heavy_imports_within_budget(command, tmp_path):
+    scenario = ScenarioLoader(Path("data")).load(FIXTURE_SCENARIO)
+    state_file = tmp_path / "state.json"
+    state_file.write_text(
+        json.dumps({"gomail": scenario.gmail_state, "gocalendar": scenario.calendar_state})
+    )
+    command = [part.format(state_file=state_file) for part in command]
+
+    times = _import_times("-m", "pa_bench_sdk.cli", *command)
+
+    excluded = [
+        name
+        for name in times
+        if any(name == module or name.startswith(module + ".") for module in OFFLINE_EXCLUDED)
+    ]
+    assert excluded == []
+    total_ms = sum(ms for ms, top_level in times.values() if top_level)
+    assert total_ms < IMPORT_BUDGET_MS
+
+
+def test_package_attributes_load_lazily():
+    code = (
+        "import sys, pa_bench_sdk; "
+        "assert 'pa_bench_sdk.worlds' not in sys.modules; "
+        "pa_bench_sdk.WorldsClient; "
+        "assert 'pa_bench_sdk.worlds' in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+@patch("pa_bench_sdk.cli.resolve_instance_urls", new_callable=AsyncMock)
+@patch("pa_bench_sdk.cli.WorldsClient")
+def test_cli_verify_skips_baseline_and_reports_stages(
+    mock_world_client, mock_resolve, capsys
+):
+    mock_resolve.return_value = InstanceEndpoints(
+        gmail_clone="http://gomail.instance",
+        calendar_clone="http://gocalendar.instance",
+    )
+    scenario = ScenarioLoader(Path("data")).load(FIXTURE_SCENARIO)
+    mock_client = mock_world_client.return_value
+    mock_client.get_states = AsyncMock(
+        return_value={
+            "gomail": scenario.gmail_state,
+            "gocalendar": scenario.calendar_state,
+        }
+    )
+
+    with patch.object(ScenarioLoader, "load", side_effect=AssertionError("parsed data.json")):
+        try:
+            asyncio.run(run_verify(make_args()))
+        except SystemExit:
+            pass
+
+    output = capsys.readouterr().out
+    assert "Reward: 0.0" in output
+    latency = next(line for line in output.splitlines() if "Latency:" in line)
+    for stage in ("resolve", "fetch", "import (overlapped)", "verify", "total"):
+        assert stage in latency
+
+
+def test_cli_profile_writes_stage_reports_and_summary(tmp_path):
+    scenario = ScenarioLoader(Path("data")).load(FIXTURE_SCENARIO)
+    state_file = tmp_path / "state.json"
+    state_file.write_text(
+        json.dumps({"gomail": scenario.gmail_state, "gocalendar": scenario.calendar_state})
+    )
+    profile_dir = tmp_path / "profiles"
+
+    result = subprocess.run(
+        [
+            sys.executable, "-m", "pa_bench_sdk.cli",
+            "--profile", "cprofile", "--profile-dir", str(profile_dir), "--timings",
+            "verify", FIXTURE_SCENARIO, "--state-file", str(state_file),
+        ],
+        capture_output=True,
+        text=True,
+    )
+
+    for stage in ("import", "read", "verify"):
+        assert (profile_dir / f"{stage}.pstats").exists()
+        collapsed = (profile_dir / f"{stage}.collapsed").read_text().splitlines()
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in collapsed)
+    table = result.stderr.splitlines()
+    assert table[0].split()[:3] == ["stage", "wall", "ms"]
+    assert any(line.startswith("verify ") and "verify.pstats" in line for line in table)
@@ -0,0 +1,141 @@
+import multiprocessing
+import threading
+import time
+from multiprocessing.connection import Client
+from pathlib import Path
+
+import pytest
+
+from pa_bench_sdk.batch import baseline_records
+from pa_bench_sdk.distributed import Coordinator, StateFile, run_worker
+from pa_bench_sdk.stream import verify_stream
+
+
+AUTHKEY = b"test-secret"
+SCENARIO_IDS = ["scenario_003_meeting_modification", "scenario_007_meeting_rescheduling"]
+
+
+@pytest.fixture
+def slow_dir(tmp_path):
+    scenario = tmp_path / "slow"
+    scenario.mkdir()
+    (scenario / "verifier.py").write_text(
+        "import time\n"
+        "from gordon import TaskVerifier\n\n"
+        "def validation_function(state):\n"
+        "    time.sleep(0.3)\n"
+        "    return 1.0, [TaskVerifier(name='ok', verdict=True, reason=str(state['n']))]\n"
+    )
+    return tmp_path
+
+
+def _start_workers(address, data_path, count, **kwargs):
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=run_worker, args=(address, AUTHKEY, str(data_path)), kwargs=kwargs)
+        for _ in range(count)
+    ]
+    for process in processes:
+        process.start()
+    return processes
+
+
+def test_worker_processes_match_local_verification():
+    local = list(verify_stream(baseline_records(Path("data"), SCENARIO_IDS, 3), Path("data")))
+
+    with Coordinator(authkey=AUTHKEY) as coordinator:
+        processes = _start_workers(coordinator.address, "data", 3, workers=0, capacity=1)
+        remote = list(
+            verify_stream(baseline_records(Path("data"), SCENARIO_IDS, 3), Path("data"), coordinator)
+        )
+    for process in processes:
+        process.join(10)
+        assert process.exitcode == 0
+
+    # Check reasons may list set members in a per-process hash order.
+    def outcome(row):
+        verdicts = [(check["name"], check["verdict"]) for check in row["checks"]]
+        return row["id"], row["reward"], row["passed"], verdicts
+
+    assert [outcome(row) for row in remote] == [outcome(row) for row in local]
+    assert coordinator.stats.completed == len(local)
+    assert sum(coordinator.stats.workers.values()) == len(local)
+
+
+def test_lost_worker_tasks_are_released_to_others(slow_dir, tmp_path):
+    state_file = tmp_path / "state.json"
+    state_file.write_text('{"n": 99}')
+    with Coordinator(authkey=AUTHKEY) as coordinator:
+        futures = [coordinator.submit("slow", {"n": n}) for n in range(5)]
+        futures.append(coordinator.submit("slow", StateFile(str(state_file))))
+        [doomed] = _start_workers(coordinator.address, slow_dir, 1, workers=0, capacity=6)
+        deadline = time.monotonic() + 30
+        while coordinator.stats.leased < 6 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        doomed.kill()
+        doomed.join()
+        survivors = _start_workers(coordinator.address, slow_dir, 2, workers=0, capacity=2)
+        reasons = [future.result(timeout=30).to_dict()["checks"][0]["reason"] for future in futures]
+    for process in survivors:
+        process.join(10)
+
+    assert reasons == ["0", "1", "2", "3", "4", "99"]
+    assert coordinator.stats.released == 6
+    assert coordinator.stats.completed == 6
+
+
+def test_expired_lease_is_reissued_and_late_result_dropped(slow_dir):
+    with Coordinator(authkey=AUTHKEY, lease_timeout=0.2) as coordinator:
+        future = coordinator.submit("slow", {"n": 1})
+        hung = Client(coordinator.address, authkey=AUTHKEY)
+        hung.send(("hello", "hung", 1))
+        hung.send(("lease", 1, True))
+        [(task_id, _, _)] = hung.recv()[1]
+
+        thread = threading.Thread(
+            target=run_worker, args=(coordinator.address, AUTHKEY, slow_dir), kwargs={"name": "live"}
+        )
+        thread.start()
+        result = future.result(timeout=10)
+
+        hung.send(("results", [(task_id, "error", "too late")]))
+        assert hung.recv() == ("ok", [])
+        hung.close()
+    thread.join(10)
+
+    assert result.reward == 1.0
+    assert coordinator.stats.expired == 1
+    assert coordinator.stats.duplicates == 1
+    assert coordinator.stats.workers["live"] == 1
+
+
+def test_coordinator_rejects_wrong_authkey():
+    with Coordinator(authkey=AUTHKEY) as coordinator:
+        with pytest.raises(multiprocessing.AuthenticationError):
+            Client(coordinator.address, authkey=b"wrong")
+
+
+def test_idle_worker_steals_from_a_backlog(slow_dir):
+    with Coordinator(authkey=AUTHKEY) as coordinator:
+        futures = [coordinator.submit("slow", {"n": n}) for n in range(4)]
+        busy = threading.Thread(
+            target=run_worker,
+            args=(coordinator.address, AUTHKEY, slow_dir),
+            kwargs={"capacity": 4, "name": "busy"},
+        )
+        busy.start()
+        deadline = time.monotonic() + 10
+        while coordinator.stats.leased < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        idle = threading.Thread(
+            target=run_worker, args=(coordinator.address, AUTHKEY, slow_dir), kwargs={"name": "idle"}
+        )
+        idle.start()
+        rewards = [future.result(timeout=10).reward for future in futures]
+    busy.join(10)
+    idle.join(10)
+
+    assert rewards == [1.0] * 4
+    assert coordinator.stats.stolen == 2
+    assert coordinator.stats.workers == {"busy": 2, "idle": 2}
+    assert coordinator.stats.duplicates == 0
@@ -0,0 +1,53 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from gordon import SpecEngine, compare_results
+from pa_bench_sdk.generate import ScaleOptions, generate_scenario, resolve_templates
+from pa_bench_sdk.scenario import ScenarioLoader
+from pa_bench_sdk.verifier import VerifierRunner
+
+DATA = Path("data")
+OPTIONS = ScaleOptions(emails=600, threads=40, events=300, users=50, events_per_user=70)
+
+
+FAMILIES = ["meeting_modification", "cascading_changes", "meeting_rescheduling"]
+
+
+@pytest.mark.parametrize("template", resolve_templates(DATA, FAMILIES))
+def test_generated_scenario_scores_like_its_template(tmp_path, template):
+    target = generate_scenario(DATA, template, tmp_path, OPTIONS)
+    original = ScenarioLoader(DATA).load(template)
+    scaled = ScenarioLoader(tmp_path).load(target.name)
+
+    emails = scaled.gmail_state["emails"]
+    others = scaled.calendar_state["otherUsersEvents"]
+    assert len(emails) == 600 and len(scaled.calendar_state["events"]) == 300
+    assert emails[: len(original.gmail_state["emails"])] == original.gmail_state["emails"]
+    assert len({email["threadId"] for email in emails[len(original.gmail_state["emails"]):]}) == 40
+    assert len(others) == 50 and all(len(events) >= 70 for events in others.values())
+    assert len(scaled.calendar_state["userDirectory"]) >= 50
+
+    expected = VerifierRunner(DATA).run(original)
+    result = VerifierRunner(tmp_path).run(scaled)
+    assert result.reward == expected.reward
+    assert [c["verdict"] for c in result.to_dict()["checks"]] == [
+        c["verdict"] for c in expected.to_dict()["checks"]
+    ]
+    state = {"gomail": scaled.gmail_state, "gocalendar": scaled.calendar_state}
+    function = VerifierRunner(tmp_path).load_validation_function(target / "verifier.py")
+    assert compare_results(function(state), SpecEngine(tmp_path).evaluate(target.name, state)) == []
+
+
+def test_generation_is_seeded(tmp_path):
+    template = "scenario_005_conflict_detection"
+    first = generate_scenario(DATA, template, tmp_path, OPTIONS, name="a")
+    second = generate_scenario(DATA, template, tmp_path, OPTIONS, name="b")
+    other = generate_scenario(DATA, template, tmp_path, ScaleOptions(emails=600, seed=1), name="c")
+
+    assert (first / "data.json").read_bytes() == (second / "data.json").read_bytes()
+    assert json.loads((other / "data.json").read_text())["gomail"]["emails"][-1] != json.loads(
+        (first / "data.json").read_text()
+    )["gomail"]["emails"][-1]
+    assert (first / "spec.json").read_text() == (DATA / template / "spec.json").read_text()
@@ -0,0 +1,149 @@
+import asyncio
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from pa_bench_sdk.batch import BatchCheckpoint, LoadTask, load_batch
+from pa_bench_sdk.journal import ProgressJournal, Shard, work_key
+from pa_bench_sdk.scenario import ScenarioLoader
+from pa_bench_sdk.worlds import InstanceEndpoints, WorldsClient
+
+
+def test_journal_survives_torn_line_and_skips_completed(tmp_path):
+    path = tmp_path / "progress.journal"
+    with ProgressJournal(path, sync_every=2) as journal:
+        journal.record(work_key("s1", "i1", 0))
+        journal.record(work_key("s1", "i1", 1))
+    with open(path, "a") as handle:
+        handle.write('["s1", "i1", "2"')  # crash in the middle of an append
+
+    with ProgressJournal(path) as journal:
+        assert len(journal) == 2
+        assert work_key("s1", "i1", 1) in journal
+        journal.record(work_key("s1", "i1", 2))
+
+    lines = path.read_text().splitlines()
+    assert [json.loads(line) for line in lines] == [["s1", "i1", "0"], ["s1", "i1", "1"], ["s1", "i1", "2"]]
+
+
+def test_resume_cuts_output_and_journal_back_to_the_last_sync(tmp_path):
+    path = tmp_path / "progress.journal"
+    output = tmp_path / "rows.jsonl"
+    journal = ProgressJournal(path, sync_every=2, sync_interval=3600)
+    sink = open(output, "a", encoding="utf-8")
+    journal.track_output(sink)
+    for n in range(3):
+        sink.write(json.dumps({"id": n}) + "\n")
+        journal.record(work_key("s1", "i1", n))
+    # The process dies after row 2 and its key reached the files but before
+    # they were synced together.
+    sink.close()
+    journal._handle.close()
+
+    resumed = ProgressJournal(path)
+    sink = open(output, "a", encoding="utf-8")
+    resumed.track_output(sink)
+    assert sorted(resumed.completed) == [work_key("s1", "i1", 0), work_key("s1", "i1", 1)]
+    sink.write(json.dumps({"id": 2}) + "\n")
+    resumed.record(work_key("s1", "i1", 2))
+    resumed.close()
+    sink.close()
+
+    assert [json.loads(line)["id"] for line in output.read_text().splitlines()] == [0, 1, 2]
+    assert len(ProgressJournal(path)) == 3
+
+
+def test_shards_partition_keys_deterministically():
+    keys = [work_key(f"scenario_{n % 7}", "-", n) for n in range(1000)]
+    shards = [Shard.parse(f"{index}/4") for index in range(4)]
+    owners = [[shard.owns(key) for shard in shards].count(True) for key in keys]
+
+    assert owners == [1] * len(keys)
+    assert all(200 < sum(shard.owns(key) for key in keys) < 300 for shard in shards)
+    with pytest.raises(ValueError):
+        Shard.parse("4/4")
+
+
+def _verify_all(tmp_path, *extra):
+    return subprocess.run(
+        [
+            sys.executable, "-m", "pa_bench_sdk.cli", "verify-all",
+            "--scenario", "scenario_003_meeting_modification",
+            "--scenario", "scenario_007_meeting_rescheduling",
+            "--repeat", "5", "--workers", "0",
+            "--output", str(tmp_path / "rows.jsonl"),
+            "--journal", str(tmp_path / "progress.journal"),
+            *extra,
+        ],
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_cli_verify_all_resumes_and_shards(tmp_path):
+    first = _verify_all(tmp_path, "--shard", "0/2")
+    second = _verify_all(tmp_path, "--shard", "1/2")
+    third = _verify_all(tmp_path)
+
+    ids = [json.loads(line)["id"] for line in (tmp_path / "rows.jsonl").read_text().splitlines()]
+    assert sorted(ids) == sorted(
+        f"{scenario}/{n}"
+        for scenario in ("scenario_003_meeting_modification", "scenario_007_meeting_rescheduling")
+        for n in range(5)
+    )
+    assert "other-shard" in first.stderr and "other-shard" in second.stderr
+    assert "Verified 0 states" in third.stderr
+    assert "Skipped 10 completed" in third.stderr
+
+
+async def _load_into_fake_clones(journal_path):
+    seen = []
+
+    async def set_state(request):
+        seen.append(request.url.port)
+        return web.json_response({"ok": True})
+
+    app = web.Application(client_max_size=64 * 1024 ** 2)
+    app.router.add_post("/api/set_state", set_state)
+    async with TestServer(app) as server:
+        base = str(server.make_url("")).rstrip("/")
+        tasks = [
+            LoadTask("scenario_003_meeting_modification", base, base, instance=f"pair-{n}")
+            for n in range(4)
+        ]
+        checkpoint = BatchCheckpoint(ProgressJournal(journal_path))
+
+        async def unused_endpoints() -> InstanceEndpoints:
+            raise AssertionError("every task has its own URLs")
+
+        async with WorldsClient() as client:
+            rows = [
+                row
+                async for row in load_batch(
+                    tasks, ScenarioLoader(Path("data")), client, unused_endpoints, 2, checkpoint
+                )
+            ]
+            checkpoint.close()
+            resumed = BatchCheckpoint(ProgressJournal(journal_path))
+            again = [
+                row
+                async for row in load_batch(
+                    tasks, ScenarioLoader(Path("data")), client, unused_endpoints, 2, resumed
+                )
+            ]
+            resumed.close()
+        return rows, again, resumed.skipped_done, len(seen)
+
+
+def test_load_batch_journals_loaded_instances(tmp_path):
+    rows, again, skipped, requests = asyncio.run(_load_into_fake_clones(tmp_path / "load.journal"))
+
+    assert sorted(row["instance"] for row in rows) == [f"pair-{n}" for n in range(4)]
+    assert not any("error" in row for row in rows)
+    assert again == [] and skipped == 4
+    assert requests == 8
@@ -0,0 +1,100 @@
+import asyncio
+import json
+from pathlib import Path
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from pa_bench_sdk import metrics
+from pa_bench_sdk.metrics import MetricsDumper, MetricsRegistry
+from pa_bench_sdk.scenario import ScenarioLoader
+from pa_bench_sdk.server import VerificationService
+
+
+SCENARIO_ID = "scenario_003_meeting_modification"
+
+
+def test_histogram_quantiles_merge_and_drain():
+    worker, parent = MetricsRegistry(), MetricsRegistry()
+    for registry in (worker, parent):
+        histogram = registry.histogram("latency_seconds", "Latency", ("operation",))
+        for value in [0.001] * 90 + [0.1] * 10:
+            histogram.labels("get").observe(value)
+        histogram.labels("get").observe(0)
+    worker.counter("calls_total", "Calls").inc(3)
+
+    series = parent.metrics["latency_seconds"].labels("get")
+    assert 0.001 <= series.quantile(0.5) < 0.001 * 1.2
+    assert 0.1 <= series.quantile(0.99) < 0.1 * 1.2
+
+    parent.merge(worker.drain())
+    assert worker.drain() is None
+    merged = parent.to_json()
+    assert merged["calls_total"]["series"][0]["value"] == 3
+    entry = merged["latency_seconds"]["series"][0]
+    assert (entry["count"], entry["zero"]) == (202, 2)
+    assert abs(entry["sum"] - 2.18) < 1e-9
+    assert sum(entry["buckets"].values()) == 200
+
+
+def test_prometheus_text_is_cumulative_and_escaped():
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests", ("path",)).labels('a"b\\c\n').inc(2)
+    histogram = registry.histogram("seconds", "Seconds", ("op",))
+    histogram.labels("fast").observe(0.01)
+    histogram.labels("slow").observe(1.0)
+
+    lines = registry.render_prometheus().splitlines()
+
+    assert "# TYPE seconds histogram" in lines
+    assert 'requests_total{path="a\\"b\\\\c\\n"} 2' in lines
+    fast = [line for line in lines if line.startswith('seconds_bucket{op="fast"')]
+    slow = [line for line in lines if line.startswith('seconds_bucket{op="slow"')]
+    assert len(fast) == len(slow)
+    assert [int(line.rsplit(" ", 1)[1]) for line in fast] == [1] * len(fast)
+    assert slow[0].endswith(" 0") and slow[-1] == 'seconds_bucket{op="slow",le="+Inf"} 1'
+    assert 'seconds_count{op="slow"} 1' in lines
+
+
+def test_prometheus_text_keeps_large_counters_exact():
+    registry = MetricsRegistry()
+    registry.counter("bytes_total", "Bytes").labels().inc(12345678)
+    registry.counter("bytes_total", "Bytes").labels().inc(1)
+    histogram = registry.histogram("seconds", "Seconds")
+    histogram.labels().observe(1234567.25)
+    histogram.labels().observe(0.1)
+
+    lines = registry.render_prometheus().splitlines()
+
+    assert "bytes_total 12345679" in lines
+    assert "seconds_sum 1234567.35" in lines
+
+
+async def _exercise_metrics_endpoint(state):
+    service = VerificationService(Path("data"), workers=1)
+    await service.start()
+    try:
+        async with TestClient(TestServer(service.app())) as client:
+            for _ in range(3):
+                await client.post("/verify", json={"scenario_id": SCENARIO_ID, "state": state})
+            response = await client.get("/metrics")
+            return response.headers["Content-Type"], await response.text()
+    finally:
+        await service.close()
+
+
+def test_serve_exposes_metrics_recorded_in_pool_workers(tmp_path):
+    scenario = ScenarioLoader(Path("data")).load(SCENARIO_ID)
+    state = {"gomail": scenario.gmail_state, "gocalendar": scenario.calendar_state}
+    metrics.REGISTRY.clear()
+
+    content_type, text = asyncio.run(_exercise_metrics_endpoint(state))
+
+    assert content_type.startswith("text/plain; version=0.0.4")
+    lines = text.splitlines()
+    assert f'pa_bench_verifications_total{{scenario_id="{SCENARIO_ID}",outcome="failed"}} 3' in lines
+    assert f'pa_bench_verifier_seconds_count{{scenario_id="{SCENARIO_ID}"}} 3' in lines
+
+    dump = tmp_path / "metrics.json"
+    MetricsDumper(dump, interval=60).start().stop()
+    series = json.loads(dump.read_text())["pa_bench_verifier_seconds"]["series"][0]
+    assert series["count"] == 3 and series["p50"] > 0
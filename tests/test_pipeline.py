@@ -0,0 +1,135 @@
+import asyncio
+import multiprocessing
+import shutil
+from pathlib import Path
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from pa_bench_sdk.batch import baseline_records
+from pa_bench_sdk.distributed import Coordinator, run_worker
+from pa_bench_sdk.pipeline import Episode, EpisodePipeline, PipelineLimits
+from pa_bench_sdk.stream import verify_stream
+from pa_bench_sdk.worlds import InstanceEndpoints, WorldsClient
+
+
+SCENARIO_IDS = ["scenario_003_meeting_modification", "scenario_007_meeting_rescheduling"]
+
+
+def _fake_clones():
+    states = {}
+
+    async def set_state(request):
+        states[request.match_info["pair"], request.match_info["clone"]] = await request.json()
+        return web.json_response({"ok": True})
+
+    async def get_state(request):
+        return web.json_response(states[request.match_info["pair"], request.match_info["clone"]])
+
+    app = web.Application(client_max_size=64 * 1024 ** 2)
+    app.router.add_post("/{pair}/{clone}/api/set_state", set_state)
+    app.router.add_get("/{pair}/{clone}/api/get_state", get_state)
+    return app
+
+
+async def _run_pipeline(episodes, agent, pairs=3, data_path=Path("data"), **options):
+    async with TestServer(_fake_clones()) as server:
+        base = str(server.make_url("")).rstrip("/")
+        endpoints = [
+            InstanceEndpoints(f"{base}/pair{n}/gomail", f"{base}/pair{n}/gocalendar")
+            for n in range(pairs)
+        ]
+        async with WorldsClient() as client:
+            options.setdefault("limits", PipelineLimits(verify=2))
+            pipeline = EpisodePipeline(endpoints, agent, client, data_path, **options)
+            return [episode async for episode in pipeline.run(episodes)]
+
+
+def test_pipeline_keeps_every_pair_busy_and_scores_fetched_states():
+    running = set()
+    peak = 0
+
+    async def agent(episode):
+        nonlocal peak
+        running.add(episode.endpoints.gmail_clone)
+        peak = max(peak, len(running))
+        await asyncio.sleep(0.05)
+        running.discard(episode.endpoints.gmail_clone)
+        return episode.metadata.description
+
+    episodes = [Episode(scenario_id, rollout) for scenario_id in SCENARIO_IDS for rollout in range(6)]
+    done = asyncio.run(_run_pipeline(episodes, agent))
+
+    expected = {
+        row["scenario_id"]: row["reward"]
+        for row in verify_stream(baseline_records(Path("data"), SCENARIO_IDS), Path("data"))
+    }
+    assert sorted((e.scenario_id, e.rollout) for e in done) == sorted(
+        (e.scenario_id, e.rollout) for e in episodes
+    )
+    assert all(e.error is None and e.output for e in done)
+    assert {e.scenario_id: e.result.reward for e in done} == expected
+    assert peak == 3
+    row = done[0].to_dict()
+    assert {"load_seconds", "agent_seconds", "fetch_seconds", "verify_seconds"} <= set(row)
+
+
+def test_pipeline_reports_failed_stages_and_continues():
+    async def agent(episode):
+        if episode.rollout == 1:
+            raise RuntimeError("agent gave up")
+
+    episodes = [
+        Episode("scenario_003_meeting_modification", 0),
+        Episode("scenario_003_meeting_modification", 1),
+        Episode("scenario_999_missing", 0),
+        Episode("scenario_007_meeting_rescheduling", 0),
+    ]
+    done = {(e.scenario_id, e.rollout): e for e in asyncio.run(_run_pipeline(episodes, agent, 2))}
+
+    assert done["scenario_003_meeting_modification", 1].stage == "agent"
+    assert "agent gave up" in done["scenario_003_meeting_modification", 1].error
+    assert done["scenario_999_missing", 0].stage == "prepare"
+    assert done["scenario_003_meeting_modification", 0].result is not None
+    assert done["scenario_007_meeting_rescheduling", 0].to_dict()["reward"] == 0.75
+
+
+def test_pipeline_overlaps_verifications_on_a_coordinator(tmp_path):
+    scenario = tmp_path / "slow"
+    shutil.copytree(Path("data") / SCENARIO_IDS[0], scenario)
+    (scenario / "verifier.py").write_text(
+        "import time\n"
+        "from gordon import TaskVerifier\n\n"
+        "def validation_function(state):\n"
+        "    started = time.time()\n"
+        "    time.sleep(0.3)\n"
+        "    return 1.0, [TaskVerifier('ok', True, f'{started} {time.time()}')]\n"
+    )
+
+    async def agent(episode):
+        return None
+
+    context = multiprocessing.get_context("spawn")
+    with Coordinator(authkey=b"test-secret") as coordinator:
+        workers = [
+            context.Process(
+                target=run_worker,
+                args=(coordinator.address, b"test-secret", str(tmp_path)),
+                kwargs={"workers": 0, "capacity": 1},
+            )
+            for _ in range(2)
+        ]
+        for worker in workers:
+            worker.start()
+        episodes = [Episode("slow", rollout) for rollout in range(4)]
+        done = asyncio.run(
+            _run_pipeline(episodes, agent, 2, tmp_path, verifier=coordinator, limits=None)
+        )
+    for worker in workers:
+        worker.join(10)
+
+    assert all(episode.error is None for episode in done)
+    spans = sorted(
+        tuple(map(float, episode.result.details["checks"][0].reason.split())) for episode in done
+    )
+    assert any(later[0] < earlier[1] for earlier, later in zip(spans, spans[1:]))
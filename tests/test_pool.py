@@ -0,0 +1,93 @@
+from pathlib import Path
+
+import pytest
+
+from pa_bench_sdk.pool import (
+    PoolLimits,
+    VerifierCrashed,
+    VerifierFailed,
+    VerifierLimitExceeded,
+    VerifierPool,
+    VerifierTimeout,
+)
+from pa_bench_sdk.scenario import ScenarioLoader
+from pa_bench_sdk.verifier import VerifierRunner
+
+
+VERIFIERS = {
+    "ok": "return 1.0, [TaskVerifier(name='ok', verdict=True, reason='fine')]",
+    "slow": "import time; time.sleep(30)",
+    "crash": "import os; os._exit(3)",
+    "spin": "while True: pass",
+    "raises": "raise ValueError('bad state')",
+    "hog": "return 0.0, [bytearray(2 * 1024 ** 3)]",
+}
+
+
+@pytest.fixture
+def verifier_dir(tmp_path):
+    for name, body in VERIFIERS.items():
+        scenario = tmp_path / name
+        scenario.mkdir()
+        (scenario / "verifier.py").write_text(
+            "from gordon import TaskVerifier\n\n"
+            "def validation_function(state):\n"
+            f"    {body}\n"
+        )
+    return tmp_path
+
+
+def test_pool_matches_in_process_runner():
+    scenario_id = "scenario_003_meeting_modification"
+    scenario = ScenarioLoader(Path("data")).load(scenario_id)
+    state = {"gomail": scenario.gmail_state, "gocalendar": scenario.calendar_state}
+    expected = VerifierRunner(Path("data")).run(scenario, state=state)
+
+    with VerifierPool("data", workers=2, scenario_ids=[scenario_id]) as pool:
+        results = pool.map([(scenario_id, state)] * 3)
+
+    for result in results:
+        assert result.reward == expected.reward
+        assert result.details["queue_seconds"] >= 0
+        assert result.details["exec_seconds"] > 0
+    assert pool.stats.completed == 3
+
+
+def test_pool_recycles_failed_workers(verifier_dir):
+    limits = PoolLimits(timeout=5.0, cpu_seconds=1, memory_bytes=256 * 1024 ** 2)
+    with VerifierPool(verifier_dir, workers=1, limits=limits) as pool:
+        (first_pid,) = pool.pids()
+        with pytest.raises(VerifierTimeout):
+            pool.run("slow", {})
+        with pytest.raises(VerifierCrashed, match=r"\(exit code 3\)"):
+            pool.run("crash", {})
+        with pytest.raises(VerifierLimitExceeded):
+            pool.run("spin", {})
+        with pytest.raises(VerifierLimitExceeded):
+            pool.run("hog", {})
+        with pytest.raises(VerifierFailed, match="bad state"):
+            pool.run("raises", {})
+        assert pool.run("ok", {}).passed
+        assert pool.pids() != [first_pid]
+
+    stats = pool.stats.summary()
+    assert (stats["timeouts"], stats["crashes"], stats["limit_errors"]) == (1, 1, 2)
+    assert stats["restarts"] == 4
+
+
+def test_fork_server_preloads_and_recycles(verifier_dir):
+    with VerifierPool(verifier_dir, workers=2, fork_server=True) as pool:
+        assert all(pid in pool.memory() for pid in pool.pids())
+        with pytest.raises(VerifierCrashed, match=r"worker pid \d+ died running crash"):
+            pool.run("crash", {})
+        assert pool.run("ok", {}).passed
+
+    assert pool.stats.restarts == 1
+    assert pool.stats.summary()["spawn"]["count"] == 3
+
+
+def test_fork_server_verifies_preloaded_scenarios():
+    scenario_id = "scenario_007_meeting_rescheduling"
+    expected = VerifierRunner(Path("data")).run(ScenarioLoader(Path("data")).load(scenario_id))
+    with VerifierPool("data", workers=1, scenario_ids=[scenario_id], fork_server=True) as pool:
+        assert pool.run(scenario_id).reward == expected.reward
@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+import pytest
+from aiohttp.test_utils import TestServer
+
+from pa_bench_sdk import metrics
+from pa_bench_sdk.projection import Projection
+from pa_bench_sdk.scenario import ScenarioLoader
+from pa_bench_sdk.standin import FIELDS_PARAM, standin_app, standin_pairs
+from pa_bench_sdk.worlds import WorldsClient
+
+
+SCENARIO_ID = "scenario_009_meeting_cancellation"
+
+
+def test_projection_keeps_only_declared_paths():
+    projection = Projection(["gocalendar.events", "gocalendar.events.title", "gomail", "extra"])
+    state = {
+        "gomail": {"emails": [1], "contacts": [2]},
+        "gocalendar": {"events": [3], "viewState": {}},
+        "extra": 4,
+        "other": 5,
+    }
+
+    assert projection.clones == ("gomail", "gocalendar")
+    assert (projection.fields("gomail"), projection.fields("gocalendar")) == (None, ["events"])
+    assert projection.apply(state) == {
+        "gomail": {"emails": [1], "contacts": [2]},
+        "gocalendar": {"events": [3]},
+        "extra": 4,
+    }
+    with pytest.raises(ValueError):
+        Projection(["gocalendar..events"])
+
+
+@pytest.mark.parametrize("fields_param", [FIELDS_PARAM, None])
+def test_get_states_fetches_only_projected_clones_and_fields(fields_param):
+    payloads = ScenarioLoader("data").load(SCENARIO_ID).clone_payloads()
+    projection = Projection(["gocalendar.events"])
+    metrics.REGISTRY.clear()
+
+    async def exercise():
+        async with TestServer(standin_app()) as server:
+            (pair,) = standin_pairs(str(server.make_url("")), 1)
+            async with WorldsClient(fields_param=fields_param) as client:
+                await client.set_states(pair, payloads["gomail"], payloads["gocalendar"])
+                return await client.get_states(pair, projection)
+
+    state = asyncio.run(exercise())
+
+    assert state == {"gocalendar": {"events": payloads["gocalendar"]["events"]}}
+    snapshot = metrics.REGISTRY.snapshot()
+    requests = snapshot["pa_bench_http_requests_total"]["series"]
+    assert [entry["value"] for entry in requests if entry["labels"][0] == "get_state"] == [1]
+    (received,) = [
+        entry["value"]
+        for entry in snapshot["pa_bench_http_received_bytes_total"]["series"]
+        if entry["labels"] == ["get_state"]
+    ]
+    calendar_bytes = len(json.dumps(payloads["gocalendar"]))
+    if fields_param is None:
+        assert received == calendar_bytes
+    else:
+        assert received == len(json.dumps({"events": payloads["gocalendar"]["events"]}))
+
+
+def test_slim_and_projected_load_profiles():
+    loader = ScenarioLoader("data")
+    full = loader.load(SCENARIO_ID)
+    slim = loader.load(SCENARIO_ID, "slim")
+    projected = loader.load(SCENARIO_ID, Projection(["gomail.emails"]))
+
+    assert "viewState" in full.calendar_state and "viewState" not in slim.calendar_state
+    assert "contacts" not in slim.gmail_state and "avatar" not in slim.gmail_state["user"]
+    assert slim.calendar_state["events"] == full.calendar_state["events"]
+    assert projected.gmail_state == {"emails": full.gmail_state["emails"]}
+    assert projected.calendar_state == {}
+    with pytest.raises(ValueError):
+        slim.clone_payloads()
+    with pytest.raises(ValueError):
+        loader.load(SCENARIO_ID, "tiny")
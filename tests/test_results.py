@@ -0,0 +1,87 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from pa_bench_sdk.results import ResultsStore, state_hash
+from pa_bench_sdk.verifier import TaskVerifier, VerificationResult
+
+
+def _result(reward, verdicts):
+    checks = [TaskVerifier(name=name, verdict=verdict, reason="") for name, verdict in verdicts.items()]
+    return VerificationResult(
+        passed=all(verdicts.values()),
+        reward=reward,
+        message="",
+        details={"scenario_id": "scenario_003_meeting_modification", "checks": checks},
+    )
+
+
+def test_store_batches_rows_and_aggregates_per_scenario_and_check(tmp_path):
+    path = tmp_path / "results.db"
+    with ResultsStore(path, batch_size=3, data_path=Path("data")) as store:
+        store.add(_result(1.0, {"a": True, "b": True}), "run-1", "agent", "r0", state_hash({"x": 1}))
+        store.add(_result(0.5, {"a": True, "b": False}), "run-1", "agent", "r1")
+        store.add_row({"id": "r2", "scenario_id": "scenario_003_meeting_modification", "error": "boom"}, "run-1")
+        store.add(_result(0.0, {"a": False, "b": False}), "run-2", "agent", "r3")
+        # Three rows reached the batch size and were flushed; the fourth waits.
+        assert len(store.execute("SELECT id FROM results")) == 3
+
+    with ResultsStore(path) as store:
+        by_scenario = store.summary(run_id="run-1")
+        by_check = store.summary(by="check", run_id="run-1")
+        failed_b = [row["record_id"] for row in store.query(check="b")]
+        first = next(store.query(limit=1))
+
+    assert by_scenario == [
+        {
+            "scenario": "scenario_003_meeting_modification",
+            "results": 3,
+            "errors": 1,
+            "passed": 1,
+            "pass_rate": 0.5,
+            "mean_reward": 0.75,
+        }
+    ]
+    assert [(row["check_name"], row["passed"], row["checks"]) for row in by_check] == [("a", 2, 2), ("b", 1, 2)]
+    assert failed_b == ["r1", "r3"]
+    assert first["scenario_type"] == "meeting_modification"
+    assert first["state_hash"] == state_hash({"x": 1})
+    assert first["checks"] == [{"name": "a", "verdict": True, "reason": ""}, {"name": "b", "verdict": True, "reason": ""}]
+
+
+def test_state_hash_ignores_key_order():
+    assert state_hash({"a": 1, "b": [1, 2]}) == state_hash({"b": [1, 2], "a": 1})
+    assert state_hash({"a": 1}) != state_hash({"a": 2})
+
+
+def test_cli_records_batch_and_summarizes(tmp_path):
+    database = tmp_path / "results.db"
+    cli = [sys.executable, "-m", "pa_bench_sdk.cli"]
+    subprocess.run(
+        cli + [
+            "--results", str(database), "--run-id", "nightly", "verify-all",
+            "--scenario", "scenario_007_meeting_rescheduling", "--repeat", "2", "--workers", "0",
+            "--output", str(tmp_path / "rows.jsonl"),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    summary = subprocess.run(
+        cli + ["results", "summary", str(database), "--run", "nightly", "--json"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+    rows = [json.loads(line) for line in summary.stdout.splitlines()]
+    assert rows == [
+        {
+            "scenario": "scenario_007_meeting_rescheduling",
+            "results": 2,
+            "errors": 0,
+            "passed": 0,
+            "pass_rate": 0.0,
+            "mean_reward": 0.75,
+        }
+    ]
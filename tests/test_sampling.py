@@ -0,0 +1,67 @@
+import threading
+
+import pytest
+
+from pa_bench_sdk.pool import VerifierPool
+from pa_bench_sdk.sampling import SampleProfile, StackSampler
+
+
+BUSY_VERIFIER = (
+    "from gordon import TaskVerifier\n\n"
+    "def count_up(n):\n"
+    "    total = 0\n"
+    "    for i in range(n):\n"
+    "        total += i\n"
+    "    return total\n\n"
+    "def validation_function(state):\n"
+    "    count_up(300_000)\n"
+    "    return 1.0, [TaskVerifier(name='ok', verdict=True, reason='fine')]\n"
+)
+
+
+@pytest.fixture
+def busy_dir(tmp_path):
+    scenario = tmp_path / "busy"
+    scenario.mkdir()
+    (scenario / "verifier.py").write_text(BUSY_VERIFIER)
+    return tmp_path
+
+
+def _spin(deadline_event):
+    total = 0
+    while not deadline_event.is_set():
+        total += 1
+    return total
+
+
+@pytest.mark.parametrize("mode", ["signal", "thread"])
+def test_sampler_records_only_labelled_stacks(mode):
+    sampler = StackSampler(0.001, mode=mode).start()
+    done = threading.Event()
+    timer = threading.Timer(0.2, done.set)
+    timer.start()
+    try:
+        with sampler.labelled("scenario_x"):
+            _spin(done)
+    finally:
+        sampler.stop()
+
+    profile = SampleProfile(0.001)
+    profile.collect(sampler)
+    lines = profile.collapsed()
+    assert lines
+    assert all(line.startswith("scenario_x;") for line in lines)
+    assert any("_spin (test_sampling.py" in line for line in lines)
+    assert profile.summary()["scenario_x"]["samples"] >= 10
+
+
+def test_pool_workers_return_samples_per_scenario(busy_dir):
+    with VerifierPool(busy_dir, workers=1, sample_interval=0.001) as pool:
+        for _ in range(10):
+            pool.run("busy", {})
+        summary = pool.samples.summary()
+
+    assert summary["busy"]["samples"] > 0
+    assert "count_up" in summary["busy"]["verifiers"]
+    stacks = pool.samples.collapsed()
+    assert all(line.startswith("busy;_serve_requests") for line in stacks)
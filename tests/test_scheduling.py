@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+
+from pa_bench_sdk.pool import VerifierPool
+from pa_bench_sdk.scheduling import CostModel, CostQueue
+
+
+@pytest.fixture
+def timed_dir(tmp_path):
+    for name, seconds in (("slow", 0.3), ("fast", 0.0)):
+        scenario = tmp_path / name
+        scenario.mkdir()
+        (scenario / "verifier.py").write_text(
+            "import time\n"
+            "from gordon import TaskVerifier\n\n"
+            "def validation_function(state):\n"
+            f"    time.sleep({seconds})\n"
+            "    return 1.0, [TaskVerifier(name='ok', verdict=True, reason='')]\n"
+        )
+    return tmp_path
+
+
+def test_cost_model_learns_and_round_trips(tmp_path):
+    model = CostModel(alpha=0.5)
+    assert model.estimate("a") == 0.0
+    model.observe("a", 2.0)
+    model.observe("a", 4.0)
+    model.observe("b", 1.0)
+
+    assert model.estimate("a") == 3.0
+    assert model.estimate("unseen") == 2.0
+    model.save(tmp_path / "costs.json")
+    assert CostModel.load(tmp_path / "costs.json").costs == {"a": 3.0, "b": 1.0}
+    assert CostModel.load(tmp_path / "missing.json").costs == {}
+
+
+def test_cost_queue_returns_longest_first_then_fifo():
+    jobs = CostQueue(CostModel(costs={"slow": 1.0, "fast": 0.1}), key=lambda job: job[0])
+    for job in [("fast", 1), None, ("slow", 2), ("other", 3), ("fast", 4), ("slow", 5)]:
+        jobs.put(job)
+
+    assert [jobs.get() for _ in range(6)] == [
+        ("slow", 2), ("slow", 5), ("other", 3), ("fast", 1), ("fast", 4), None,
+    ]
+
+
+def test_pool_runs_queued_expensive_scenarios_first(timed_dir):
+    model = CostModel(costs={"slow": 0.3, "fast": 0.001})
+    finished = []
+    lock = threading.Lock()
+
+    def record(name):
+        def done(_):
+            with lock:
+                finished.append(name)
+        return done
+
+    with VerifierPool(timed_dir, workers=1, fork_server=True, cost_model=model) as pool:
+        pool.run("fast", {})  # warm up, so the next job is taken before the rest are queued
+        futures = [pool.submit("slow", {})]
+        for name in ("fast-1", "slow-2", "fast-2"):
+            futures.append(pool.submit(name.split("-")[0], {}))
+            futures[-1].add_done_callback(record(name))
+        for future in futures:
+            future.result()
+
+    assert finished == ["slow-2", "fast-1", "fast-2"]
+    assert 0.25 < model.estimate("slow") < 0.6
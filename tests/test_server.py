@@ -0,0 +1,106 @@
+import asyncio
+from pathlib import Path
+
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from pa_bench_sdk.scenario import ScenarioLoader
+from pa_bench_sdk.server import VerificationService
+
+
+SCENARIO_ID = "scenario_003_meeting_modification"
+
+
+def _clone_app(states):
+    def build(clone):
+        async def get_state(request):
+            return web.json_response(states[clone])
+
+        async def set_state(request):
+            states[clone] = await request.json()
+            return web.json_response({"ok": True})
+
+        app = web.Application(client_max_size=64 * 1024 ** 2)
+        app.router.add_get("/api/get_state", get_state)
+        app.router.add_post("/api/set_state", set_state)
+        return app
+
+    return build
+
+
+async def _exercise_service():
+    states = {"gomail": {}, "gocalendar": {}}
+    build = _clone_app(states)
+    async with TestServer(build("gomail")) as gomail, TestServer(build("gocalendar")) as gocalendar:
+        service = VerificationService(
+            Path("data"),
+            gomail_url=str(gomail.make_url("")).rstrip("/"),
+            gocalendar_url=str(gocalendar.make_url("")).rstrip("/"),
+            worlds_base_url="http://worlds.invalid",
+        )
+        await service.start()
+        try:
+            async with TestClient(TestServer(service.app())) as client:
+                listing = await (await client.get("/scenarios")).json()
+
+                load = await client.post("/load", json={"scenario_id": SCENARIO_ID})
+                loaded = await load.json()
+
+                verifications = await asyncio.gather(
+                    *[client.post("/verify", json={"scenario_id": SCENARIO_ID}) for _ in range(4)]
+                )
+                results = [await response.json() for response in verifications]
+
+                missing = await client.post("/verify", json={"scenario_id": "scenario_missing"})
+                return listing, load.status, loaded, results, missing.status, states
+        finally:
+            await service.close()
+
+
+def test_serve_loads_and_verifies_through_warm_service():
+    listing, load_status, loaded, results, missing_status, states = asyncio.run(
+        _exercise_service()
+    )
+    scenario = ScenarioLoader(Path("data")).load(SCENARIO_ID)
+
+    assert SCENARIO_ID in [entry["scenario_id"] for entry in listing["scenarios"]]
+    assert load_status == 200
+    assert "set_state" in loaded["timings"]
+    assert states["gocalendar"]["events"] == scenario.calendar_state["events"]
+    for result in results:
+        assert result["scenario_id"] == SCENARIO_ID
+        assert abs(result["reward"] - 1 / 3) < 1e-9
+        assert {"fetch", "verify", "total"} <= set(result["timings"])
+    assert missing_status == 404
+
+
+async def _exercise_profile(data_path):
+    service = VerificationService(data_path, sample_interval=0.001)
+    await service.start()
+    try:
+        async with TestClient(TestServer(service.app())) as client:
+            for _ in range(5):
+                await client.post("/verify", json={"scenario_id": "busy", "state": {}})
+            summary = await (await client.get("/profile?format=summary")).json()
+            stacks = await (await client.get("/profile?reset=1")).text()
+            after_reset = await (await client.get("/profile")).text()
+            return summary, stacks, after_reset
+    finally:
+        await service.close()
+
+
+def test_serve_exposes_sampled_verifier_stacks(tmp_path):
+    scenario = tmp_path / "busy"
+    scenario.mkdir()
+    (scenario / "verifier.py").write_text(
+        "from gordon import TaskVerifier\n\n"
+        "def validation_function(state):\n"
+        "    sum(range(2_000_000))\n"
+        "    return 1.0, [TaskVerifier(name='ok', verdict=True, reason='fine')]\n"
+    )
+
+    summary, stacks, after_reset = asyncio.run(_exercise_profile(tmp_path))
+
+    assert summary["scenarios"]["busy"]["samples"] > 0
+    assert stacks.startswith("busy;")
+    assert after_reset == ""
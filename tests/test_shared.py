@@ -0,0 +1,46 @@
+import pickle
+from pathlib import Path
+
+import pytest
+
+from pa_bench_sdk.pool import VerifierPool
+from pa_bench_sdk.scenario import ScenarioLoader
+from pa_bench_sdk.shared import attach_state
+from pa_bench_sdk.verifier import VerifierRunner
+
+
+SCENARIO_IDS = ["scenario_003_meeting_modification", "scenario_015_meeting_scheduling"]
+
+
+@pytest.fixture
+def store():
+    store = ScenarioLoader(Path("data")).publish_shared(SCENARIO_IDS)
+    yield store
+    store.close()
+
+
+def test_attached_state_reads_like_the_loaded_state(store):
+    loader = ScenarioLoader(Path("data"))
+    runner = VerifierRunner(Path("data"))
+    for scenario_id in SCENARIO_IDS:
+        scenario = loader.load(scenario_id)
+        state = {"gomail": scenario.gmail_state, "gocalendar": scenario.calendar_state}
+        attached = attach_state(store.handle(scenario_id))
+        try:
+            events = attached.state["gocalendar"]["events"]
+            assert len(events) == len(state["gocalendar"]["events"])
+            assert events[-1] == state["gocalendar"]["events"][-1]
+            assert attached.materialize() == state
+            shared = runner.run(scenario_id, state=attached.state)
+            assert shared.reward == runner.run(scenario, state=state).reward
+        finally:
+            attached.close()
+
+
+def test_handles_are_small_and_feed_the_pool(store):
+    handles = store.handles
+    assert all(len(pickle.dumps(handle)) < 256 for handle in handles.values())
+
+    with VerifierPool("data", workers=2, scenario_ids=SCENARIO_IDS) as pool:
+        results = pool.map(list(handles.items()) * 2)
+    assert [result.details["scenario_id"] for result in results] == SCENARIO_IDS * 2
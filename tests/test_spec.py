@@ -0,0 +1,184 @@
+import copy
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+from gordon import SpecEngine, compare_results
+from pa_bench_sdk.scenario import ScenarioLoader
+from pa_bench_sdk.verifier import VerifierRunner
+
+
+LOADER = ScenarioLoader(Path("data"))
+SCENARIOS = LOADER.list_scenarios()
+
+
+def _event(event_id, title, start, end, attendees, **extra):
+    event = {
+        "id": event_id,
+        "title": title,
+        "start": start,
+        "end": end,
+        "attendees": [{"email": email} for email in attendees],
+        "location": None,
+        "conferenceData": None,
+    }
+    event.update(extra)
+    return event
+
+
+def _sent(thread_id, sender, to, cc, timestamp, subject="Re: update", body=""):
+    return {
+        "id": f"email_{thread_id}_{timestamp}",
+        "threadId": thread_id,
+        "from": {"email": sender},
+        "to": [{"email": email} for email in to],
+        "cc": [{"email": email} for email in cc],
+        "subject": subject,
+        "body": body,
+        "timestamp": timestamp,
+        "labels": ["SENT"],
+    }
+
+
+def solved_state(scenario_id, partial=False):
+    """Baseline state edited to satisfy (or, with `partial`, half-satisfy) the task."""
+    scenario = LOADER.load(scenario_id)
+    state = copy.deepcopy(
+        {"gomail": scenario.gmail_state, "gocalendar": scenario.calendar_state}
+    )
+    spec = SpecEngine(Path("data")).plan(scenario_id).spec
+    params = spec.params
+    events = state["gocalendar"]["events"]
+    emails = state["gomail"]["emails"]
+
+    if spec.family in (
+        "meeting_scheduling",
+        "meeting_rescheduling",
+        "meeting_modification",
+    ):
+        events[:] = [e for e in events if e["title"] != params["title"]]
+        day = date.fromisoformat(params["requested_at"][:10]) + timedelta(days=2)
+        attendees = params["participants"][:-1] if partial else params["participants"]
+        extra = (
+            {"conferenceData": {"conferenceSolution": {"name": "Google Meet"}}}
+            if params["location"] == "Google Meet"
+            else {"location": params["location"]}
+        )
+        events.append(
+            _event(
+                "event_solved",
+                params["title"],
+                f"{day}T03:00:00.000Z",
+                f"{day}T03:30:00.000Z",
+                attendees,
+                **extra,
+            )
+        )
+    elif spec.family == "conflict_detection":
+        cc = params["cc"][:-1] if partial else params["cc"]
+        emails.append(
+            _sent(
+                params["thread_id"],
+                params["user_email"],
+                [params["organizer"]],
+                cc,
+                "2026-01-20T10:00:00Z",
+            )
+        )
+    elif spec.family == "meeting_cancellation":
+        if not partial:
+            events[:] = [e for e in events if e["id"] != params["event_id"]]
+        emails.append(
+            _sent(
+                "thread_cancel",
+                "alan@helixgrid.com",
+                ["someone@helixgrid.com"],
+                [],
+                f"{params['sent_on']}T12:00:00Z",
+                subject="Meeting cancelled",
+            )
+        )
+    elif spec.family == "travel_confirmation":
+        flights = params["flights"][:1] if partial else params["flights"]
+        for flight in flights:
+            events.append(
+                _event(
+                    f"event_{flight['number']}",
+                    f"Flight {flight['number']}",
+                    flight["departure"],
+                    flight["arrival"],
+                    ["alan@helixgrid.com"],
+                )
+            )
+    elif spec.family == "multi_meeting_coordination":
+        meetings = params["meetings"][:1] if partial else params["meetings"]
+        for meeting in meetings:
+            events.append(
+                _event(
+                    f"event_{meeting['name']}",
+                    meeting["name"].title(),
+                    meeting["start"],
+                    meeting["end"],
+                    params["participants"],
+                )
+            )
+    elif spec.family == "cascading_changes":
+        for meeting in params["meetings"]:
+            if not partial:
+                events[:] = [
+                    e
+                    for e in events
+                    if not (
+                        e["start"].startswith(meeting["original_start"][:16])
+                        and meeting["name"] in e["title"].lower()
+                    )
+                ]
+            events.append(
+                _event(
+                    f"event_{meeting['name']}",
+                    f"{meeting['name'].title()}: {params['topic']}",
+                    meeting["start"],
+                    meeting["end"],
+                    params["participants"],
+                )
+            )
+    return state
+
+
+@pytest.mark.parametrize("scenario_id", SCENARIOS)
+def test_spec_engine_matches_shipped_verifier(scenario_id):
+    runner = VerifierRunner(Path("data"))
+    scenario = LOADER.load(scenario_id)
+    module = runner._load_module(scenario.path / "verifier.py")
+    engine = SpecEngine(Path("data"))
+
+    states = [
+        {"gomail": scenario.gmail_state, "gocalendar": scenario.calendar_state},
+        solved_state(scenario_id),
+        solved_state(scenario_id, partial=True),
+    ]
+    results = engine.evaluate_many(scenario_id, states)
+
+    for state, result in zip(states, results):
+        assert compare_results(module.validation_function(state), result) == []
+
+
+def test_spec_engine_rewards_solved_states():
+    engine = SpecEngine(Path("data"))
+    for scenario_id in ("scenario_001_multi_meeting_coordination", "scenario_011_travel_confirmation"):
+        reward, checks = engine.evaluate(scenario_id, solved_state(scenario_id))
+        assert reward == 1.0
+        assert all(check.verdict for check in checks)
+
+
+@pytest.mark.parametrize("scenario_id", SCENARIOS)
+def test_verifiers_score_projected_states_like_full_states(scenario_id):
+    runner = VerifierRunner(Path("data"))
+    projection = runner.projection(scenario_id)
+    assert projection is not None
+
+    for state in (solved_state(scenario_id), solved_state(scenario_id, partial=True)):
+        full = runner.run(scenario_id, state)
+        projected = runner.run(scenario_id, projection.apply(state))
+        assert projected.to_dict() == full.to_dict()
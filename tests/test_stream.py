@@ -0,0 +1,138 @@
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from pa_bench_sdk.pool import VerifierPool
+from pa_bench_sdk.scenario import ScenarioLoader
+from pa_bench_sdk.stream import (
+    MalformedDocument,
+    iter_json_documents,
+    iter_state_records,
+    verify_stream,
+)
+
+
+SCENARIO_IDS = ["scenario_003_meeting_modification", "scenario_007_meeting_rescheduling"]
+
+
+def _state(scenario_id):
+    scenario = ScenarioLoader(Path("data")).load(scenario_id)
+    return {"gomail": scenario.gmail_state, "gocalendar": scenario.calendar_state}
+
+
+def _archive():
+    states = {scenario_id: _state(scenario_id) for scenario_id in SCENARIO_IDS}
+    lines = [
+        json.dumps({"id": "a", "scenario_id": SCENARIO_IDS[0], "state": states[SCENARIO_IDS[0]]}),
+        json.dumps({"id": "b", "scenario_id": SCENARIO_IDS[1], "state": states[SCENARIO_IDS[1]]}),
+        json.dumps(states[SCENARIO_IDS[0]], indent=2),
+        json.dumps({"id": "d", "state": {}}),
+    ]
+    return "\n".join(lines[:2]) + "\n" + "".join(lines[2:])
+
+
+def test_incremental_parser_handles_jsonl_and_concatenated_documents():
+    text = '{"a": 1}\n{"b": [1, 2]}{"c": {"d": "}"}}  \n 42 {"e": null}\n'
+    documents = list(iter_json_documents(io.StringIO(text), chunk_size=3))
+    assert documents == [
+        {"a": 1},
+        {"b": [1, 2]},
+        {"c": {"d": "}"}},
+        42,
+        {"e": None},
+    ]
+
+
+def test_incremental_parser_skips_a_malformed_document_and_resyncs():
+    text = (
+        '{"a": 1}\n'
+        '{"b": [1, 2\n'
+        '{"c": "unterminated\n'
+        '{\n  "d": {"e": 1},\n  "f": oops\n}\n'
+        '{"g": 3}\n'
+        '{"h": '
+    )
+    documents = list(iter_json_documents(io.StringIO(text), chunk_size=4))
+
+    assert [document for document in documents if not isinstance(document, MalformedDocument)] == [
+        {"a": 1},
+        {"g": 3},
+    ]
+    assert [type(document) for document in documents] == [
+        dict, MalformedDocument, MalformedDocument, MalformedDocument, dict, MalformedDocument
+    ]
+    assert documents[-1].message.startswith("Truncated")
+
+
+def test_incremental_parser_waits_for_tokens_cut_at_a_chunk_edge():
+    text = '{"a": "\\u00e9\\u00e8", "b": -12.5e3, "c": [true, false, null]}\n' * 3
+    for chunk_size in range(1, 12):
+        documents = list(iter_json_documents(io.StringIO(text), chunk_size=chunk_size))
+        assert documents == [{"a": "\u00e9\u00e8", "b": -12.5e3, "c": [True, False, None]}] * 3
+
+
+def test_incremental_parser_caps_document_size():
+    text = '{"big": "' + "x" * 5000 + '"}\n{"next": 1}\n'
+    reader = io.StringIO(text)
+    documents = list(iter_json_documents(reader, chunk_size=64, max_document_size=1000))
+
+    assert isinstance(documents[0], MalformedDocument)
+    assert "exceeds 1000" in documents[0].message
+    assert documents[1:] == [{"next": 1}]
+
+
+def test_verify_stream_reports_a_corrupt_line_and_verifies_the_rest():
+    lines = _archive().splitlines(keepends=True)
+    corrupt = lines[0][: len(lines[0]) // 2] + "\n"
+    text = lines[1] + corrupt + lines[1]
+    records = iter_state_records(io.StringIO(text), SCENARIO_IDS[0])
+    rows = list(verify_stream(records, "data"))
+
+    assert [row["index"] for row in rows] == [0, 1, 2]
+    assert [row["id"] for row in rows] == ["b", None, "b"]
+    assert rows[0]["reward"] == rows[2]["reward"] == 0.75
+    assert rows[1]["error"].startswith("Malformed JSON document")
+
+
+def test_verify_stream_matches_in_process_results_in_order():
+    def rows(pool):
+        records = iter_state_records(io.StringIO(_archive()), SCENARIO_IDS[0])
+        return list(verify_stream(records, "data", pool, max_in_flight=2))
+
+    sequential = rows(None)
+    with VerifierPool("data", workers=2, scenario_ids=SCENARIO_IDS) as pool:
+        parallel = rows(pool)
+
+    assert [row["index"] for row in parallel] == [0, 1, 2, 3]
+    assert [row.get("reward") for row in parallel] == [row.get("reward") for row in sequential]
+    assert parallel[1]["reward"] == 0.75
+    assert "error" in parallel[3]
+
+
+def test_cli_verifies_state_files_and_streams(tmp_path):
+    state_file = tmp_path / "state.json"
+    state_file.write_text(json.dumps(_state(SCENARIO_IDS[1])))
+    single = subprocess.run(
+        [sys.executable, "-m", "pa_bench_sdk.cli", "verify", SCENARIO_IDS[1], "--state-file", str(state_file)],
+        capture_output=True,
+        text=True,
+    )
+    assert "Reward: 0.75" in single.stdout
+
+    archive = tmp_path / "states.jsonl"
+    archive.write_text(_archive())
+    output = tmp_path / "results.jsonl"
+    stream = subprocess.run(
+        [
+            sys.executable, "-m", "pa_bench_sdk.cli", "verify-stream", str(archive),
+            "--scenario", SCENARIO_IDS[0], "--workers", "2", "--output", str(output),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [row["id"] for row in rows] == ["a", "b", None, "d"]
+    assert stream.returncode == 1
+    assert "Verified 4 states (1 errors)" in stream.stderr
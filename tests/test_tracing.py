@@ -0,0 +1,127 @@
+import asyncio
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from pa_bench_sdk import metrics, tracing
+from pa_bench_sdk.scenario import ScenarioLoader
+from pa_bench_sdk.standin import StandinServer
+from pa_bench_sdk.verifier import VerifierRunner
+from pa_bench_sdk.worlds import WorldsClient
+
+SCENARIO_ID = "scenario_007_meeting_rescheduling"
+
+
+def _read(path):
+    return [json.loads(line) for line in Path(path).read_text().splitlines()]
+
+
+def test_tracing_is_a_no_op_until_configured():
+    assert not tracing.enabled()
+    with tracing.span("anything", key="value") as span:
+        assert span is tracing.NOOP_SPAN and not span.recording
+
+
+def test_loader_and_verifier_spans_nest_under_the_current_span(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    tracing.configure(tracing.JsonlExporter(path))
+    try:
+        with tracing.span("cli.verify"):
+            scenario = ScenarioLoader("data").load(SCENARIO_ID)
+            VerifierRunner("data").run(scenario)
+        with pytest.raises(KeyError):
+            with tracing.span("failing"):
+                raise KeyError("boom")
+    finally:
+        tracing.shutdown()
+
+    spans = {span["name"]: span for span in _read(path)}
+    root = spans["cli.verify"]
+    assert root["parent_id"] is None
+    for name in ("scenario.load", "verifier.load_module", "verifier.validation_function"):
+        assert spans[name]["parent_id"] == root["span_id"]
+        assert spans[name]["trace_id"] == root["trace_id"]
+    assert spans["scenario.load"]["attributes"]["scenario_id"] == SCENARIO_ID
+    assert spans["scenario.load"]["attributes"]["data_bytes"] > 0
+    assert spans["verifier.validation_function"]["attributes"]["checks"] == 4
+    assert spans["verifier.validation_function"]["attributes"]["checks_passed"] == 3
+    assert spans["failing"]["status"] == "error"
+    assert spans["failing"]["attributes"]["error.type"] == "KeyError"
+
+
+def test_client_requests_export_as_chrome_trace(tmp_path):
+    path = tmp_path / "trace.json"
+
+    async def round_trip(pair):
+        async with WorldsClient() as client:
+            await client.set_states(pair, b'{"emails": []}', {"events": []})
+            return await client.get_states(pair)
+
+    tracing.configure(tracing.exporter_for(path))
+    try:
+        with StandinServer() as standin:
+            state = asyncio.run(round_trip(standin.pairs(1)[0]))
+    finally:
+        tracing.shutdown()
+
+    assert state == {"gomail": {"emails": []}, "gocalendar": {"events": []}}
+    events = json.loads(path.read_text())
+    assert sorted(event["name"] for event in events) == [
+        "worlds.get_state", "worlds.get_state", "worlds.set_state", "worlds.set_state",
+    ]
+    assert all(event["ph"] == "X" and event["dur"] > 0 for event in events)
+    set_state = next(event for event in events if event["name"] == "worlds.set_state")
+    assert set_state["args"]["status"] == 200 and set_state["args"]["request_bytes"] == 14
+
+
+def test_client_requests_record_phase_timings(tmp_path):
+    path = tmp_path / "spans.jsonl"
+
+    async def round_trips(pair):
+        async with WorldsClient() as client:
+            for _ in range(2):
+                await client.set_states(pair, b'{"emails": []}', b'{"events": []}')
+
+    metrics.REGISTRY.clear()
+    tracing.configure(tracing.exporter_for(path))
+    try:
+        with StandinServer() as standin:
+            asyncio.run(round_trips(standin.pairs(1)[0]))
+    finally:
+        tracing.shutdown()
+
+    spans = [json.loads(line)["attributes"] for line in path.read_text().splitlines()]
+    assert [span["connection"] for span in spans] == ["new", "reused", "reused", "reused"]
+    assert spans[0]["connect_ms"] > 0 and "connect_ms" not in spans[1]
+    assert all(span["wait_ms"] > 0 and span["send_ms"] >= 0 for span in spans)
+    connections = metrics.REGISTRY.snapshot()["pa_bench_http_connections_total"]["series"]
+    assert {tuple(entry["labels"]): entry["value"] for entry in connections} == {
+        ("set_state", "new"): 1,
+        ("set_state", "reused"): 3,
+    }
+
+
+@pytest.mark.parametrize("name", ["trace.json", "trace.jsonl"])
+def test_pool_workers_leave_the_trace_file_to_the_parent(tmp_path, name):
+    path = tmp_path / name
+    subprocess.run(
+        [
+            sys.executable, "-m", "pa_bench_sdk.cli", "--trace", str(path), "verify-all",
+            "--scenario", SCENARIO_ID, "--scenario", "scenario_003_meeting_modification",
+            "--workers", "2",
+        ],
+        capture_output=True,
+        text=True,
+    )
+
+    if name.endswith(".jsonl"):
+        spans = _read(path)
+    else:
+        spans = json.loads(path.read_text())
+    assert len({span["pid"] for span in spans}) == 1
+    names = [span["name"] for span in spans]
+    assert names.count("cli.verify-all") == 1
+    assert "verifier.validation_function" not in names
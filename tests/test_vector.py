@@ -0,0 +1,128 @@
+import os
+import random
+import time
+import timeit
+from pathlib import Path
+
+import pytest
+
+from gordon import SpecEngine, compare_results
+from pa_bench_sdk.verifier import VerifierRunner
+
+from test_spec import LOADER, SCENARIOS, solved_state
+
+np = pytest.importorskip("numpy")
+
+from gordon.vector import _VECTOR_FAMILIES  # noqa: E402
+
+
+@pytest.mark.parametrize("scenario_id", SCENARIOS)
+def test_rollouts_match_shipped_verifier(scenario_id):
+    runner = VerifierRunner(Path("data"))
+    scenario = LOADER.load(scenario_id)
+    module = runner._load_module(scenario.path / "verifier.py")
+    engine = SpecEngine(Path("data"))
+
+    states = [
+        {"gomail": scenario.gmail_state, "gocalendar": scenario.calendar_state},
+        solved_state(scenario_id),
+        solved_state(scenario_id, partial=True),
+    ]
+    result = engine.evaluate_rollouts(scenario_id, states)
+
+    assert len(result) == len(states)
+    for i, state in enumerate(states):
+        assert compare_results(module.validation_function(state), result.result(i)) == []
+
+
+def test_rollout_arrays_line_up_with_states():
+    scenario_id = "scenario_003_meeting_modification"
+    engine = SpecEngine(Path("data"))
+    states = [solved_state(scenario_id), solved_state(scenario_id, partial=True)]
+    result = engine.evaluate_rollouts(scenario_id, states)
+
+    assert result.verdicts.shape == (2, len(result.check_names))
+    assert result.rewards[0] == 1.0
+    assert result.rewards[1] < 1.0
+
+
+def _rollouts(scenario_id, n, seed=0):
+    """`n` states cycling through the baseline, solved and partial states,
+    each with one randomly chosen email or event dropped from every third."""
+    scenario = LOADER.load(scenario_id)
+    bases = [
+        {"gomail": scenario.gmail_state, "gocalendar": scenario.calendar_state},
+        solved_state(scenario_id),
+        solved_state(scenario_id, partial=True),
+    ]
+    rng = random.Random(seed)
+    states = []
+    for i in range(n):
+        state = bases[i % len(bases)]
+        if i % 3 == 0:
+            clone, key = rng.choice([("gomail", "emails"), ("gocalendar", "events")])
+            items = list(state[clone].get(key) or ())
+            if items:
+                del items[rng.randrange(len(items))]
+            state = {**state, clone: {**state[clone], key: items}}
+        states.append(state)
+    rng.shuffle(states)
+    return states
+
+
+VECTORISED = [
+    scenario_id
+    for scenario_id in SCENARIOS
+    if SpecEngine(Path("data")).plan(scenario_id).spec.family in _VECTOR_FAMILIES
+]
+
+
+@pytest.mark.parametrize("scenario_id", VECTORISED)
+def test_rollouts_match_scalar_plan_at_scale(scenario_id):
+    engine = SpecEngine(Path("data"))
+    states = _rollouts(scenario_id, 900)
+    result = engine.evaluate_rollouts(scenario_id, states)
+    expected = engine.evaluate_many(scenario_id, states)
+
+    scalar_verdicts = np.array(
+        [[bool(check.verdict) for check in checks] for _, checks in expected]
+    )
+    assert np.array_equal(result.verdicts, scalar_verdicts)
+    assert np.allclose(result.rewards, [reward for reward, _ in expected])
+    for i in range(0, len(states), 97):
+        assert compare_results(expected[i], result.result(i)) == []
+
+
+def test_conflict_detection_uses_scalar_plan():
+    engine = SpecEngine(Path("data"))
+    families = {engine.plan(scenario_id).spec.family for scenario_id in SCENARIOS}
+
+    assert "conflict_detection" in families
+    assert "conflict_detection" not in _VECTOR_FAMILIES
+    assert set(VECTORISED) != set(SCENARIOS)
+
+
+@pytest.mark.skipif(
+    os.environ.get("PA_BENCH_BENCHMARKS") != "1",
+    reason="benchmarks run with PA_BENCH_BENCHMARKS=1",
+)
+@pytest.mark.parametrize(
+    "scenario_id",
+    ["scenario_003_meeting_modification", "scenario_001_multi_meeting_coordination"],
+)
+def test_vectorised_families_beat_shipped_verifier_tenfold(scenario_id):
+    runner = VerifierRunner(Path("data"))
+    module = runner._load_module(LOADER.locate(scenario_id) / "verifier.py")
+    engine = SpecEngine(Path("data"))
+    states = _rollouts(scenario_id, 10_000)
+    engine.evaluate_rollouts(scenario_id, states[:100])
+
+    started = time.perf_counter()
+    for state in states:
+        module.validation_function(state)
+    scalar = time.perf_counter() - started
+    vector = min(
+        timeit.repeat(lambda: engine.evaluate_rollouts(scenario_id, states), number=1, repeat=3)
+    )
+
+    assert scalar / vector >= 10, f"{scalar / vector:.1f}x"